@@ -0,0 +1,44 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+UserModel = get_user_model()
+
+
+class EmailBackend(ModelBackend):
+    """
+    Authenticate with `email=` instead of `username=`.
+
+    The user is read in one query on the email index, together with
+    everything the login response and checks touch (church, member and
+    the member's family), and the password is verified once. Calls with
+    `username=` (the admin panel) fall through to ModelBackend.
+    """
+
+    def get_login_user(self, email):
+        if not email:
+            return None
+        # email is not unique on User; the oldest login wins, as before
+        return (
+            UserModel._default_manager
+            .select_related("church", "member__family")
+            .filter(email=email)
+            .order_by("pk")
+            .first()
+        )
+
+    def check_credentials(self, user, password):
+        if user is None:
+            # Run the hasher anyway, so a missing email takes as long
+            # as a wrong password (same as ModelBackend)
+            UserModel().set_password(password)
+            return False
+        return user.check_password(password) and self.user_can_authenticate(user)
+
+    def authenticate(self, request, email=None, password=None, **kwargs):
+        if email is None or password is None:
+            return None
+
+        user = self.get_login_user(email)
+        if self.check_credentials(user, password):
+            return user
+        return None
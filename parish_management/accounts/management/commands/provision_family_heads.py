@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.provisioning import provision_family_heads
+from registry.models import Member
+
+
+class Command(BaseCommand):
+    help = (
+        "Create logins for active family heads that have an email but no "
+        "login yet (e.g. after a bulk import) and queue their invitations."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--church", type=int, help="Only this church id.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Members per transaction (default 500).",
+        )
+
+    def handle(self, *args, **options):
+        heads = (
+            Member.objects
+            .filter(
+                is_family_head=True,
+                is_active=True,
+                user__isnull=True,
+                church__is_deleted=False,
+            )
+            .exclude(email__isnull=True)
+            .exclude(email="")
+            .order_by("pk")
+        )
+        if options["church"]:
+            heads = heads.filter(church_id=options["church"])
+
+        created = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                heads.filter(pk__gt=last_pk)
+                .only("pk", "church_id", "email", "is_family_head", "is_active")
+                [:options["batch_size"]]
+            )
+            if not batch:
+                break
+
+            with transaction.atomic():
+                created += len(provision_family_heads(batch))
+            last_pk = batch[-1].pk
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Provisioned {created} login(s); invitations queued."
+        ))
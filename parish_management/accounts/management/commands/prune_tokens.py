@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from accounts.tokens import PRUNE_BATCH_SIZE, prune_expired_tokens
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired JWT outstanding/blacklisted tokens in batches. "
+        "Schedule it (cron/systemd timer), e.g. hourly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=PRUNE_BATCH_SIZE,
+            help=f"Rows per DELETE (default {PRUNE_BATCH_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        deleted = prune_expired_tokens(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired token(s)."))
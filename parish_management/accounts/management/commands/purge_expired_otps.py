@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from accounts.otp import PURGE_BATCH_SIZE, purge_expired_otps
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired password reset codes in batches. "
+        "Schedule it (cron/systemd timer), e.g. every 15 minutes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=PURGE_BATCH_SIZE,
+            help=f"Rows per DELETE (default {PURGE_BATCH_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_otps(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired OTP(s)."))
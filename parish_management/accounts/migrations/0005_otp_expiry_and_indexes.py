@@ -0,0 +1,42 @@
+# Generated by Django 6.0.1 on 2026-10-19 16:05
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def set_expires_at(apps, schema_editor):
+    PasswordResetOTP = apps.get_model("accounts", "PasswordResetOTP")
+    PasswordResetOTP.objects.update(
+        expires_at=F("created_at") + timedelta(minutes=10)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_alter_user_church'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='passwordresetotp',
+            name='expires_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(set_expires_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='passwordresetotp',
+            name='expires_at',
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name='passwordresetotp',
+            index=models.Index(fields=['user', 'otp_hash', 'is_used'], name='otp_user_hash_used_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='passwordresetotp',
+            index=models.Index(fields=['expires_at'], name='otp_expires_idx'),
+        ),
+    ]
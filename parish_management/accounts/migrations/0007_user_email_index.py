@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-19 18:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_must_change_password'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('registry', '0033_replica_heartbeat'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['email'], name='user_email_idx'),
+        ),
+    ]
@@ -30,15 +30,43 @@ class User(AbstractUser):
         related_name="user"
     )
 
+    # Set for provisioned logins; cleared once the user picks a password
+    must_change_password = models.BooleanField(default=False)
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Login and password reset look users up by email
+            models.Index(fields=["email"], name="user_email_idx"),
+        ]
+
     def __str__(self):
         return f"{self.username} ({self.role})"
 
 
 class PasswordResetOTP(models.Model):
+    """
+    Database-backed reset code (accounts.otp.DatabaseOTPStore).
+    Expired and used rows are removed by `manage.py purge_expired_otps`.
+    """
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     otp_hash = models.CharField(max_length=128)
     created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
     is_used = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # Verification lookup
+            models.Index(
+                fields=["user", "otp_hash", "is_used"],
+                name="otp_user_hash_used_idx",
+            ),
+            # Batched purge
+            models.Index(
+                fields=["expires_at"],
+                name="otp_expires_idx",
+            ),
+        ]
+
     def is_expired(self):
-        return timezone.now() > self.created_at + timezone.timedelta(minutes=10)
\ No newline at end of file
+        return timezone.now() > self.expires_at
\ No newline at end of file
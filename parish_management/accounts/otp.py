@@ -0,0 +1,161 @@
+"""
+Password reset codes.
+
+Two interchangeable stores, picked by settings.PASSWORD_RESET_OTP_STORE:
+
+* "db": PasswordResetOTP rows. Verifying is one indexed read (joined to
+  the user by email); expired and used rows are deleted in batches by
+  `manage.py purge_expired_otps`.
+* "cache": one cache entry per email that expires on its own (use a
+  shared backend such as RedisCache with several workers). Nothing is
+  written to the database at all.
+
+Either way, issuing a code replaces any earlier one for the user and a
+code can be consumed once.
+"""
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+
+from accounts.models import PasswordResetOTP
+from accounts.utils import generate_otp, hash_otp
+
+PURGE_BATCH_SIZE = 1000
+
+
+class InvalidOTP(Exception):
+    pass
+
+
+class ExpiredOTP(InvalidOTP):
+    pass
+
+
+def otp_ttl():
+    return timedelta(minutes=settings.PASSWORD_RESET_OTP_TTL_MINUTES)
+
+
+# =====================================================
+# STORES
+# =====================================================
+
+class DatabaseOTPStore:
+
+    def issue(self, user):
+        otp = generate_otp()
+
+        with transaction.atomic():
+            # Invalidate old OTPs
+            PasswordResetOTP.objects.filter(
+                user=user,
+                is_used=False
+            ).update(is_used=True)
+
+            PasswordResetOTP.objects.create(
+                user=user,
+                otp_hash=hash_otp(otp),
+                expires_at=timezone.now() + otp_ttl(),
+            )
+
+        return otp
+
+    def consume(self, email, otp):
+        """
+        Mark the code used and return its user id.
+        """
+        row = (
+            PasswordResetOTP.objects
+            .filter(
+                user__email=email,
+                otp_hash=hash_otp(str(otp)),
+                is_used=False
+            )
+            .values("pk", "user_id", "expires_at")
+            .first()
+        )
+        if row is None:
+            raise InvalidOTP
+        if timezone.now() > row["expires_at"]:
+            raise ExpiredOTP
+
+        # Conditional, so two concurrent resets cannot both use it
+        used = PasswordResetOTP.objects.filter(
+            pk=row["pk"],
+            is_used=False
+        ).update(is_used=True)
+        if not used:
+            raise InvalidOTP
+
+        return row["user_id"]
+
+
+class CacheOTPStore:
+
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    @staticmethod
+    def _key(email):
+        digest = hashlib.sha256(email.strip().lower().encode()).hexdigest()
+        return f"otp:reset:{digest}"
+
+    def issue(self, user):
+        otp = generate_otp()
+        # Overwrites any earlier code for this email
+        self.cache.set(
+            self._key(user.email),
+            {"user_id": user.pk, "otp_hash": hash_otp(otp)},
+            int(otp_ttl().total_seconds())
+        )
+        return otp
+
+    def consume(self, email, otp):
+        key = self._key(email)
+        entry = self.cache.get(key)
+
+        if entry is None or not constant_time_compare(
+            entry["otp_hash"], hash_otp(str(otp))
+        ):
+            raise InvalidOTP
+
+        # delete() reports whether this call removed it: single use
+        if not self.cache.delete(key):
+            raise InvalidOTP
+
+        return entry["user_id"]
+
+
+def get_otp_store():
+    if settings.PASSWORD_RESET_OTP_STORE == "cache":
+        return CacheOTPStore(settings.PASSWORD_RESET_OTP_CACHE)
+    return DatabaseOTPStore()
+
+
+# =====================================================
+# PURGE
+# =====================================================
+
+def purge_expired_otps(*, batch_size=PURGE_BATCH_SIZE):
+    """
+    Delete expired PasswordResetOTP rows (used ones included, they
+    expire within the TTL), batch_size per statement, walking the
+    expires_at index. Returns the number deleted.
+    """
+    expired = (
+        PasswordResetOTP.objects
+        .filter(expires_at__lt=timezone.now())
+        .order_by("expires_at")
+    )
+
+    deleted = 0
+    while True:
+        pks = list(expired.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return deleted
+        count, _ = PasswordResetOTP.objects.filter(pk__in=pks).delete()
+        deleted += count
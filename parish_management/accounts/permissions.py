@@ -21,8 +21,8 @@ class IsMemberUser(BasePermission):
         return (
             request.user.is_authenticated and
             request.user.role == "USER" and
-            hasattr(request.user, "member") and
-            request.user.member is not None
+            # The id is on the user row; no query for the member
+            getattr(request.user, "member_id", None) is not None
         )
 
 class IsChurchAuthenticated(BasePermission):
@@ -0,0 +1,215 @@
+"""
+Batch provisioning of family head logins.
+
+create_user() hashes a password (PBKDF2, full iteration count) inside
+the request that promotes a head, and then mails it inline. For a bulk
+import that promotes hundreds of heads this costs minutes, so:
+
+* provision_family_heads() inserts the users with bulk_create, an
+  unusable password and must_change_password set. No hashing and no
+  mail happen in the request; invitations are queued as
+  "accounts.send_invitations" jobs of INVITATION_BATCH_SIZE users.
+* The job issues the passwords, hashes them in a process pool
+  (hash_passwords), writes them with one bulk_update and sends every
+  invitation of the batch over a single mail connection.
+
+Passwords are only generated inside the job, so they never sit in the
+job table. A retry issues new ones, which invalidates any copy from an
+earlier failed send. The hash iteration count is not lowered; the work
+is just moved off the request and spread over CPU cores.
+"""
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Q
+
+from accounts.utils import generate_password
+from registry.jobs import enqueue
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+INVITATION_JOB = "accounts.send_invitations"
+INVITATION_BATCH_SIZE = 100
+INSERT_BATCH_SIZE = 500
+
+# Below this, starting worker processes costs more than it saves
+POOL_MIN_PASSWORDS = 8
+
+
+# =====================================================
+# HASHING
+# =====================================================
+
+def _init_hash_worker():
+    import django
+
+    # Spawned (not forked) workers start without configured settings
+    if not settings.configured or not django.apps.apps.ready:
+        django.setup()
+
+
+def hash_passwords(passwords, *, workers=None):
+    """
+    make_password() for each password, in order, spread over a process
+    pool (settings.PROVISIONING_HASH_WORKERS, default one per CPU).
+    """
+    passwords = list(passwords)
+    workers = workers or settings.PROVISIONING_HASH_WORKERS or os.cpu_count() or 1
+
+    if workers <= 1 or len(passwords) < POOL_MIN_PASSWORDS:
+        return [make_password(password) for password in passwords]
+
+    workers = min(workers, len(passwords))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_hash_worker,
+    ) as pool:
+        return list(pool.map(
+            make_password,
+            passwords,
+            chunksize=max(len(passwords) // (workers * 4), 1)
+        ))
+
+
+# =====================================================
+# PROVISIONING
+# =====================================================
+
+def _eligible_heads(members):
+    """
+    Active heads with an email, no login yet, and an email no other
+    login uses (username and email are both the head's email).
+    """
+    heads = [
+        member for member in members
+        if member.is_family_head and member.is_active and member.email
+    ]
+    if not heads:
+        return []
+
+    emails = {member.email for member in heads}
+    taken = set()
+    for username, email, member_id in User.objects.filter(
+        Q(username__in=emails) | Q(email__in=emails) |
+        Q(member_id__in=[member.pk for member in heads])
+    ).values_list("username", "email", "member_id"):
+        taken.update((username, email, member_id))
+
+    eligible = []
+    for member in heads:
+        if member.pk in taken or member.email in taken:
+            if member.pk not in taken:
+                logger.warning(
+                    "Not provisioning member %s: %s already has a login",
+                    member.pk, member.email
+                )
+            continue
+        # Two heads sharing an email: only the first gets the login
+        taken.add(member.email)
+        eligible.append(member)
+    return eligible
+
+
+def provision_family_heads(members):
+    """
+    Create logins for the family heads among `members` that lack one and
+    queue their invitations. Returns the created users. Call inside the
+    caller's transaction, so the invitations are only picked up once the
+    users are committed.
+    """
+    heads = _eligible_heads(members)
+    if not heads:
+        return []
+
+    users = []
+    for member in heads:
+        user = User(
+            username=member.email,
+            email=member.email,
+            role="USER",
+            member_id=member.pk,
+            church_id=member.church_id,
+            must_change_password=True,
+        )
+        # Random "!..." marker: no login until the invitation is sent
+        user.set_unusable_password()
+        users.append(user)
+
+    with transaction.atomic():
+        User.objects.bulk_create(users, batch_size=INSERT_BATCH_SIZE)
+
+        # Backends without RETURNING (MySQL) leave pk unset
+        if any(user.pk is None for user in users):
+            ids = dict(
+                User.objects
+                .filter(username__in=[user.username for user in users])
+                .values_list("username", "pk")
+            )
+            for user in users:
+                user.pk = ids[user.username]
+
+        user_ids = [user.pk for user in users]
+        for start in range(0, len(user_ids), INVITATION_BATCH_SIZE):
+            enqueue(INVITATION_JOB, {
+                "user_ids": user_ids[start:start + INVITATION_BATCH_SIZE],
+            })
+
+    logger.info("Provisioned %s family head logins", len(users))
+    return users
+
+
+# =====================================================
+# INVITATIONS
+# =====================================================
+
+def _invitation(user, password):
+    member = user.member
+    return EmailMessage(
+        subject="Your Parish Account Login Details",
+        body=(
+            f"Dear {member.name if member else user.email},\n\n"
+            f"Your parish account has been created.\n\n"
+            f"Login Email: {user.email}\n"
+            f"Password: {password}\n\n"
+            f"You will be asked to change your password after login.\n\n"
+            f"Regards,\n"
+            f"{user.church.name if user.church else ''}"
+        ),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[user.email],
+    )
+
+
+def send_invitations(user_ids):
+    """
+    Issue passwords to the users still waiting for their first one and
+    mail them. Returns the number of invitations sent.
+    """
+    users = list(
+        User.objects
+        .select_related("member", "church")
+        .filter(pk__in=user_ids, must_change_password=True)
+        .order_by("pk")
+    )
+    if not users:
+        return 0
+
+    passwords = [generate_password() for _ in users]
+    for user, hashed in zip(users, hash_passwords(passwords)):
+        user.password = hashed
+    User.objects.bulk_update(users, ["password"], batch_size=INSERT_BATCH_SIZE)
+
+    messages = [
+        _invitation(user, password)
+        for user, password in zip(users, passwords)
+    ]
+    # One SMTP session for the whole batch
+    return get_connection(fail_silently=False).send_messages(messages) or 0
@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from registry.models import Church
 from rest_framework import serializers
-from django.contrib.auth import authenticate
+from accounts.backends import EmailBackend
 from accounts.models import User
+from accounts.throttling import remember_church
 from django.contrib.auth import get_user_model
 
 User=get_user_model()
@@ -12,17 +13,14 @@ class LoginSerializer(serializers.Serializer):
     password = serializers.CharField(write_only=True)
 
     def validate(self, data):
-        try:
-            user = User.objects.get(email=data["email"])
-        except User.DoesNotExist:
-            raise serializers.ValidationError("Invalid credentials")
+        backend = EmailBackend()
+        user = backend.get_login_user(data["email"])
 
-        user = authenticate(
-            username=user.username,  # Django still authenticates via username internally
-            password=data["password"]
-        )
+        # Failed attempts on this email now count against its church too
+        if user is not None:
+            remember_church(user.email, user.church_id)
 
-        if not user:
+        if not backend.check_credentials(user, data["password"]):
             raise serializers.ValidationError("Invalid credentials")
 
         # ADMIN restriction
@@ -0,0 +1,15 @@
+from accounts.provisioning import INVITATION_JOB, send_invitations
+from registry.jobs import job
+
+
+# =====================================================
+# FAMILY HEAD LOGINS
+# =====================================================
+
+@job(INVITATION_JOB)
+def send_family_head_invitations(payload):
+    """
+    Issue passwords for a batch of provisioned logins and mail them
+    (see accounts.provisioning).
+    """
+    return {"sent": send_invitations(payload["user_ids"])}
@@ -0,0 +1,245 @@
+"""
+Sliding-window throttles for the unauthenticated auth endpoints.
+
+Each endpoint (scope) has limits per client IP, per submitted email and
+per church, set in settings.AUTH_THROTTLE_RATES. Counters live in the
+cache named by AUTH_THROTTLE_CACHE: process memory with LocMemCache, or
+shared by every worker with Django's RedisCache. The check runs in
+DRF's initial(), so a rejected request gets its 429 before the view
+touches the database.
+
+Per-church limits need the email's church, which is only known after a
+lookup; views call remember_church() once they have the user, and later
+requests for that email are counted against the church as well.
+
+A sliding window is approximated with two fixed windows: the previous
+window's count, weighted by how much of it still overlaps, plus the
+current one. Checks and increments are not one atomic step, so a burst
+of concurrent requests can overshoot a limit by a few.
+"""
+import hashlib
+import logging
+import math
+import re
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "throttle"
+CHURCH_OF_EMAIL_TIMEOUT = 24 * 60 * 60
+THROTTLE_KINDS = ("ip", "email", "church")
+
+_RATE_RE = re.compile(
+    r"^\s*(\d+)\s*/\s*(\d*)\s*(s|sec|second|m|min|minute|h|hour|d|day)s?\s*$"
+)
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """
+    "5/min", "20/15min", "100/day" -> (limit, window seconds).
+    """
+    match = _RATE_RE.match(rate or "")
+    if not match:
+        raise ImproperlyConfigured(f"Invalid throttle rate {rate!r}.")
+    limit, multiplier, unit = match.groups()
+    return int(limit), int(multiplier or 1) * _UNIT_SECONDS[unit[0]]
+
+
+def throttle_cache():
+    return caches[settings.AUTH_THROTTLE_CACHE]
+
+
+def normalize_email(email):
+    return email.strip().lower() if isinstance(email, str) else ""
+
+
+def _email_key(email):
+    # Cache keys must stay short and free of spaces/control characters
+    return hashlib.sha256(email.encode()).hexdigest()[:32]
+
+
+def remember_church(email, church_id):
+    """
+    Record which church an email belongs to, so the church's limit
+    applies to later requests without a DB lookup.
+    """
+    email = normalize_email(email)
+    if email and church_id:
+        throttle_cache().set(
+            f"{KEY_PREFIX}:church-of:{_email_key(email)}",
+            church_id,
+            CHURCH_OF_EMAIL_TIMEOUT
+        )
+
+
+# =====================================================
+# COUNTERS
+# =====================================================
+
+def _window_keys(key, window, now):
+    current = int(now // window)
+    return f"{key}:{current - 1}", f"{key}:{current}", (now % window) / window
+
+
+def _estimate(cache, key, window, now):
+    previous_key, current_key, elapsed = _window_keys(key, window, now)
+    counts = cache.get_many([previous_key, current_key])
+    previous = counts.get(previous_key, 0)
+    current = counts.get(current_key, 0)
+    return previous, current, elapsed
+
+
+def _seconds_until_allowed(previous, current, elapsed, limit, window):
+    if limit <= 0:
+        return window
+    if current + 1 > limit:
+        # The current window alone is full: wait for it to become the
+        # previous window and for its weight to decay far enough
+        needed = 1 - (limit - 1) / current
+        return window * (1 - elapsed) + window * max(needed, 0)
+    # Only the previous window's weight is in the way
+    needed = 1 - (limit - current - 1) / previous
+    return max((needed - elapsed) * window, 0)
+
+
+def _increment(cache, key, window, now):
+    _, current_key, _ = _window_keys(key, window, now)
+    # Kept for two windows: one as "current", one as "previous"
+    cache.add(current_key, 0, window * 2)
+    try:
+        cache.incr(current_key)
+    except ValueError:
+        cache.set(current_key, 1, window * 2)
+
+
+def record_rejection(scope, kind):
+    cache = throttle_cache()
+    key = f"{KEY_PREFIX}:rejected:{scope}:{kind}"
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def rejection_counts():
+    """
+    {scope: {kind: rejected requests}} for every configured limit.
+    Shared across workers when the throttle cache is.
+    """
+    keys = {
+        f"{KEY_PREFIX}:rejected:{scope}:{kind}": (scope, kind)
+        for scope, limits in settings.AUTH_THROTTLE_RATES.items()
+        for kind in limits
+    }
+    values = throttle_cache().get_many(list(keys))
+
+    counts = {}
+    for key, (scope, kind) in keys.items():
+        counts.setdefault(scope, {})[kind] = values.get(key, 0)
+    return counts
+
+
+# =====================================================
+# THROTTLES
+# =====================================================
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    Subclasses set `scope`, a key of settings.AUTH_THROTTLE_RATES:
+    {"ip": "20/min", "email": "5/10min", "church": "200/hour"}.
+    Kinds left out of the mapping are not limited.
+    """
+    scope = None
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def get_limits(self):
+        rates = settings.AUTH_THROTTLE_RATES.get(self.scope, {})
+        unknown = set(rates) - set(THROTTLE_KINDS)
+        if unknown:
+            raise ImproperlyConfigured(
+                f"Unknown throttle kinds for {self.scope!r}: {sorted(unknown)}"
+            )
+        return {kind: parse_rate(rate) for kind, rate in rates.items() if rate}
+
+    def get_idents(self, request, kinds):
+        idents = {}
+
+        if "ip" in kinds:
+            # X-Forwarded-For is trusted only as far as NUM_PROXIES
+            idents["ip"] = self.get_ident(request)
+
+        email = ""
+        if {"email", "church"} & set(kinds) and hasattr(request.data, "get"):
+            email = normalize_email(request.data.get("email"))
+
+        if "email" in kinds and email:
+            idents["email"] = _email_key(email)
+        if "church" in kinds and email:
+            church_id = throttle_cache().get(
+                f"{KEY_PREFIX}:church-of:{_email_key(email)}"
+            )
+            if church_id:
+                idents["church"] = church_id
+
+        return idents
+
+    def allow_request(self, request, view):
+        if not getattr(settings, "AUTH_THROTTLE_ENABLED", True):
+            return True
+
+        limits = self.get_limits()
+        if not limits:
+            return True
+
+        cache = throttle_cache()
+        now = time.time()
+        counters = []
+
+        for kind, ident in self.get_idents(request, limits).items():
+            limit, window = limits[kind]
+            key = f"{KEY_PREFIX}:{self.scope}:{kind}:{ident}"
+            previous, current, elapsed = _estimate(cache, key, window, now)
+
+            if previous * (1 - elapsed) + current + 1 > limit:
+                self.wait_seconds = _seconds_until_allowed(
+                    previous, current, elapsed, limit, window
+                )
+                record_rejection(self.scope, kind)
+                logger.warning(
+                    "Throttled %s by %s limit (%s/%ss)",
+                    self.scope, kind, limit, window
+                )
+                return False
+
+            counters.append((key, window))
+
+        # Only requests that are let through are counted
+        for key, window in counters:
+            _increment(cache, key, window, now)
+        return True
+
+    def wait(self):
+        if self.wait_seconds is None:
+            return None
+        return math.ceil(self.wait_seconds)
+
+
+class LoginThrottle(SlidingWindowThrottle):
+    scope = "login"
+
+
+class ForgotPasswordThrottle(SlidingWindowThrottle):
+    scope = "forgot_password"
+
+
+class ResetPasswordThrottle(SlidingWindowThrottle):
+    scope = "reset_password"
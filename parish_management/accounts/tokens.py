@@ -0,0 +1,255 @@
+"""
+Refresh-token revocation without a blacklist query per refresh.
+
+simplejwt checks every refresh token against BlacklistedToken (a join
+on OutstandingToken). Here each worker process keeps a bloom filter of
+the jtis blacklisted and not yet expired:
+
+* filter says "not revoked" -> accepted without touching the database
+  (the common case: a live token being refreshed);
+* filter says "maybe" -> the exact table check decides.
+
+The filter is loaded from the table once, extended incrementally
+whenever the revocation generation changes, and rebuilt every JWT_REVOCATION_REBUILD_SECONDS to drop expired jtis.
+Blacklisting bumps the generation in JWT_REVOCATION_CACHE, so with a
+shared cache (Redis) every worker sees a logout on its next check; with
+the per-process LocMemCache other workers catch up within
+JWT_REVOCATION_SYNC_SECONDS.
+
+Ids are allocated at insert but become visible at commit, so a row can
+appear below ids already read. Each extension re-reads the last
+REVOCATION_OVERLAP ids under the highest one seen as well; only rows
+not seen before are added.
+
+`manage.py prune_tokens` deletes expired outstanding tokens (and their
+blacklist rows) in batches, so both tables stay at the size of the
+refresh lifetime.
+"""
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+
+GENERATION_KEY = "jwt:revocation:generation"
+PRUNE_BATCH_SIZE = 1000
+REVOCATION_OVERLAP = 1000
+
+
+# =====================================================
+# BLOOM FILTER
+# =====================================================
+
+class BloomFilter:
+    """
+    Fixed-size bloom filter over strings; sized for `capacity` items at
+    `error_rate` false positives. No false negatives.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(int(capacity), 1)
+        self.size = max(
+            int(-capacity * math.log(error_rate) / (math.log(2) ** 2)), 8
+        )
+        self.hashes = max(int(round(self.size / capacity * math.log(2))), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+# =====================================================
+# REVOCATION INDEX
+# =====================================================
+
+def _cache():
+    return caches[settings.JWT_REVOCATION_CACHE]
+
+
+class RevocationIndex:
+    """
+    Per-process view of the blacklist. might_be_revoked() is O(1);
+    refreshing it reads only the newest blacklist rows (the ones above
+    the last seen id, plus the REVOCATION_OVERLAP ids below it).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._filter = None
+        self._high_water = 0
+        # pks read within REVOCATION_OVERLAP of the high-water mark
+        self._recent = set()
+        self._generation = None
+        self._synced_at = 0.0
+        self._built_at = 0.0
+
+    def might_be_revoked(self, jti):
+        self._refresh()
+        return jti in self._filter
+
+    def add(self, jti):
+        """
+        Record a revocation made by this process and announce it.
+        """
+        self._refresh()
+        with self._lock:
+            self._filter.add(jti)
+
+        cache = _cache()
+        cache.add(GENERATION_KEY, 0, None)
+        try:
+            cache.incr(GENERATION_KEY)
+        except ValueError:
+            cache.set(GENERATION_KEY, 1, None)
+
+    def _refresh(self):
+        now = time.monotonic()
+        rebuild = (
+            self._filter is None
+            or now - self._built_at >= settings.JWT_REVOCATION_REBUILD_SECONDS
+        )
+
+        if not rebuild and (
+            _cache().get(GENERATION_KEY, 0) == self._generation
+            and now - self._synced_at < settings.JWT_REVOCATION_SYNC_SECONDS
+        ):
+            return
+
+        with self._lock:
+            generation = _cache().get(GENERATION_KEY, 0)
+
+            # The new filter is swapped in whole, so readers never see
+            # a half-built one
+            if rebuild:
+                self._build()
+            else:
+                self._extend()
+
+            self._generation = generation
+            self._synced_at = time.monotonic()
+
+    def _live_rows(self):
+        return (
+            BlacklistedToken.objects
+            .filter(token__expires_at__gt=timezone.now())
+            .order_by("pk")
+            .values_list("pk", "token__jti")
+        )
+
+    def _build(self):
+        rows = list(self._live_rows())
+
+        # Headroom, so new revocations do not push the error rate up
+        # before the next rebuild
+        bloom = BloomFilter(
+            max(len(rows) * 2, settings.JWT_REVOCATION_BLOOM_CAPACITY)
+        )
+        for _, jti in rows:
+            bloom.add(jti)
+
+        self._filter = bloom
+        self._high_water = rows[-1][0] if rows else 0
+        self._recent = {
+            pk for pk, _ in rows if pk > self._high_water - REVOCATION_OVERLAP
+        }
+        self._built_at = time.monotonic()
+
+    def _extend(self):
+        rows = self._live_rows().filter(
+            pk__gt=self._high_water - REVOCATION_OVERLAP
+        )
+        for pk, jti in rows:
+            if pk not in self._recent:
+                self._filter.add(jti)
+                self._recent.add(pk)
+            self._high_water = max(self._high_water, pk)
+
+        floor = self._high_water - REVOCATION_OVERLAP
+        self._recent = {pk for pk in self._recent if pk > floor}
+
+
+revocations = RevocationIndex()
+
+
+# =====================================================
+# TOKENS
+# =====================================================
+
+class IndexedRefreshToken(RefreshToken):
+    """
+    RefreshToken whose blacklist check goes through the revocation index.
+    """
+
+    def check_blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+
+        if not revocations.might_be_revoked(jti):
+            return
+        super().check_blacklist()
+
+    def blacklist(self):
+        result = super().blacklist()
+        revocations.add(self.payload[api_settings.JTI_CLAIM])
+        return result
+
+
+class IndexedTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = IndexedRefreshToken
+
+
+# =====================================================
+# PRUNING
+# =====================================================
+
+def prune_expired_tokens(*, batch_size=PRUNE_BATCH_SIZE):
+    """
+    Delete expired OutstandingToken rows (their BlacklistedToken rows
+    cascade) batch_size at a time. Walks the primary key, which follows
+    issue order, so no index on expires_at is needed. Returns rows deleted.
+    """
+    now = timezone.now()
+    last_pk = 0
+    deleted = 0
+
+    while True:
+        pks = list(
+            OutstandingToken.objects
+            .filter(pk__gt=last_pk, expires_at__lte=now)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not pks:
+            break
+
+        BlacklistedToken.objects.filter(token_id__in=pks).delete()
+        count, _ = OutstandingToken.objects.filter(pk__in=pks).delete()
+        deleted += count
+        last_pk = pks[-1]
+
+    # Workers drop the pruned jtis from their filters at the next rebuild
+    return deleted
@@ -7,15 +7,12 @@ def generate_password(length=10):
 
 
 
-from django.contrib.auth import get_user_model
-from django.utils.crypto import get_random_string
-from django.core.mail import send_mail
-from django.conf import settings
-
-User = get_user_model()
-
-
 def create_family_head_user(member):
+    """
+    Login for a newly promoted family head. Created without hashing a
+    password in the request; the invitation (with the password) is
+    queued, see accounts.provisioning.
+    """
     # Safety checks
     if not member.is_family_head:
         return None
@@ -26,43 +23,17 @@ def create_family_head_user(member):
     if hasattr(member, "user"):
         return member.user  # already exists
 
-    password = get_random_string(10)
-
-    user = User.objects.create_user(
-        username=member.email,
-        email=member.email,
-        password=password,
-        role="USER",
-        member=member,
-        church=member.church,
-    )
-
-    # Send email
-    send_mail(
-        subject="Your Parish Account Login Details",
-        message=(
-            f"Dear {member.name},\n\n"
-            f"Your parish account has been created.\n\n"
-            f"Login Email: {member.email}\n"
-            f"Password: {password}\n\n"
-            f"Please change your password after login.\n\n"
-            f"Regards,\n"
-            f"{member.church.name}"
-        ),
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[member.email],
-        fail_silently=False,
-    )
+    from accounts.provisioning import provision_family_heads
 
-    return user
+    users = provision_family_heads([member])
+    return users[0] if users else None
 
 # accounts/utils.py
 
-import random
 import hashlib
 
 def generate_otp():
-    return f"{random.randint(100000, 999999)}"
+    return f"{secrets.randbelow(900000) + 100000}"
 
 def hash_otp(otp):
     return hashlib.sha256(otp.encode()).hexdigest()
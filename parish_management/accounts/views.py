@@ -1,28 +1,31 @@
-from accounts.models import PasswordResetOTP, User
-from accounts.utils import generate_otp, hash_otp
+from accounts.models import User
+from accounts.otp import ExpiredOTP, InvalidOTP, get_otp_store
+from django.conf import settings
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth import authenticate
-from rest_framework_simplejwt.tokens import RefreshToken
+from accounts.tokens import IndexedRefreshToken
 from accounts.serializers import ChangePasswordSerializer, LoginSerializer
 from rest_framework.permissions import AllowAny
 from rest_framework.permissions import IsAuthenticated
-from accounts.permissions import IsChurchUser
+from accounts.permissions import IsChurchUser, IsMemberUser
 from accounts.serializers import ChurchProfileSerializer
 from django.core.mail import send_mail
-from rest_framework.decorators import api_view,permission_classes
+from rest_framework.decorators import api_view,permission_classes,throttle_classes
+from accounts.throttling import ForgotPasswordThrottle, LoginThrottle, ResetPasswordThrottle, remember_church
 from django.contrib.auth.hashers import make_password
 
 class LoginAPIView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [LoginThrottle]
 
     def post(self, request):
         serializer = LoginSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
         user = serializer.validated_data["user"]
-        refresh = RefreshToken.for_user(user)
+        refresh = IndexedRefreshToken.for_user(user)
 
         response = {
             "access": str(refresh.access_token),
@@ -31,20 +34,20 @@ class LoginAPIView(APIView):
             "user_id": user.id,
             "email": user.email,
             "church_name": user.church.name if user.church else None,
-            
+            "must_change_password": user.must_change_password,
         }
 
         if user.role == "CHURCH":
             response.update({
-                "church_id": user.church.id,
+                "church_id": user.church_id,
                 "church_active": user.church.is_active,
             })
 
         if user.role == "USER":
             response.update({
-                "member_id": user.member.id,
-                "family_id": user.member.family.id,
-                "church_id": user.member.church.id,
+                "member_id": user.member_id,
+                "family_id": user.member.family_id,
+                "church_id": user.member.church_id,
             })
 
         return Response(response)
@@ -57,7 +60,7 @@ class LogoutAPIView(APIView):
     def post(self, request):
         try:
             refresh_token = request.data.get("refresh")
-            token = RefreshToken(refresh_token)
+            token = IndexedRefreshToken(refresh_token)
             token.blacklist()
             return Response(
                 {"detail": "Logged out successfully"},
@@ -70,7 +73,8 @@ class LogoutAPIView(APIView):
             )
 
 class ChangePasswordAPIView(APIView):
-    permission_classes = [IsAuthenticated, IsChurchUser]
+    # Family heads too: provisioned logins must replace their password
+    permission_classes = [IsAuthenticated, IsChurchUser | IsMemberUser]
 
     def post(self, request):
         serializer = ChangePasswordSerializer(data=request.data)
@@ -93,6 +97,7 @@ class ChangePasswordAPIView(APIView):
         # SET NEW PASSWORD
         # ----------------------------
         user.set_password(new_password)
+        user.must_change_password = False
         user.save()
 
         return Response(
@@ -121,6 +126,7 @@ class ChurchProfileAPIView(APIView):
 #forgot password
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes([ForgotPasswordThrottle])
 def forgot_password(request):
     email = request.data.get("email")
 
@@ -136,23 +142,16 @@ def forgot_password(request):
             status=200
         )
 
-    # Invalidate old OTPs
-    PasswordResetOTP.objects.filter(
-        user=user,
-        is_used=False
-    ).update(is_used=True)
-
-    otp = generate_otp()
-    otp_hash = hash_otp(otp)
+    remember_church(email, user.church_id)
 
-    PasswordResetOTP.objects.create(
-        user=user,
-        otp_hash=otp_hash
-    )
+    otp = get_otp_store().issue(user)
 
     send_mail(
         subject="Password Reset OTP",
-        message=f"Your OTP is {otp}. It is valid for 10 minutes.",
+        message=(
+            f"Your OTP is {otp}. It is valid for "
+            f"{settings.PASSWORD_RESET_OTP_TTL_MINUTES} minutes."
+        ),
         from_email=None,
         recipient_list=[email],
         fail_silently=False,
@@ -167,6 +166,7 @@ def forgot_password(request):
 #reset password
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes([ResetPasswordThrottle])
 def reset_password(request):
     email = request.data.get("email")
     otp = request.data.get("otp")
@@ -178,30 +178,26 @@ def reset_password(request):
             status=400
         )
 
-    try:
-        user = User.objects.get(email=email)
-    except User.DoesNotExist:
-        return Response({"error": "Invalid OTP"}, status=400)
-
-    otp_hash = hash_otp(otp)
+    # Count this and later attempts for the email against its church,
+    # wrong codes included (consume() only answers for the right one)
+    remember_church(
+        email,
+        User.objects.filter(email=email)
+        .values_list("church_id", flat=True)
+        .first()
+    )
 
     try:
-        otp_obj = PasswordResetOTP.objects.get(
-            user=user,
-            otp_hash=otp_hash,
-            is_used=False
-        )
-    except PasswordResetOTP.DoesNotExist:
-        return Response({"error": "Invalid or expired OTP"}, status=400)
-
-    if otp_obj.is_expired():
+        user_id = get_otp_store().consume(email, otp)
+    except ExpiredOTP:
         return Response({"error": "OTP expired"}, status=400)
+    except InvalidOTP:
+        return Response({"error": "Invalid or expired OTP"}, status=400)
 
     # Reset password
-    user.password = make_password(new_password)
-    user.save(update_fields=["password"])
-
-    otp_obj.is_used = True
-    otp_obj.save(update_fields=["is_used"])
+    User.objects.filter(pk=user_id).update(
+        password=make_password(new_password),
+        must_change_password=False
+    )
 
     return Response({"message": "Password reset successful"}, status=200)
\ No newline at end of file
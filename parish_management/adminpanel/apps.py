@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class AdminpanelConfig(AppConfig):
     name = 'adminpanel'
+
+    def ready(self):
+        from . import signals  # noqa: F401
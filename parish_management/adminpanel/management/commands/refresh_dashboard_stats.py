@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from adminpanel.stats import get_dashboard_stats, refresh_dashboard_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the admin dashboard counters. Run periodically from cron "
+        "(at least once after midnight) so the expiring-subscriptions tile "
+        "follows the date."
+    )
+
+    def handle(self, *args, **options):
+        refresh_dashboard_stats()
+        stats = get_dashboard_stats()
+        summary = ", ".join(f"{key}={value}" for key, value in stats.items())
+        self.stdout.write(self.style.SUCCESS(f"Dashboard stats refreshed: {summary}"))
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.1 on 2026-10-19 15:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('church_count', models.PositiveIntegerField(default=0)),
+                ('package_count', models.PositiveIntegerField(default=0)),
+                ('upgrade_request_count', models.PositiveIntegerField(default=0)),
+                ('expiring_count', models.PositiveIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'dashboard stats',
+            },
+        ),
+    ]
@@ -1,3 +1,19 @@
 from django.db import models
 
-# Create your models here.
+
+class DashboardStats(models.Model):
+    """
+    Single materialized row backing the admin dashboard tiles.
+    Rewritten by adminpanel.stats.refresh_dashboard_stats().
+    """
+    church_count = models.PositiveIntegerField(default=0)
+    package_count = models.PositiveIntegerField(default=0)
+    upgrade_request_count = models.PositiveIntegerField(default=0)
+    expiring_count = models.PositiveIntegerField(default=0)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name_plural = "dashboard stats"
+
+    def __str__(self):
+        return f"Dashboard stats ({self.refreshed_at})"
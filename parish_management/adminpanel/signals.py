@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from registry.models import Church, ChurchSubscription, Package, UpgradeRequest
+
+from .stats import schedule_dashboard_refresh
+
+
+@receiver(post_save, sender=Church)
+@receiver(post_delete, sender=Church)
+@receiver(post_save, sender=Package)
+@receiver(post_delete, sender=Package)
+@receiver(post_save, sender=UpgradeRequest)
+@receiver(post_delete, sender=UpgradeRequest)
+@receiver(post_save, sender=ChurchSubscription)
+@receiver(post_delete, sender=ChurchSubscription)
+def refresh_dashboard_counters(sender, **kwargs):
+    schedule_dashboard_refresh()
@@ -0,0 +1,106 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Func, IntegerField, Subquery
+from django.utils import timezone
+
+from registry.models import Church, ChurchSubscription, Package, UpgradeRequest
+
+from .models import DashboardStats
+
+DASHBOARD_STATS_PK = 1
+DASHBOARD_CACHE_KEY = "adminpanel:dashboard_stats"
+DASHBOARD_CACHE_TIMEOUT = 60
+EXPIRING_WINDOW_DAYS = 7
+
+STAT_FIELDS = (
+    "church_count",
+    "package_count",
+    "upgrade_request_count",
+    "expiring_count",
+)
+
+
+def _count(queryset):
+    # COUNT(*) as a scalar subquery (Func is not an aggregate, so no GROUP BY)
+    return Subquery(
+        queryset.order_by()
+        .annotate(n=Func(F("pk"), function="COUNT"))
+        .values("n")[:1],
+        output_field=IntegerField(),
+    )
+
+
+def _stat_expressions(today):
+    return {
+        "church_count": _count(Church.objects.all()),
+        "package_count": _count(Package.objects.all()),
+        "upgrade_request_count": _count(
+            UpgradeRequest.objects.filter(status="PENDING")
+        ),
+        "expiring_count": _count(
+            ChurchSubscription.objects.filter(
+                church__is_deleted=False,
+                payment_status="PAID",
+                end_date__gte=today,
+                end_date__lte=today + timedelta(days=EXPIRING_WINDOW_DAYS),
+            )
+        ),
+    }
+
+
+def refresh_dashboard_stats():
+    """
+    Recompute every tile in a single UPDATE ... SET col = (SELECT COUNT ...)
+    statement and drop the cached copy.
+    """
+    values = _stat_expressions(timezone.localdate())
+    values["refreshed_at"] = timezone.now()
+
+    rows = DashboardStats.objects.filter(pk=DASHBOARD_STATS_PK)
+    if not rows.update(**values):
+        DashboardStats.objects.get_or_create(pk=DASHBOARD_STATS_PK)
+        rows.update(**values)
+
+    cache.delete(DASHBOARD_CACHE_KEY)
+
+
+def schedule_dashboard_refresh():
+    transaction.on_commit(refresh_dashboard_stats)
+
+
+def get_dashboard_stats():
+    """
+    Dashboard tiles as a dict: served from cache, else from the stats row.
+    The row is refreshed first if missing or last written before today,
+    since the expiring window moves with the date.
+    """
+    stats = cache.get(DASHBOARD_CACHE_KEY)
+    if stats is not None:
+        return stats
+
+    row = (
+        DashboardStats.objects
+        .filter(pk=DASHBOARD_STATS_PK)
+        .values(*STAT_FIELDS, "refreshed_at")
+        .first()
+    )
+    today = timezone.localdate()
+
+    if (
+        row is None
+        or row["refreshed_at"] is None
+        or timezone.localdate(row["refreshed_at"]) < today
+    ):
+        refresh_dashboard_stats()
+        row = (
+            DashboardStats.objects
+            .filter(pk=DASHBOARD_STATS_PK)
+            .values(*STAT_FIELDS, "refreshed_at")
+            .get()
+        )
+
+    stats = {field: row[field] for field in STAT_FIELDS}
+    cache.set(DASHBOARD_CACHE_KEY, stats, DASHBOARD_CACHE_TIMEOUT)
+    return stats
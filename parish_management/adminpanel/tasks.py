@@ -0,0 +1,172 @@
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import send_mail
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.utils import generate_password
+from registry.jobs import job
+from registry.models import Bill, ChurchSubscription
+from registry.tenants import purge_church, restore_church
+
+User = get_user_model()
+
+
+# =====================================================
+# CHURCH ACCOUNT
+# =====================================================
+
+def _credentials_message(email, password, plan):
+    frontend_login_url = settings.FRONTEND_LOGIN_URL
+
+    message = (
+        f"Your church account has been created successfully.\n\n"
+        f"Email: {email}\n"
+        f"Password: {password}\n\n"
+        f"Login here:\n{frontend_login_url}\n\n"
+    )
+
+    if plan == "TRIAL":
+        return message + "You are on a TRIAL plan."
+    if plan == "BILLED":
+        return message + (
+            "A package has been assigned.\n"
+            "Your account will be activated after payment confirmation."
+        )
+    return message + "Please purchase a package to activate your account."
+
+
+@job("church.send_credentials")
+def send_church_credentials(payload):
+    """
+    Issue the church login a password and email it. The password is only
+    generated here, so it never sits in the job table. A retry issues a
+    new one, which invalidates any copy from an earlier failed send.
+    """
+    user = (
+        User.objects
+        .select_related("church")
+        .filter(church_id=payload["church_id"], role="CHURCH")
+        .order_by("id")
+        .first()
+    )
+    if user is None:
+        return {"sent": False, "reason": "Church login no longer exists."}
+
+    password = generate_password()
+    user.set_password(password)
+    user.save(update_fields=["password"])
+
+    send_mail(
+        subject="EGLISE Church Login Details",
+        message=_credentials_message(user.email, password, payload.get("plan")),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[user.email],
+        fail_silently=False,
+    )
+
+    return {"sent": True, "church_id": user.church_id}
+
+
+@job("church.remove_subscription")
+def remove_church_subscription(payload):
+    with transaction.atomic():
+        deleted, _ = ChurchSubscription.objects.filter(
+            pk=payload["subscription_id"]
+        ).delete()
+
+    return {"church_id": payload["church_id"], "deleted": deleted}
+
+
+@job("church.hard_delete")
+def hard_delete_church(payload):
+    # Chunked and resumable; a retried job picks up where it stopped
+    purge = purge_church(payload["church_id"])
+
+    return {
+        "deleted": purge.deleted,
+        "archive": purge.archive_path,
+    }
+
+
+@job("church.restore")
+def restore_archived_church(payload):
+    return {"restored": restore_church(payload["church_id"])}
+
+
+# =====================================================
+# BILLING
+# =====================================================
+
+@job("bill.mark_paid")
+def mark_bill_paid(payload):
+    """
+    Mark a bill PAID and apply its effects to the subscription.
+    The bill row is locked and re-checked, so a repeat run is a no-op.
+    """
+    with transaction.atomic():
+        bill = (
+            Bill.objects
+            .select_for_update()
+            .select_related("church", "subscription", "subscription__package")
+            .get(pk=payload["bill_id"])
+        )
+        subscription = bill.subscription
+        church = bill.church
+
+        if bill.status == "PAID" or subscription.package.is_trial:
+            return {"church_id": church.pk, "applied": False}
+
+        items = (bill.breakdown or {}).get("items", [])
+
+        # 1️⃣ Mark bill PAID
+        bill.status = "PAID"
+        bill.paid_at = timezone.now()
+        bill.save(update_fields=["status", "paid_at"])
+
+        # 2️⃣ APPLY BILL EFFECTS
+        apply_data = (bill.breakdown or {}).get("apply")
+
+        if apply_data:
+            subscription.package_id = apply_data["package_id"]
+            subscription.billing_cycle = apply_data["billing_cycle"]
+            subscription.custom_capacity = apply_data.get("custom_capacity")
+
+            today = timezone.now().date()
+
+            if bill.bill_type == "NEW":
+                duration_months = apply_data["duration_months"]
+
+                subscription.start_date = today
+                subscription.end_date = today + relativedelta(
+                    months=duration_months
+                )
+                subscription.duration_months = duration_months
+
+                # 🔥 CRITICAL
+                subscription.pricing_origin = "BASE"
+
+            elif bill.bill_type == "UPGRADE":
+                remaining_months = 0
+
+                if items and "remaining_months" in items[0]:
+                    remaining_months = items[0]["remaining_months"]
+
+                subscription.start_date = today
+                subscription.end_date = today + relativedelta(
+                    months=remaining_months
+                )
+                subscription.duration_months = remaining_months
+
+                # 🔥 CRITICAL
+                subscription.pricing_origin = "UPGRADE"
+
+        subscription.payment_status = "PAID"
+        subscription.is_active = True
+        subscription.save()
+
+        church.is_active = True
+        church.save(update_fields=["is_active"])
+
+    return {"church_id": church.pk, "applied": True}
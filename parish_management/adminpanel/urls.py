@@ -33,5 +33,13 @@ urlpatterns = [
     path("upgrade-requests/",views.upgrade_request_list,name="upgrade_request_list"),
     path("upgrade-requests/<int:pk>/",views.upgrade_request_detail,name="upgrade_request_detail"),
     path("churches/expiring/",views.expiring_churches,name="expiring_churches"),
+    path("analytics/revenue/",views.revenue_analytics,name="revenue_analytics"),
+
+    path("jobs/",views.job_list,name="job_list"),
+    path("jobs/<int:pk>/",views.job_detail,name="job_detail"),
+    path("jobs/<int:pk>/status/",views.job_status,name="job_status"),
+
+    path("system/db-pool/",views.db_pool_status,name="db_pool_status"),
+    path("system/throttles/",views.throttle_status,name="throttle_status"),
 
 ]
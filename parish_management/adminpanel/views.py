@@ -2,20 +2,30 @@ from pyexpat.errors import messages
 from django.contrib.auth import authenticate, login, logout, get_user_model
 from django.shortcuts import render, redirect
 from django.db import transaction, IntegrityError
-from django.core.mail import send_mail
-from django.conf import settings
 from django.shortcuts import get_object_or_404
 from adminpanel.decorators import admin_required
 from adminpanel.forms import PackageForm, ChurchForm, ChurchSubscriptionForm
-from registry.models import Bill, Church, Package, ChurchSubscription, UpgradeRequest
-from accounts.utils import generate_password
+from registry.models import BackgroundJob, Bill, Church, ChurchArchive, ChurchPurge, Member, Package, ChurchSubscription, UpgradeRequest
+from registry.jobs import enqueue, has_active_job, retry_job
+from registry.tenants import restore_church
+from django.core.paginator import Paginator
+from django.db.models import Count, Max, Min, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils.dateparse import parse_date
+from django.utils.http import url_has_allowed_host_and_scheme, urlencode
+from django.http import JsonResponse
+from django.urls import reverse
 from django.contrib.auth import logout
-from datetime import date, timedelta
-from dateutil.relativedelta import relativedelta
+from datetime import date, datetime, timedelta
 from registry.services import calculate_package_pricing, calculate_prorated_upgrade_amount,get_next_subscription_action
+from registry.analytics import local_period, revenue_summary
+from adminpanel.stats import get_dashboard_stats
+from parish_management.db.pool import pool_stats
+from accounts.throttling import rejection_counts
 from django.utils import timezone
 from django.core.serializers.json import DjangoJSONEncoder
 import json
+import os
 from decimal import Decimal
 from django.db import transaction
 from django.shortcuts import get_object_or_404, redirect, render
@@ -51,25 +61,7 @@ def admin_logout(request):
 
 @admin_required
 def dashboard(request):
-    church_count = Church.objects.count()
-    package_count = Package.objects.count()
-
-    upgrade_request_count = UpgradeRequest.objects.filter(
-        status="PENDING"
-    ).count()
-
-    expiring_count = ChurchSubscription.objects.filter(
-        payment_status="PAID",
-        end_date__lte=now().date() + timedelta(days=7),
-        end_date__gte=now().date()
-    ).count()
-
-    return render(request, "adminpanel/dashboard.html", {
-        "church_count": church_count,
-        "package_count": package_count,
-        "upgrade_request_count": upgrade_request_count,
-        "expiring_count": expiring_count,
-    })
+    return render(request, "adminpanel/dashboard.html", get_dashboard_stats())
 
 #-------------package section---------#
 
@@ -155,14 +147,14 @@ def church_create(request):
             church.is_active = False
             church.save()
 
-            # 2️⃣ Create Church User
-            password = generate_password()
+            # 2️⃣ Create Church User (password is issued by the credentials job)
             User.objects.create_user(
                 username=church.email,
                 email=church.email,
-                password=password,
+                password=None,
                 role="CHURCH",
-                church=church
+                church=church,
+                must_change_password=True,
             )
 
             # 3️⃣ Subscription + Billing
@@ -242,41 +234,20 @@ def church_create(request):
 
                     bill_created = True
 
-            # 4️⃣ Email (send only after everything succeeds)
-            frontend_login_url = settings.FRONTEND_LOGIN_URL
-
+            # 4️⃣ Email login details from the job worker
+            #    (queued in this transaction, so only sent once it commits)
             if package and package.is_trial:
-                message = (
-                    f"Your church account has been created successfully.\n\n"
-                    f"Email: {church.email}\n"
-                    f"Password: {password}\n\n"
-                    f"Login here:\n{frontend_login_url}\n\n"
-                    f"You are on a TRIAL plan."
-                )
+                plan = "TRIAL"
             elif bill_created:
-                message = (
-                    f"Your church account has been created successfully.\n\n"
-                    f"Email: {church.email}\n"
-                    f"Password: {password}\n\n"
-                    f"Login here:\n{frontend_login_url}\n\n"
-                    f"A package has been assigned.\n"
-                    f"Your account will be activated after payment confirmation."
-                )
+                plan = "BILLED"
             else:
-                message = (
-                    f"Your church account has been created successfully.\n\n"
-                    f"Email: {church.email}\n"
-                    f"Password: {password}\n\n"
-                    f"Login here:\n{frontend_login_url}\n\n"
-                    f"Please purchase a package to activate your account."
-                )
+                plan = "NONE"
 
-            send_mail(
-                subject="EGLISE Church Login Details",
-                message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[church.email],
-                fail_silently=False,
+            enqueue(
+                "church.send_credentials",
+                {"church_id": church.pk, "plan": plan},
+                idempotency_key=f"church-credentials:{church.pk}",
+                max_attempts=5,
             )
 
             return redirect("adminpanel:church_list")
@@ -292,23 +263,106 @@ def church_create(request):
     )
 
 
+CHURCH_PAGE_SIZE = 25
+
+
+def _count_subquery(queryset):
+    """
+    Correlated COUNT(*) for annotating one row per church,
+    without the row fan-out of joining several Count()s.
+    """
+    return Coalesce(
+        Subquery(
+            queryset
+            .order_by()
+            .values("church")
+            .annotate(c=Count("pk"))
+            .values("c")
+        ),
+        0
+    )
+
+
 @admin_required
 def church_list(request):
+    filters = {
+        "q": request.GET.get("q", "").strip(),
+        "status": request.GET.get("status", ""),
+        "deleted": request.GET.get("deleted", ""),
+        "package": request.GET.get("package", ""),
+        "payment": request.GET.get("payment", ""),
+    }
+
+    churches = (
+        Church.all_objects.deleted()
+        if filters["deleted"] == "1"
+        else Church.objects.all()
+    )
+
+    if filters["status"] == "active":
+        churches = churches.filter(is_active=True)
+    elif filters["status"] == "inactive":
+        churches = churches.filter(is_active=False)
+
+    if filters["q"]:
+        churches = churches.filter(
+            Q(name__icontains=filters["q"]) |
+            Q(city__icontains=filters["q"]) |
+            Q(email__icontains=filters["q"])
+        )
+
+    if filters["package"].isdigit():
+        churches = churches.filter(
+            churchsubscription__package_id=filters["package"]
+        )
+
+    if filters["payment"] in ("PAID", "UNPAID"):
+        churches = churches.filter(
+            churchsubscription__payment_status=filters["payment"]
+        )
+    elif filters["payment"] == "NONE":
+        churches = churches.filter(churchsubscription__isnull=True)
+
     churches = (
-        Church.objects
+        churches
         .select_related("churchsubscription", "churchsubscription__package")
-        .all()
+        .annotate(
+            member_count=_count_subquery(
+                Member.objects.filter(
+                    church=OuterRef("pk"),
+                    is_active=True,
+                    expired=False
+                )
+            ),
+            unpaid_bill_count=_count_subquery(
+                Bill.objects.filter(
+                    church=OuterRef("pk"),
+                    status="UNPAID"
+                )
+            ),
+        )
+        .order_by("-created_at", "-id")
     )
+
+    page_obj = Paginator(churches, CHURCH_PAGE_SIZE).get_page(
+        request.GET.get("page")
+    )
+
     return render(
         request,
         "adminpanel/church/church_list.html",
-        {"churches": churches}
+        {
+            "churches": page_obj.object_list,
+            "page_obj": page_obj,
+            "filters": filters,
+            "packages": Package.objects.order_by("name"),
+        }
     )
 
 
 @admin_required
 def church_detail(request, pk):
-    church = get_object_or_404(Church, pk=pk)
+    church = get_object_or_404(Church.all_objects, pk=pk)
     subscription = getattr(church, "churchsubscription", None)
 
     pricing = None
@@ -345,7 +399,7 @@ def church_detail(request, pk):
 @admin_required
 @transaction.atomic
 def church_edit(request, pk):
-    church = get_object_or_404(Church, pk=pk)
+    church = get_object_or_404(Church.objects, pk=pk)
     subscription = getattr(church, "churchsubscription", None)
 
     church_form = ChurchForm(
@@ -377,6 +431,17 @@ def church_edit(request, pk):
         for p in packages
     }
 
+    if (
+        request.method == "POST"
+        and subscription
+        and has_active_job(f"subscription-remove:{subscription.pk}")
+    ):
+        messages.error(
+            request,
+            "This subscription is still being removed. Please try again shortly."
+        )
+        return redirect("adminpanel:church_detail", pk=church.pk)
+
     if request.method == "POST" and church_form.is_valid() and sub_form.is_valid():
         church = church_form.save(commit=False)
 
@@ -393,10 +458,21 @@ def church_edit(request, pk):
         # REMOVE SUBSCRIPTION
         # -------------------------------------------------
         if not package:
-            if subscription:
-                subscription.delete()
             church.is_active = False
             church.save()
+
+            if subscription:
+                # Bills cascade with the subscription; delete off-request
+                job = enqueue(
+                    "church.remove_subscription",
+                    {"church_id": church.pk, "subscription_id": subscription.pk},
+                    idempotency_key=f"subscription-remove:{subscription.pk}",
+                )
+                return _redirect_to_job(
+                    job,
+                    reverse("adminpanel:church_detail", args=[church.pk])
+                )
+
             return redirect("adminpanel:church_detail", pk=church.pk)
 
         # -------------------------------------------------
@@ -607,7 +683,7 @@ def church_edit(request, pk):
 @admin_required
 @transaction.atomic
 def church_delete(request, pk):
-    church = get_object_or_404(Church, pk=pk, is_deleted=False)
+    church = get_object_or_404(Church.objects, pk=pk)
     subscription = getattr(church, "churchsubscription", None)
 
     if subscription and subscription.payment_status == "PAID":
@@ -641,20 +717,108 @@ def church_delete(request, pk):
 
 
 
+BILL_PAGE_SIZE = 50
+
+
+def _day_start(value):
+    """
+    Aware datetime at the start of a YYYY-MM-DD day, or None.
+    Used instead of created_at__date so the range stays on the index.
+    """
+    try:
+        day = parse_date(value) if value else None
+    except ValueError:
+        day = None
+    if day is None:
+        return None
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
+def _month_starts(first, last):
+    month = first.replace(day=1)
+    while month <= last:
+        yield month
+        month = (month + timedelta(days=32)).replace(day=1)
+
+
 @admin_required
 def bill_list(request):
-    bills = Bill.objects.select_related(
-        "church", "subscription"
-    ).order_by("-created_at")
+    filters = {
+        "church": request.GET.get("church", ""),
+        "status": request.GET.get("status", ""),
+        "type": request.GET.get("type", ""),
+        "package": request.GET.get("package", ""),
+        "date_from": request.GET.get("date_from", ""),
+        "date_to": request.GET.get("date_to", ""),
+    }
 
-    church_id = request.GET.get("church")
-    if church_id:
-        bills = bills.filter(church_id=church_id)
+    bills = Bill.objects.all()
+
+    if filters["church"].isdigit():
+        bills = bills.filter(church_id=filters["church"])
+
+    if filters["status"] in dict(Bill.STATUS_CHOICES):
+        bills = bills.filter(status=filters["status"])
+
+    if filters["type"] in dict(Bill.BILL_TYPE_CHOICES):
+        bills = bills.filter(bill_type=filters["type"])
+
+    if filters["package"].isdigit():
+        bills = bills.filter(subscription__package_id=filters["package"])
+
+    start = _day_start(filters["date_from"])
+    if start:
+        bills = bills.filter(created_at__gte=start)
+
+    end = _day_start(filters["date_to"])
+    if end:
+        bills = bills.filter(created_at__lt=end + timedelta(days=1))
+
+    # -------------------------------------------------
+    # TOTALS STRIP: one GROUP BY over the same filtered
+    # range as the list (bill_status_created_idx). Local
+    # months come from local_period(), not TruncMonth,
+    # which needs MySQL's time-zone tables.
+    # -------------------------------------------------
+    span = bills.aggregate(first=Min("created_at"), last=Max("created_at"))
+    monthly_totals = []
+
+    if span["first"] is not None:
+        months = list(_month_starts(
+            timezone.localtime(span["first"]).date(),
+            timezone.localtime(span["last"]).date(),
+        ))
+        monthly_totals = (
+            bills
+            .annotate(month=local_period("created_at", months))
+            .values("month")
+            .annotate(
+                paid=Sum("amount", filter=Q(status="PAID"), default=Decimal("0")),
+                unpaid=Sum("amount", filter=Q(status="UNPAID"), default=Decimal("0")),
+                cancelled=Sum("amount", filter=Q(status="CANCELLED"), default=Decimal("0")),
+            )
+            .order_by("-month")
+        )
+
+    page_obj = Paginator(
+        bills
+        .select_related("church", "subscription__package")
+        .order_by("-created_at", "-id"),
+        BILL_PAGE_SIZE
+    ).get_page(request.GET.get("page"))
 
     return render(
         request,
         "adminpanel/bill/bill_list.html",
-        {"bills": bills}
+        {
+            "bills": page_obj.object_list,
+            "page_obj": page_obj,
+            "monthly_totals": monthly_totals,
+            "filters": filters,
+            "packages": Package.objects.order_by("name"),
+            "status_choices": Bill.STATUS_CHOICES,
+            "type_choices": Bill.BILL_TYPE_CHOICES,
+        }
     )
 
 
@@ -710,56 +874,16 @@ def bill_detail(request, pk):
         if subscription.package.is_trial:
             return redirect("adminpanel:church_detail", pk=church.pk)
 
-        # 1️⃣ Mark bill PAID
-        bill.status = "PAID"
-        bill.paid_at = timezone.now()
-        bill.save(update_fields=["status", "paid_at"])
-
-        # 2️⃣ APPLY BILL EFFECTS
-        apply_data = (bill.breakdown or {}).get("apply")
-
-        if apply_data:
-            subscription.package_id = apply_data["package_id"]
-            subscription.billing_cycle = apply_data["billing_cycle"]
-            subscription.custom_capacity = apply_data.get("custom_capacity")
-
-            today = timezone.now().date()
-
-            if bill.bill_type == "NEW":
-                duration_months = apply_data["duration_months"]
-
-                subscription.start_date = today
-                subscription.end_date = today + relativedelta(
-                    months=duration_months
-                )
-                subscription.duration_months = duration_months
-
-                # 🔥 CRITICAL
-                subscription.pricing_origin = "BASE"
-
-            elif bill.bill_type == "UPGRADE":
-                remaining_months = 0
-
-                if items and "remaining_months" in items[0]:
-                    remaining_months = items[0]["remaining_months"]
-
-                subscription.start_date = today
-                subscription.end_date = today + relativedelta(
-                    months=remaining_months
-                )
-                subscription.duration_months = remaining_months
-
-                # 🔥 CRITICAL
-                subscription.pricing_origin = "UPGRADE"
-
-        subscription.payment_status = "PAID"
-        subscription.is_active = True
-        subscription.save()
-
-        church.is_active = True
-        church.save(update_fields=["is_active"])
-
-        return redirect("adminpanel:church_detail", pk=church.pk)
+        # Applied by the job worker; the key stops double submits
+        job = enqueue(
+            "bill.mark_paid",
+            {"bill_id": bill.pk},
+            idempotency_key=f"bill-mark-paid:{bill.pk}",
+        )
+        return _redirect_to_job(
+            job,
+            reverse("adminpanel:church_detail", args=[church.pk])
+        )
 
     # =================================================
     # GET: RENDER PAGE
@@ -773,6 +897,9 @@ def bill_detail(request, pk):
             "church": church,
             "members": members,
             "rate": rate,
+            "payment_job": BackgroundJob.objects.filter(
+                idempotency_key=f"bill-mark-paid:{bill.pk}"
+            ).first(),
         }
     )
 
@@ -800,7 +927,7 @@ def mark_payment_unpaid(request, pk):
 
 @admin_required
 def church_suspend(request, pk):
-    church = get_object_or_404(Church, pk=pk)
+    church = get_object_or_404(Church.objects, pk=pk)
 
     church.is_active = False
     church.save(update_fields=["is_active"])
@@ -816,11 +943,7 @@ def church_suspend(request, pk):
 @admin_required
 @transaction.atomic
 def church_activate(request, pk):
-    church = get_object_or_404(
-        Church,
-        pk=pk,
-        is_deleted=False
-    )
+    church = get_object_or_404(Church.objects, pk=pk)
 
     subscription = getattr(church, "churchsubscription", None)
 
@@ -850,16 +973,39 @@ def church_activate(request, pk):
 @admin_required
 @transaction.atomic
 def church_restore(request, pk):
-    church = get_object_or_404(
-        Church,
-        pk=pk,
-        is_deleted=True
+    church = get_object_or_404(Church.all_objects.deleted(), pk=pk)
+
+    # Once a purge has started, dependents are (partly) gone
+    if (
+        has_active_job(f"church-hard-delete:{church.pk}")
+        or ChurchPurge.objects.filter(church_id=church.pk).exists()
+    ):
+        messages.error(
+            request,
+            "This church is being permanently deleted and cannot be restored."
+        )
+        return redirect("adminpanel:church_list")
+
+    archive = (
+        ChurchArchive.objects
+        .filter(church=church)
+        .only("pk", "created_at")
+        .first()
     )
 
-    church.is_deleted = False
-    church.deleted_at = None
-    church.is_active = False  # stays inactive until admin decides
-    church.save(update_fields=["is_deleted", "deleted_at", "is_active"])
+    # Archived members/families/baptisms are rehydrated by the job worker
+    if archive:
+        job = enqueue(
+            "church.restore",
+            {"church_id": church.pk},
+            idempotency_key=(
+                f"church-restore:{church.pk}:"
+                f"{archive.created_at:%Y%m%d%H%M%S%f}"
+            ),
+        )
+        return _redirect_to_job(job, reverse("adminpanel:church_list"))
+
+    restore_church(church.pk)
 
     return redirect("adminpanel:church_list")
 
@@ -867,12 +1013,15 @@ def church_restore(request, pk):
 @admin_required
 @transaction.atomic
 def church_hard_delete(request, pk):
-    church = get_object_or_404(Church, pk=pk, is_deleted=True)
+    church = get_object_or_404(Church.all_objects.deleted(), pk=pk)
 
     if request.method == "POST":
-        User.objects.filter(church=church).delete()
-        church.delete()  # 🔥 REAL DELETE
-        return redirect("adminpanel:church_list")
+        job = enqueue(
+            "church.hard_delete",
+            {"church_id": church.pk},
+            idempotency_key=f"church-hard-delete:{church.pk}",
+        )
+        return _redirect_to_job(job, reverse("adminpanel:church_list"))
 
     return render(
         request,
@@ -980,3 +1129,121 @@ def expiring_churches(request):
         }
     )
 
+
+#revenue analytics
+ANALYTICS_RANGES = (30, 90, 365)
+
+
+@admin_required
+def revenue_analytics(request):
+    days = request.GET.get("days", "30")
+    days = int(days) if days.isdigit() and int(days) in ANALYTICS_RANGES else 30
+
+    end = timezone.localdate()
+    start = end - timedelta(days=days - 1)
+
+    return render(
+        request,
+        "adminpanel/analytics/revenue.html",
+        {
+            "summary": revenue_summary(start, end),
+            "days": days,
+            "ranges": ANALYTICS_RANGES,
+            "start": start,
+            "end": end,
+        }
+    )
+
+
+#-------------background jobs---------#
+
+JOB_PAGE_SIZE = 50
+
+
+def _safe_next(request, url):
+    if url and url_has_allowed_host_and_scheme(
+        url,
+        allowed_hosts={request.get_host()},
+        require_https=request.is_secure()
+    ):
+        return url
+    return None
+
+
+def _redirect_to_job(job, next_url):
+    return redirect(
+        f"{reverse('adminpanel:job_detail', args=[job.pk])}"
+        f"?{urlencode({'next': next_url})}"
+    )
+
+
+@admin_required
+def job_list(request):
+    status = request.GET.get("status", "")
+
+    jobs = BackgroundJob.objects.order_by("-created_at", "-id")
+    if status:
+        jobs = jobs.filter(status=status)
+
+    page_obj = Paginator(jobs, JOB_PAGE_SIZE).get_page(request.GET.get("page"))
+
+    return render(
+        request,
+        "adminpanel/job/job_list.html",
+        {
+            "jobs": page_obj.object_list,
+            "page_obj": page_obj,
+            "status": status,
+            "status_choices": BackgroundJob.STATUS_CHOICES,
+        }
+    )
+
+
+@admin_required
+def job_detail(request, pk):
+    job = get_object_or_404(BackgroundJob, pk=pk)
+
+    if request.method == "POST" and request.POST.get("action") == "retry":
+        if retry_job(job):
+            messages.success(request, "Job queued again.")
+        return redirect(request.get_full_path())
+
+    return render(
+        request,
+        "adminpanel/job/job_detail.html",
+        {
+            "job": job,
+            "next_url": _safe_next(request, request.GET.get("next")),
+        }
+    )
+
+
+@admin_required
+def job_status(request, pk):
+    job = get_object_or_404(BackgroundJob, pk=pk)
+
+    return JsonResponse({
+        "id": job.pk,
+        "name": job.name,
+        "status": job.status,
+        "finished": job.is_finished,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "run_after": job.run_after,
+        "finished_at": job.finished_at,
+        "result": job.result,
+    })
+
+
+@admin_required
+def db_pool_status(request):
+    # Counters are per worker process; each response reports its own
+    return JsonResponse({
+        "pid": os.getpid(),
+        "pools": pool_stats(),
+    })
+
+
+@admin_required
+def throttle_status(request):
+    return JsonResponse({"rejected": rejection_counts()})
@@ -0,0 +1,93 @@
+"""
+mysql.connector.django with connection pooling.
+
+    "ENGINE": "parish_management.db.mysql",
+    "OPTIONS": {..., "pool": {"max_size": 10, "timeout": 5}},
+
+"pool": True uses POOL_DEFAULTS; without "pool" this behaves exactly
+like mysql.connector.django. Like Django's own PostgreSQL pool, it
+requires CONN_MAX_AGE = 0: the pool is what keeps connections open.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from mysql.connector.django import base as mysql_base
+
+from parish_management.db.pool import POOL_DEFAULTS, ConnectionPool, get_pool
+
+
+class DatabaseWrapper(mysql_base.DatabaseWrapper):
+
+    @property
+    def pool_options(self):
+        options = self.settings_dict["OPTIONS"].get("pool")
+        if not options:
+            return None
+        if self.settings_dict["CONN_MAX_AGE"] != 0:
+            raise ImproperlyConfigured(
+                "Pooling doesn't support persistent connections; "
+                "set CONN_MAX_AGE to 0."
+            )
+        return {**POOL_DEFAULTS, **(options if isinstance(options, dict) else {})}
+
+    @property
+    def pool(self):
+        options = self.pool_options
+        if options is None:
+            return None
+        return get_pool(self.pool_key, lambda: self._create_pool(options))
+
+    @property
+    def pool_key(self):
+        # The test runner renames NAME; never hand out the old database
+        return (self.alias, self.settings_dict["NAME"])
+
+    def _create_pool(self, options):
+        params = self.get_connection_params()
+        connect = super().get_new_connection
+
+        return ConnectionPool(
+            f"{self.alias}:{self.settings_dict['NAME']}",
+            connect=lambda: connect(dict(params)),
+            check=lambda connection: connection.ping(reconnect=False),
+            **options,
+        )
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop("pool", None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        return pool.getconn()
+
+    def _close(self):
+        pool = self.pool
+        if pool is None or self.connection is None:
+            return super()._close()
+
+        # A connection that raised a database error is only handed out
+        # again if it still answers; the pool itself pings idle ones
+        # after check_after at the earliest
+        discard = self.errors_occurred and not self.is_usable()
+
+        # The next borrower must not inherit an open transaction
+        if not discard:
+            try:
+                if self.connection.in_transaction:
+                    self.connection.rollback()
+            except Exception:
+                discard = True
+
+        if not discard:
+            with self.wrap_database_errors:
+                pool.putconn(self.connection)
+            return
+
+        # Close it the way the unpooled backend does, then free its slot
+        # (putconn's own close of it is a no-op by then)
+        try:
+            super()._close()
+        finally:
+            pool.putconn(self.connection, discard=True)
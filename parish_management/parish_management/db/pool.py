@@ -0,0 +1,268 @@
+"""
+A small thread-safe connection pool, one per database alias per process.
+
+Used by the parish_management.db.mysql backend. Django still "opens" and
+"closes" its connection for every request (WSGI or ASGI); with the pool
+that only borrows and returns an already authenticated MySQL session.
+A borrower waits up to `timeout` seconds when all `max_size` connections
+are in use; the waits are recorded in PoolStats.
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from django.db import OperationalError
+
+logger = logging.getLogger(__name__)
+
+POOL_DEFAULTS = {
+    "max_size": 10,        # open connections per worker process
+    "timeout": 5.0,        # seconds to wait for a free connection
+    "max_idle": 300,       # close connections idle longer than this
+    "max_lifetime": 1800,  # recycle connections older than this
+    "check_after": 30,     # ping before reuse when idle longer than this
+    "warn_wait": 0.5,      # log checkouts that waited longer than this
+}
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+class _Entry:
+    __slots__ = ("connection", "created_at", "returned_at")
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = self.returned_at = time.monotonic()
+
+
+class PoolStats:
+    def __init__(self):
+        self.checkouts = 0
+        self.created = 0
+        self.discarded = 0
+        self.timeouts = 0
+        self.waits = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def as_dict(self):
+        return {
+            "checkouts": self.checkouts,
+            "created": self.created,
+            "discarded": self.discarded,
+            "timeouts": self.timeouts,
+            "waits": self.waits,
+            "wait_avg_ms": round(
+                self.wait_total / self.checkouts * 1000, 3
+            ) if self.checkouts else 0.0,
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+        }
+
+
+class ConnectionPool:
+    """
+    connect() opens a new raw DB-API connection; check(connection) raises
+    if a connection is dead. Idle connections are reused newest first,
+    so surplus ones age out through max_idle.
+    """
+
+    def __init__(self, name, connect, check, **options):
+        options = {**POOL_DEFAULTS, **options}
+
+        self.name = name
+        self.max_size = int(options["max_size"])
+        self.timeout = float(options["timeout"])
+        self.max_idle = float(options["max_idle"])
+        self.max_lifetime = float(options["max_lifetime"])
+        self.check_after = float(options["check_after"])
+        self.warn_wait = float(options["warn_wait"])
+
+        self._connect = connect
+        self._check = check
+        self._cond = threading.Condition()
+        self._idle = deque()
+        self._in_use = {}  # id(connection) -> _Entry
+        self._size = 0     # idle + in use + being opened
+        self._closed = False
+        self.stats = PoolStats()
+
+    # -----------------------------
+    # Borrow / return
+    # -----------------------------
+    def getconn(self):
+        started = time.monotonic()
+        entry, waited = self._acquire(started + self.timeout)
+
+        if entry is not None and not self._usable(entry):
+            self._close_quietly(entry.connection)
+            with self._cond:
+                self.stats.discarded += 1
+            entry = None  # the slot stays ours, open a fresh connection
+
+        if entry is None:
+            try:
+                entry = _Entry(self._connect())
+            except Exception:
+                self._release_slot()
+                raise
+            with self._cond:
+                self.stats.created += 1
+
+        wait = time.monotonic() - started
+        with self._cond:
+            self._in_use[id(entry.connection)] = entry
+            self.stats.checkouts += 1
+            self.stats.wait_total += wait
+            self.stats.wait_max = max(self.stats.wait_max, wait)
+            if waited:
+                self.stats.waits += 1
+
+        if wait > self.warn_wait:
+            logger.warning(
+                "DB pool %s: waited %.3fs for a connection (max_size=%s)",
+                self.name, wait, self.max_size
+            )
+        return entry.connection
+
+    def putconn(self, connection, *, discard=False):
+        with self._cond:
+            entry = self._in_use.pop(id(connection), None)
+
+        if entry is None:
+            # Not ours (pool was reset after a fork); just close it
+            self._close_quietly(connection)
+            return
+
+        if (
+            discard
+            or self._closed
+            or time.monotonic() - entry.created_at > self.max_lifetime
+        ):
+            self._close_quietly(connection)
+            with self._cond:
+                self.stats.discarded += 1
+            self._release_slot()
+            return
+
+        entry.returned_at = time.monotonic()
+        with self._cond:
+            self._idle.append(entry)
+            self._cond.notify()
+
+    def close(self):
+        """
+        Close idle connections; borrowed ones close when returned.
+        """
+        with self._cond:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for entry in idle:
+            self._close_quietly(entry.connection)
+
+    def snapshot(self):
+        with self._cond:
+            return {
+                "name": self.name,
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                **self.stats.as_dict(),
+            }
+
+    # -----------------------------
+    # Internals
+    # -----------------------------
+    def _acquire(self, deadline):
+        """
+        An idle entry, or None once a slot is reserved for a new connection.
+        """
+        waited = False
+        with self._cond:
+            while True:
+                if self._idle:
+                    return self._idle.pop(), waited
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None, waited
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats.timeouts += 1
+                    raise PoolTimeout(
+                        f"No database connection free in pool {self.name!r} "
+                        f"after {self.timeout}s (max_size={self.max_size})."
+                    )
+                waited = True
+                self._cond.wait(remaining)
+
+    def _usable(self, entry):
+        now = time.monotonic()
+        if now - entry.created_at > self.max_lifetime:
+            return False
+        if now - entry.returned_at > self.max_idle:
+            return False
+        if now - entry.returned_at > self.check_after:
+            try:
+                self._check(entry.connection)
+            except Exception:
+                logger.info("DB pool %s: dropped a dead connection", self.name)
+                return False
+        return True
+
+    def _release_slot(self):
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+# =====================================================
+# REGISTRY
+# =====================================================
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(key, factory):
+    """
+    The pool for `key` in this process, created by factory() on first
+    use. Keyed by pid as well, so a forked worker never reuses sockets
+    inherited from its parent.
+    """
+    key = (key, os.getpid())
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = factory()
+    return pool
+
+
+def close_pool(key):
+    pool = _pools.pop((key, os.getpid()), None)
+    if pool is not None:
+        pool.close()
+
+
+def pool_stats():
+    pid = os.getpid()
+    return [
+        pool.snapshot()
+        for (key, owner), pool in list(_pools.items())
+        if owner == pid
+    ]
@@ -0,0 +1,238 @@
+"""
+Read-replica routing.
+
+Aliases listed in settings.DATABASE_REPLICAS are read-only copies of
+"default". ReplicaRoutingMiddleware marks safe (GET/HEAD/OPTIONS)
+requests under REPLICA_READ_PATHS as replica-eligible; ReplicaRouter then
+sends their reads to a healthy replica and everything else to the
+primary. Reads go back to the primary:
+
+* for the rest of a request once it has written anything,
+* inside an atomic block on the primary,
+* for REPLICA_STICKY_SECONDS after a client's last write
+  (read-your-writes), and
+* when no replica is within REPLICA_MAX_LAG_SECONDS.
+
+Lag is measured from registry.ReplicaHeartbeat, which
+`manage.py replica_heartbeat` keeps rewriting on the primary, so the
+check works the same for MySQL replication and for two SQLite files.
+With DATABASE_REPLICAS empty everything stays on "default".
+"""
+import contextvars
+import hashlib
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+STICKY_CACHE_PREFIX = "db:sticky:"
+
+
+@dataclass
+class RoutingState:
+    use_replica: bool = False
+    wrote: bool = False
+    alias: str = None  # replica picked for this request
+
+
+_state = contextvars.ContextVar("db_routing_state", default=None)
+
+
+def replica_aliases():
+    return list(getattr(settings, "DATABASE_REPLICAS", ()))
+
+
+# =====================================================
+# HEALTH
+# =====================================================
+
+_health = {}  # alias -> (checked_at, healthy)
+_health_lock = threading.Lock()
+
+
+def replica_lag(alias):
+    """
+    Seconds since the heartbeat visible on `alias` was written,
+    or None if the replica has no heartbeat yet.
+    """
+    from registry.models import ReplicaHeartbeat
+
+    beat_at = (
+        ReplicaHeartbeat.objects
+        .using(alias)
+        .filter(pk=1)
+        .values_list("beat_at", flat=True)
+        .first()
+    )
+    if beat_at is None:
+        return None
+    return max((timezone.now() - beat_at).total_seconds(), 0.0)
+
+
+def check_replica(alias):
+    """
+    Measure a replica now. Returns (healthy, lag); lag is None when the
+    replica is unreachable or has never seen a heartbeat.
+    """
+    try:
+        lag = replica_lag(alias)
+    except DatabaseError:
+        logger.warning("Replica %s is unreachable", alias, exc_info=True)
+        return False, None
+
+    return lag is not None and lag <= settings.REPLICA_MAX_LAG_SECONDS, lag
+
+
+def is_replica_healthy(alias):
+    """
+    check_replica() cached per process for REPLICA_HEALTH_CHECK_INTERVAL,
+    so routing does not add a query to every request.
+    """
+    now = time.monotonic()
+    cached = _health.get(alias)
+    if cached and now - cached[0] < settings.REPLICA_HEALTH_CHECK_INTERVAL:
+        return cached[1]
+
+    with _health_lock:
+        cached = _health.get(alias)
+        if cached and now - cached[0] < settings.REPLICA_HEALTH_CHECK_INTERVAL:
+            return cached[1]
+
+        healthy, lag = check_replica(alias)
+        if not healthy and (cached is None or cached[1]):
+            logger.warning(
+                "Replica %s taken out of rotation (lag: %s)", alias, lag
+            )
+        _health[alias] = (time.monotonic(), healthy)
+
+    return healthy
+
+
+def choose_replica():
+    healthy = [alias for alias in replica_aliases() if is_replica_healthy(alias)]
+    return random.choice(healthy) if healthy else None
+
+
+# =====================================================
+# ROUTER
+# =====================================================
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.use_replica or state.wrote:
+            return DEFAULT_DB_ALIAS
+
+        # Reads inside a transaction must see its uncommitted writes
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+
+        if state.alias is None:
+            state.alias = choose_replica() or DEFAULT_DB_ALIAS
+        return state.alias
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema through replication
+        if db in replica_aliases():
+            return False
+        return None
+
+
+# =====================================================
+# MIDDLEWARE
+# =====================================================
+
+def _sticky_key(request):
+    """
+    Identify the client across requests: its bearer token, else its
+    session cookie, else its address.
+    """
+    ident = (
+        request.META.get("HTTP_AUTHORIZATION")
+        or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        or request.META.get("REMOTE_ADDR", "")
+    )
+    return STICKY_CACHE_PREFIX + hashlib.sha256(ident.encode()).hexdigest()
+
+
+def _replica_eligible(request):
+    return (
+        bool(replica_aliases())
+        and request.method in SAFE_METHODS
+        and request.path.startswith(tuple(settings.REPLICA_READ_PATHS))
+    )
+
+
+def _wrote(request, state):
+    return state.wrote or request.method not in SAFE_METHODS
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Scope routing to one request and remember which clients just wrote.
+    The sticky flag lives in the cache, so it is shared across workers
+    when CACHES points at a shared backend.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        key = _sticky_key(request)
+        state = RoutingState(
+            use_replica=_replica_eligible(request) and not cache.get(key)
+        )
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        if _wrote(request, state) and replica_aliases():
+            cache.set(key, True, settings.REPLICA_STICKY_SECONDS)
+        return response
+
+    async def __acall__(self, request):
+        key = _sticky_key(request)
+        state = RoutingState(
+            use_replica=_replica_eligible(request) and not await cache.aget(key)
+        )
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        if _wrote(request, state) and replica_aliases():
+            await cache.aset(key, True, settings.REPLICA_STICKY_SECONDS)
+        return response
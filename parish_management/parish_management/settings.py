@@ -49,6 +49,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
      "corsheaders.middleware.CorsMiddleware",
     'django.middleware.security.SecurityMiddleware',
+    'parish_management.db_routing.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -99,9 +100,37 @@ REST_FRAMEWORK = {
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
-    )
+    ),
+    # Reverse proxies in front of the app. Client IPs (per-IP throttles)
+    # are read from X-Forwarded-For only this many hops deep; with 0 the
+    # header is ignored and REMOTE_ADDR is used, so clients cannot pick
+    # their own IP. Set it to the real count when behind a proxy.
+    'NUM_PROXIES': 0,
+}
+
+# Sliding-window limits for the auth endpoints (accounts.throttling):
+# per client IP, per submitted email and per church, as "N/period".
+# Point AUTH_THROTTLE_CACHE at a RedisCache alias to share the counters
+# between workers; the default LocMemCache counts per process.
+AUTH_THROTTLE_ENABLED = True
+AUTH_THROTTLE_CACHE = "default"
+AUTH_THROTTLE_RATES = {
+    "login": {"ip": "30/min", "email": "10/15min", "church": "300/hour"},
+    "forgot_password": {"ip": "10/hour", "email": "3/hour", "church": "50/hour"},
+    "reset_password": {"ip": "20/hour", "email": "5/15min", "church": "100/hour"},
 }
 
+# Password reset codes (accounts.otp): "db" keeps PasswordResetOTP rows,
+# purged by `manage.py purge_expired_otps`; "cache" keeps them only in
+# PASSWORD_RESET_OTP_CACHE with native expiry.
+PASSWORD_RESET_OTP_STORE = "db"
+PASSWORD_RESET_OTP_CACHE = "default"
+PASSWORD_RESET_OTP_TTL_MINUTES = 10
+
+# Family head logins (accounts.provisioning): worker processes used to
+# hash invitation passwords; None means one per CPU.
+PROVISIONING_HASH_WORKERS = None
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
@@ -112,29 +141,77 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
     "AUTH_TOKEN_CLASSES": ("rest_framework_simplejwt.tokens.AccessToken",),
     "TOKEN_BLACKLIST_ENABLED": True,
+    "TOKEN_REFRESH_SERIALIZER": "accounts.tokens.IndexedTokenRefreshSerializer",
 }
 
+# Refresh-token revocation filter (accounts.tokens). A shared cache makes
+# a logout visible to every worker at once; otherwise within SYNC seconds.
+JWT_REVOCATION_CACHE = "default"
+JWT_REVOCATION_SYNC_SECONDS = 5
+JWT_REVOCATION_REBUILD_SECONDS = 15 * 60
+JWT_REVOCATION_BLOOM_CAPACITY = 10_000
+
 
 WSGI_APPLICATION = 'parish_management.wsgi.application'
 
+# Serve the mobile directory/profile endpoints with the async views in
+# registry.async_views. Turn on for ASGI deployments (asgi.py); under
+# WSGI each async view would be run through a throwaway event loop.
+ASYNC_MOBILE_VIEWS = False
+
+# Member profile projection (registry.profiles). Signals invalidate it in
+# the worker that made the write; with the default LocMemCache other
+# workers serve the old profile for up to the timeout, so keep it short
+# unless MEMBER_PROFILE_CACHE points at a shared (Redis) cache.
+MEMBER_PROFILE_CACHE = "default"
+MEMBER_PROFILE_CACHE_TIMEOUT = 60
+
+# Parish statistics (registry.statistics), cached per church and day.
+# As with profiles, a change made through another worker only shows
+# after the timeout unless PARISH_STATS_CACHE is shared between workers.
+PARISH_STATS_CACHE = "default"
+PARISH_STATS_CACHE_TIMEOUT = 5 * 60
+
 
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
 DATABASES = {
     'default': {
-        'ENGINE': "mysql.connector.django",
+        # mysql.connector.django plus a per-process connection pool
+        'ENGINE': "parish_management.db.mysql",
         'NAME':'aglise',
         "USER": "root",
         "PASSWORD": "navi@123",
         "HOST": "127.0.0.1",
         "PORT": "3306",
+        "CONN_MAX_AGE": 0,  # the pool keeps connections open
         "OPTIONS": {
             "init_command": "SET sql_mode='STRICT_TRANS_TABLES'",
+            # Per worker process; keep workers * max_size under
+            # MySQL's max_connections. See parish_management.db.pool.
+            "pool": {
+                "max_size": 10,
+                "timeout": 5,
+            },
         },
-    }
+    },
+    # Read replicas are extra entries with the same settings and their
+    # own HOST, listed in DATABASE_REPLICAS, e.g.
+    # 'replica1': {..., "HOST": "10.0.0.12", "TEST": {"MIRROR": "default"}},
 }
 
+# Read replica routing (parish_management.db_routing)
+DATABASE_ROUTERS = ["parish_management.db_routing.ReplicaRouter"]
+DATABASE_REPLICAS = []
+# Safe requests under these paths may read from a replica
+REPLICA_READ_PATHS = ("/api/",)
+# Reads stay on the primary this long after a client writes
+REPLICA_STICKY_SECONDS = 5
+# Replicas further behind than this are skipped
+REPLICA_MAX_LAG_SECONDS = 10
+REPLICA_HEALTH_CHECK_INTERVAL = 5
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -175,12 +252,38 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / "media"
 
+# UPLOADS
+# Files above FILE_UPLOAD_MAX_MEMORY_SIZE are streamed to a temp
+# file on disk in chunks instead of being held in memory.
+FILE_UPLOAD_MAX_MEMORY_SIZE = 1024 * 1024
+FILE_UPLOAD_HANDLERS = [
+    "registry.uploads.MaxSizeUploadHandler",
+    "django.core.files.uploadhandler.MemoryFileUploadHandler",
+    "django.core.files.uploadhandler.TemporaryFileUploadHandler",
+]
+
+IMAGE_UPLOAD_MAX_SIZE = 10 * 1024 * 1024
+IMAGE_UPLOAD_MAX_PIXELS = 50_000_000
+# Stored originals are downscaled to fit this box (longest side, px)
+IMAGE_MAX_DIMENSION = 2048
+
+# Tenant snapshots written before a church is purged (not web-served)
+TENANT_ARCHIVE_ROOT = BASE_DIR / "archives"
+# Soft-deleted churches older than this move to ChurchArchive
+TENANT_ARCHIVE_AFTER_DAYS = 90
+
 
 # settings.py
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = "accounts.User"
 
+# API login is by email (accounts.backends); the admin panel by username
+AUTHENTICATION_BACKENDS = [
+    "accounts.backends.EmailBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+
 # EMAIL CONFIGURATION
 
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
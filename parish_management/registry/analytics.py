@@ -0,0 +1,289 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, Count, DateField, Min, Q, Sum, Value, When
+from django.utils import timezone
+
+from .models import (
+    Bill,
+    ChurchSubscription,
+    RevenueDailyRollup,
+    RevenuePackageRollup,
+)
+from .services import get_subscription_mrr
+
+ZERO = Decimal("0.00")
+RENEWAL_TYPES = ("RENEW", "EXTENSION")
+
+# Days per GROUP BY when rolling up; bounds the CASE of local_period()
+ROLLUP_WINDOW_DAYS = 31
+
+
+def _local_midnight(day):
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
+def _day_bounds(start, end):
+    """Aware [start 00:00, end+1 00:00) so range filters stay on indexes."""
+    return _local_midnight(start), _local_midnight(end + timedelta(days=1))
+
+
+def local_period(field, starts):
+    """
+    Case() giving, for the datetime `field`, the local day or month it
+    falls in: the last of `starts` (dates, ascending) whose local
+    midnight is not after it. Rows before starts[0] must be filtered
+    out by the caller.
+
+    Used instead of TruncDate / TruncMonth, which convert time zones in
+    the database: MySQL's CONVERT_TZ() returns NULL unless the server's
+    time-zone tables are loaded, putting every row in one None group.
+    Here the boundaries are computed in Python and the database only
+    compares datetimes (still on the range index).
+    """
+    whens = [
+        When(**{f"{field}__lt": _local_midnight(following)}, then=Value(start))
+        for start, following in zip(starts, starts[1:])
+    ]
+    return Case(*whens, default=Value(starts[-1]), output_field=DateField())
+
+
+def _days(start, end):
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+
+def _windows(start, end):
+    """start..end as spans of at most ROLLUP_WINDOW_DAYS days."""
+    while start <= end:
+        last = min(start + timedelta(days=ROLLUP_WINDOW_DAYS - 1), end)
+        yield start, last
+        start = last + timedelta(days=1)
+
+
+def _load_subscriptions(start, end):
+    """
+    Paid, non-trial subscriptions whose [start_date, end_date)
+    overlaps the window, with their MRR precomputed.
+
+    History is rebuilt from the current subscription terms:
+    the subscription table keeps no versions.
+    """
+    subscriptions = (
+        ChurchSubscription.objects
+        .filter(
+            payment_status="PAID",
+            package__is_trial=False,
+            start_date__lte=end,
+            end_date__gte=start,
+        )
+        .select_related("package")
+    )
+    return [
+        (s.package_id, s.start_date, s.end_date, get_subscription_mrr(s))
+        for s in subscriptions
+    ]
+
+
+def _load_paid_bills(start, end):
+    """
+    day -> package_id -> bill_type -> (amount, count)
+    One GROUP BY per ROLLUP_WINDOW_DAYS window.
+    """
+    paid = defaultdict(lambda: defaultdict(dict))
+
+    for first, last in _windows(start, end):
+        lower, upper = _day_bounds(first, last)
+        rows = (
+            Bill.objects
+            .filter(status="PAID", paid_at__gte=lower, paid_at__lt=upper)
+            .annotate(day=local_period("paid_at", list(_days(first, last))))
+            .values("day", "subscription__package_id", "bill_type")
+            .annotate(total=Sum("amount"), n=Count("id"))
+        )
+
+        for row in rows:
+            paid[row["day"]][row["subscription__package_id"]][row["bill_type"]] = (
+                row["total"] or ZERO,
+                row["n"],
+            )
+    return paid
+
+
+def _load_billed(start, end):
+    billed = {}
+
+    for first, last in _windows(start, end):
+        lower, upper = _day_bounds(first, last)
+        rows = (
+            Bill.objects
+            .filter(created_at__gte=lower, created_at__lt=upper)
+            .exclude(status="CANCELLED")
+            .annotate(day=local_period("created_at", list(_days(first, last))))
+            .values("day")
+            .annotate(total=Sum("amount"))
+        )
+        billed.update((row["day"], row["total"] or ZERO) for row in rows)
+    return billed
+
+
+def rollup_revenue(start, end):
+    """
+    (Re)write daily and per-package rollup rows for start..end
+    inclusive. Existing rows in the range are replaced, so this
+    is both the incremental step and the history rebuild.
+
+    Per day:
+    - mrr / active_subscriptions: paid subscriptions with
+      start_date <= day < end_date
+    - churned_*: paid subscriptions whose end_date is that day
+    - paid / new / upgrade / renewal revenue: bills by paid_at
+    - billed_amount: non-cancelled bills by created_at
+    """
+    if start > end:
+        return 0
+
+    subscriptions = _load_subscriptions(start, end)
+    paid = _load_paid_bills(start, end)
+    billed = _load_billed(start, end)
+
+    daily_rows = []
+    package_rows = []
+
+    for day in _days(start, end):
+        per_package = defaultdict(lambda: {
+            "mrr": ZERO,
+            "active_subscriptions": 0,
+            "paid_amount": ZERO,
+            "upgrade_revenue": ZERO,
+        })
+
+        daily = RevenueDailyRollup(date=day, billed_amount=billed.get(day, ZERO))
+
+        for package_id, sub_start, sub_end, mrr in subscriptions:
+            if sub_start <= day < sub_end:
+                daily.mrr += mrr
+                daily.active_subscriptions += 1
+                per_package[package_id]["mrr"] += mrr
+                per_package[package_id]["active_subscriptions"] += 1
+            elif sub_end == day:
+                daily.churned_subscriptions += 1
+                daily.churned_mrr += mrr
+
+        for package_id, by_type in paid.get(day, {}).items():
+            for bill_type, (amount, count) in by_type.items():
+                daily.paid_amount += amount
+                per_package[package_id]["paid_amount"] += amount
+
+                if bill_type == "NEW":
+                    daily.new_revenue += amount
+                    daily.new_subscriptions += count
+                elif bill_type == "UPGRADE":
+                    daily.upgrade_revenue += amount
+                    per_package[package_id]["upgrade_revenue"] += amount
+                elif bill_type in RENEWAL_TYPES:
+                    daily.renewal_revenue += amount
+
+        daily_rows.append(daily)
+        package_rows.extend(
+            RevenuePackageRollup(date=day, package_id=package_id, **values)
+            for package_id, values in per_package.items()
+        )
+
+    with transaction.atomic():
+        RevenueDailyRollup.objects.filter(date__range=(start, end)).delete()
+        RevenuePackageRollup.objects.filter(date__range=(start, end)).delete()
+        RevenueDailyRollup.objects.bulk_create(daily_rows, batch_size=500)
+        RevenuePackageRollup.objects.bulk_create(package_rows, batch_size=500)
+
+    return len(daily_rows)
+
+
+def _first_activity_date():
+    first = Bill.objects.aggregate(first=Min("created_at"))["first"]
+    if first is None:
+        return None
+    return timezone.localtime(first).date()
+
+
+def run_revenue_rollup(today=None):
+    """
+    Incremental daily job. The watermark is the latest rolled-up
+    day; that day is recomputed (it may have been partial) along
+    with every day since, up to today.
+    """
+    today = today or timezone.localdate()
+
+    watermark = (
+        RevenueDailyRollup.objects
+        .order_by("-date")
+        .values_list("date", flat=True)
+        .first()
+    )
+
+    start = watermark or _first_activity_date()
+    if start is None:
+        return 0
+
+    return rollup_revenue(start, today)
+
+
+def revenue_summary(start, end):
+    """
+    Read side for the admin analytics page; touches rollup rows only.
+    """
+    rows = RevenueDailyRollup.objects.filter(date__range=(start, end))
+
+    totals = rows.aggregate(
+        paid=Sum("paid_amount", default=ZERO),
+        billed=Sum("billed_amount", default=ZERO),
+        new_revenue=Sum("new_revenue", default=ZERO),
+        upgrade_revenue=Sum("upgrade_revenue", default=ZERO),
+        renewal_revenue=Sum("renewal_revenue", default=ZERO),
+        new_subscriptions=Sum("new_subscriptions", default=0),
+        churned_subscriptions=Sum("churned_subscriptions", default=0),
+        churned_mrr=Sum("churned_mrr", default=ZERO),
+    )
+
+    latest = rows.order_by("-date").first()
+    opening = rows.order_by("date").first()
+
+    mrr = latest.mrr if latest else ZERO
+    opening_subs = opening.active_subscriptions if opening else 0
+
+    packages = (
+        RevenuePackageRollup.objects
+        .filter(date=latest.date if latest else None)
+        .select_related("package")
+        .order_by("-mrr")
+    )
+    package_revenue = (
+        RevenuePackageRollup.objects
+        .filter(date__range=(start, end))
+        .values("package__name")
+        .annotate(
+            paid=Sum("paid_amount"),
+            upgrade=Sum("upgrade_revenue"),
+        )
+        .filter(Q(paid__gt=0) | Q(upgrade__gt=0))
+        .order_by("-paid")
+    )
+
+    return {
+        "as_of": latest.date if latest else None,
+        "mrr": mrr,
+        "arr": mrr * 12,
+        "active_subscriptions": latest.active_subscriptions if latest else 0,
+        "churn_rate": (
+            round(totals["churned_subscriptions"] * 100 / opening_subs, 1)
+            if opening_subs else None
+        ),
+        "totals": totals,
+        "daily": rows.order_by("-date"),
+        "packages": packages,
+        "package_revenue": package_revenue,
+    }
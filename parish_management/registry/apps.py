@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class RegistryConfig(AppConfig):
     name = 'registry'
+
+    def ready(self):
+        from registry import signals  # noqa: F401
@@ -0,0 +1,130 @@
+"""
+Async variants of the mobile directory and profile endpoints.
+
+Under ASGI these run on the event loop, so one worker can keep many slow
+mobile clients open while it waits on the database. DRF itself is
+synchronous: AsyncAPIView runs authentication, permissions and
+throttling (JWT user lookup included) through sync_to_async, then
+awaits the handler. Handlers load everything they serialize with the
+async ORM; any lazy relation left would raise SynchronousOnlyOperation.
+
+Routed instead of the sync views when settings.ASYNC_MOBILE_VIEWS is on.
+"""
+from inspect import isawaitable
+
+from asgiref.sync import sync_to_async
+from django.shortcuts import aget_object_or_404
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.permissions import IsMemberUser
+from .models import Ward
+from .serializers import (
+    MobileFamilyDetailSerializer,
+    WardWithFamilyCountSerializer,
+)
+from .profiles import get_member_profile
+from .views import (
+    mobile_families_payload,
+    mobile_family_detail_queryset,
+    mobile_family_list_queryset,
+    mobile_ward_queryset,
+    wants_household,
+)
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView with `async def` handlers.
+    """
+    # User relations the handlers read, loaded during authentication
+    user_related = ("church",)
+
+    def _initial(self, request, *args, **kwargs):
+        self.initial(request, *args, **kwargs)
+        for name in self.user_related:
+            getattr(request.user, name, None)
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self._initial)(request, *args, **kwargs)
+
+            handler = self.http_method_not_allowed
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self,
+                    request.method.lower(),
+                    self.http_method_not_allowed
+                )
+
+            response = handler(request, *args, **kwargs)
+            if isawaitable(response):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+#mobile directory apis
+class AsyncWardListWithFamilyCountAPIView(AsyncAPIView):
+    permission_classes = [IsAuthenticated]
+
+    async def get(self, request):
+        wards = [ward async for ward in mobile_ward_queryset(request.user)]
+
+        serializer = WardWithFamilyCountSerializer(wards, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class AsyncWardFamiliesMobileAPIView(AsyncAPIView):
+    permission_classes = [IsAuthenticated]
+
+    async def get(self, request, ward_id):
+        # Ensure ward belongs to church
+        await aget_object_or_404(
+            Ward.objects.for_user(request.user),
+            id=ward_id
+        )
+
+        families = [
+            family async for family in
+            mobile_family_list_queryset(request.user, ward_id)
+        ]
+
+        return Response(mobile_families_payload(families, request))
+
+
+class AsyncFamilyDetailMobileAPIView(AsyncAPIView):
+    permission_classes = [IsAuthenticated]
+
+    async def get(self, request, family_id):
+        family = await aget_object_or_404(
+            mobile_family_detail_queryset(request.user),
+            id=family_id
+        )
+
+        serializer = MobileFamilyDetailSerializer(family)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+#member
+class AsyncMemberProfileAPIView(AsyncAPIView):
+    permission_classes = [IsAuthenticated, IsMemberUser]
+    user_related = ()
+
+    async def get(self, request):
+        return Response(await sync_to_async(get_member_profile)(
+            request.user.member_id,
+            household=wants_household(request)
+        ))
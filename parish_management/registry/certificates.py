@@ -0,0 +1,264 @@
+import hashlib
+import os
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from textwrap import wrap
+
+from django.conf import settings
+from django.template.loader import select_template
+from django.utils.text import get_valid_filename
+from PIL import Image, ImageDraw, ImageFont
+
+
+# A4 @ 150 dpi
+PAGE_SIZE = (1240, 1754)
+MARGIN = 110
+LOGO_BOX = (220, 220)
+WRAP_WIDTH = 60
+
+CERTIFICATE_CACHE_DIR = Path(settings.MEDIA_ROOT) / "certificates" / "baptism"
+CERTIFICATE_WORKERS = 4
+
+
+# =====================================================
+# CERTIFICATE DATA
+# =====================================================
+
+def build_baptism_certificate_data(baptism):
+    data = {
+        "certificate_type": (
+            "PARISH" if baptism.baptism_category == "PARISH" else "OTHER"
+        ),
+
+        # -------------------------
+        # CHURCH INFO
+        # -------------------------
+        "church": {
+            "name": baptism.church.name,
+            "address": baptism.church.address,
+        },
+
+        # -------------------------
+        # BAPTISM DETAILS
+        # -------------------------
+        "register_number": baptism.register_number,
+        "date_of_baptism": baptism.date_of_baptism,
+        "parish_of_baptism": baptism.parish_of_baptism,
+
+        # -------------------------
+        # PERSON DETAILS
+        # -------------------------
+        "name": baptism.name,
+        "baptismal_name": baptism.baptismal_name,
+        "gender": baptism.gender,
+        "date_of_birth": baptism.dob,
+        "place_of_birth": baptism.place_of_birth,
+        "address": baptism.address,
+
+        # -------------------------
+        # PARENTS
+        # -------------------------
+        "father_name": baptism.father_name,
+        "mother_name": baptism.mother_name,
+
+        # -------------------------
+        # GODPARENTS
+        # -------------------------
+        "god_father": baptism.god_father,
+        "god_mother": baptism.god_mother,
+
+        # -------------------------
+        # PARISH MEMBER DETAILS
+        # -------------------------
+        "parish_member_details": None,
+    }
+
+    if baptism.baptism_category == "PARISH":
+        data["parish_member_details"] = {
+            "family_name": baptism.family.family_name,
+            "house_name": baptism.family.house_name,
+            "main_member_name": (
+                baptism.main_member.name if baptism.main_member else None
+            ),
+            "relationship": (
+                baptism.relation_with_main_member.name
+                if baptism.relation_with_main_member
+                else None
+            ),
+            "member_id": baptism.member_id,
+        }
+
+    return data
+
+
+def certificate_queryset(queryset):
+    return queryset.select_related(
+        "church",
+        "family",
+        "main_member",
+        "relation_with_main_member",
+    )
+
+
+# =====================================================
+# TEMPLATE (PER CHURCH)
+# =====================================================
+
+def render_certificate_text(baptism):
+    """
+    Certificate body from
+    registry/certificates/baptism_<church_id>.txt if the church has
+    its own template, else registry/certificates/baptism.txt.
+    """
+    template = select_template([
+        f"registry/certificates/baptism_{baptism.church_id}.txt",
+        "registry/certificates/baptism.txt",
+    ])
+
+    return template.render(build_baptism_certificate_data(baptism))
+
+
+# =====================================================
+# PDF RENDERING
+# =====================================================
+
+def _draw_logo(page, logo_path):
+    try:
+        with Image.open(logo_path) as logo:
+            logo = logo.convert("RGBA")
+            logo.thumbnail(LOGO_BOX)
+            x = (PAGE_SIZE[0] - logo.width) // 2
+            page.paste(logo, (x, MARGIN), logo)
+            return MARGIN + logo.height + 40
+    except OSError:
+        # Missing or unreadable logo: render without it
+        return MARGIN
+
+
+def render_certificate_pdf(text, logo_path=None):
+    page = Image.new("RGB", PAGE_SIZE, "white")
+    draw = ImageDraw.Draw(page)
+
+    fonts = {
+        "# ": ImageFont.load_default(size=48),
+        "## ": ImageFont.load_default(size=38),
+        "": ImageFont.load_default(size=26),
+    }
+
+    y = _draw_logo(page, logo_path) if logo_path else MARGIN
+
+    for raw_line in text.splitlines():
+        line = raw_line.rstrip()
+
+        if not line:
+            y += 22
+            continue
+
+        prefix = next(p for p in ("## ", "# ", "") if line.startswith(p))
+        font = fonts[prefix]
+        line = line[len(prefix):]
+
+        for part in wrap(line, WRAP_WIDTH) or [""]:
+            if prefix:
+                width = draw.textlength(part, font=font)
+                x = (PAGE_SIZE[0] - width) / 2
+            else:
+                x = MARGIN
+            draw.text((x, y), part, fill="black", font=font)
+            y += font.size + 14
+
+    out = tempfile.SpooledTemporaryFile()
+    page.save(out, "PDF", resolution=150)
+    out.seek(0)
+    return out.read()
+
+
+# =====================================================
+# RENDER CACHE
+# =====================================================
+
+def _logo_path(church):
+    if church.logo and church.logo.name:
+        return church.logo.path
+    return None
+
+
+def _cache_key(baptism, text):
+    digest = hashlib.sha256()
+    digest.update(text.encode())
+    digest.update((baptism.church.logo.name or "").encode())
+    return digest.hexdigest()[:16]
+
+
+def _cache_path(baptism_id, content_hash):
+    return CERTIFICATE_CACHE_DIR / f"{baptism_id}-{content_hash}.pdf"
+
+
+def invalidate_certificate_cache(baptism_id):
+    for path in CERTIFICATE_CACHE_DIR.glob(f"{baptism_id}-*.pdf"):
+        path.unlink(missing_ok=True)
+
+
+def _render_job(job):
+    """
+    Runs in a worker thread: no DB access, only
+    rendering and file IO.
+    """
+    baptism_id, content_hash, text, logo_path = job
+    path = _cache_path(baptism_id, content_hash)
+
+    if not path.exists():
+        pdf = render_certificate_pdf(text, logo_path)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(pdf)
+        os.replace(tmp, path)
+
+    return path
+
+
+def _prepare_job(baptism):
+    text = render_certificate_text(baptism)
+    return (
+        baptism.id,
+        _cache_key(baptism, text),
+        text,
+        _logo_path(baptism.church),
+    )
+
+
+def get_certificate_pdf(baptism):
+    """
+    Path of the cached PDF, rendering it on a miss.
+    Cache key: baptism id + hash of the rendered content,
+    so any change to the record, church or template misses.
+    """
+    return _render_job(_prepare_job(baptism))
+
+
+def build_certificate_zip(baptisms, fileobj):
+    """
+    Render many certificates through a thread pool and write
+    them into a single zip. Baptisms must be fully loaded
+    (see certificate_queryset) before calling.
+    """
+    baptisms = list(baptisms)
+    jobs = [_prepare_job(b) for b in baptisms]
+
+    with ThreadPoolExecutor(max_workers=CERTIFICATE_WORKERS) as pool:
+        paths = list(pool.map(_render_job, jobs))
+
+    with zipfile.ZipFile(fileobj, "w", zipfile.ZIP_STORED) as archive:
+        for baptism, path in zip(baptisms, paths):
+            archive.write(
+                path,
+                arcname=get_valid_filename(
+                    f"baptism-{baptism.register_number}.pdf"
+                )
+            )
+
+    return fileobj
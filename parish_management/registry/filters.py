@@ -0,0 +1,124 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import models
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+GENDERS = ("MALE", "FEMALE")
+BAPTISM_CATEGORIES = ("PARISH", "OTHER")
+
+
+def _parse_date_param(params, key):
+    value = params.get(key)
+    if not value:
+        return None
+
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+
+    if parsed is None:
+        raise ValidationError({key: "Invalid date. Use YYYY-MM-DD."})
+    return parsed
+
+
+def filter_baptisms(queryset, params):
+    """
+    Apply register filters from query params.
+
+    ?category=PARISH | OTHER
+    ?date_from=YYYY-MM-DD&date_to=YYYY-MM-DD  (date_of_baptism range)
+    ?gender=MALE | FEMALE
+    ?register_number=<prefix>
+    ?name=<prefix>
+
+    Every filter is a prefix/range match so it stays on the
+    (church, ...) composite indexes of Baptism.
+    """
+    category = params.get("category")
+    if category:
+        category = category.upper()
+        if category not in BAPTISM_CATEGORIES:
+            raise ValidationError(
+                {"detail": "Invalid category. Use PARISH or OTHER."}
+            )
+        queryset = queryset.filter(baptism_category=category)
+
+    date_from = _parse_date_param(params, "date_from")
+    date_to = _parse_date_param(params, "date_to")
+
+    if date_from and date_to and date_from > date_to:
+        raise ValidationError(
+            {"date_from": "date_from must be on or before date_to."}
+        )
+
+    if date_from:
+        queryset = queryset.filter(date_of_baptism__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(date_of_baptism__lte=date_to)
+
+    gender = params.get("gender")
+    if gender:
+        gender = gender.upper()
+        if gender not in GENDERS:
+            raise ValidationError(
+                {"gender": "Invalid gender. Use MALE or FEMALE."}
+            )
+        queryset = queryset.filter(gender=gender)
+
+    register_number = (params.get("register_number") or "").strip()
+    if register_number:
+        queryset = queryset.filter(register_number__startswith=register_number)
+
+    name = (params.get("name") or "").strip()
+    if name:
+        queryset = queryset.filter(name__istartswith=name)
+
+    return queryset
+
+
+TRUE_VALUES = ("1", "true", "t", "yes")
+FALSE_VALUES = ("0", "false", "f", "no")
+
+
+def _clean_filter_value(field, value):
+    if isinstance(field, models.BooleanField):
+        value = value.lower()
+        if value in TRUE_VALUES:
+            return True
+        if value in FALSE_VALUES:
+            return False
+        raise DjangoValidationError("Use true or false.")
+
+    if field.is_relation:
+        return field.target_field.to_python(value)
+
+    value = field.to_python(value)
+    if field.choices and value not in dict(field.flatchoices):
+        raise DjangoValidationError("Not a valid choice.")
+    return value
+
+
+class ExactFieldFilterBackend(BaseFilterBackend):
+    """
+    ?<field>=<value> equality filters for the names in a view's
+    `filter_fields`. Fields are resolved once per view class
+    (view.filter_field_map); values are validated against the model
+    field, so bad input is a 400 rather than an empty list or a 500.
+    """
+    def filter_queryset(self, request, queryset, view):
+        lookups = {}
+
+        for name, field in getattr(view, "filter_field_map", {}).items():
+            value = request.query_params.get(name)
+            if value in (None, ""):
+                continue
+
+            try:
+                lookups[field.attname] = _clean_filter_value(field, value)
+            except DjangoValidationError:
+                raise ValidationError({name: "Invalid value."})
+
+        return queryset.filter(**lookups) if lookups else queryset
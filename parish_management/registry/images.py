@@ -0,0 +1,246 @@
+import io
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+
+# variant -> (longest side in px, Pillow format, extension)
+DERIVATIVES = {
+    "thumb": (160, "JPEG", "jpg"),
+    "medium": (640, "JPEG", "jpg"),
+    "webp": (640, "WEBP", "webp"),
+}
+
+# (model, image field, manifest field): rows whose derivatives are
+# recorded, see record_derivatives()
+IMAGE_FIELDS = (
+    ("registry.Family", "family_image", "family_image_variants"),
+    ("registry.Church", "logo", "logo_variants"),
+)
+
+# Small pool shared by all uploads in this process
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="image-uploads")
+
+
+def derivative_name(name, variant):
+    """
+    church_logos/st_marys.jpg -> church_logos/derivatives/st_marys.thumb.jpg
+                              -> church_logos/derivatives/st_marys.webp
+    """
+    folder, filename = posixpath.split(name)
+    stem = posixpath.splitext(filename)[0]
+    ext = DERIVATIVES[variant][2]
+    suffix = ext if variant == ext else f"{variant}.{ext}"
+    return posixpath.join(folder, "derivatives", f"{stem}.{suffix}")
+
+
+def _encode(image, size, fmt):
+    image = image.copy()
+    image.thumbnail((size, size), Image.Resampling.LANCZOS)
+
+    if fmt == "JPEG" and image.mode != "RGB":
+        background = Image.new("RGB", image.size, "white")
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            background.paste(image, mask=image.getchannel("A"))
+        else:
+            background.paste(image.convert("RGB"))
+        image = background
+
+    out = io.BytesIO()
+    if fmt == "JPEG":
+        image.save(out, fmt, quality=82, optimize=True, progressive=True)
+    else:
+        image.save(out, fmt, quality=80, method=4)
+    return out.getvalue()
+
+
+def record_derivatives(name, variants):
+    """
+    Store {"name": name, "variants": [...]} on every row showing the
+    image `name`. queryset.update() sends no post_save, so this does
+    not schedule the image again.
+    """
+    manifest = {"name": name, "variants": sorted(variants)}
+    for label, field, manifest_field in IMAGE_FIELDS:
+        apps.get_model(label)._base_manager.filter(**{field: name}).update(
+            **{manifest_field: manifest}
+        )
+
+
+def generate_derivatives(name, *, force=False):
+    """
+    Write every missing derivative of the stored image `name` and
+    record them on its rows. Returns the number of files written.
+    """
+    targets = {
+        variant: derivative_name(name, variant)
+        for variant in DERIVATIVES
+    }
+    if not force:
+        targets = {
+            variant: target
+            for variant, target in targets.items()
+            if not default_storage.exists(target)
+        }
+    if not targets:
+        record_derivatives(name, DERIVATIVES)
+        return 0
+
+    with default_storage.open(name, "rb") as fh:
+        with Image.open(fh) as source:
+            source = ImageOps.exif_transpose(source)
+            source.load()
+
+    for variant, target in targets.items():
+        size, fmt, _ = DERIVATIVES[variant]
+        data = _encode(source, size, fmt)
+
+        if default_storage.exists(target):
+            default_storage.delete(target)
+        default_storage.save(target, ContentFile(data))
+
+    record_derivatives(name, DERIVATIVES)
+    return len(targets)
+
+
+def _rename_image(old, new):
+    """
+    Point every row showing the image `old` at `new`. Like
+    record_derivatives(), sends no post_save. Returns rows updated.
+    """
+    updated = 0
+    for label, field, _ in IMAGE_FIELDS:
+        updated += apps.get_model(label)._base_manager.filter(
+            **{field: old}
+        ).update(**{field: new})
+    return updated
+
+
+def _delete_derivatives(name):
+    for variant in DERIVATIVES:
+        target = derivative_name(name, variant)
+        if default_storage.exists(target):
+            default_storage.delete(target)
+
+
+def normalize_original(name):
+    """
+    Re-encode the stored upload: apply the EXIF orientation, drop
+    EXIF (GPS, camera data) and downscale to IMAGE_MAX_DIMENSION.
+    Already-clean images are left untouched, so running this twice
+    does not re-compress.
+
+    The re-encoded file is stored under a new name and the rows are
+    pointed at it before the original is deleted, so the image stays
+    reachable throughout and a failure leaves the original in place.
+    Returns the name the image is stored under afterwards, or None if
+    no row shows it any more.
+    """
+    max_side = settings.IMAGE_MAX_DIMENSION
+
+    with default_storage.open(name, "rb") as fh:
+        with Image.open(fh) as source:
+            fmt = source.format
+            has_exif = bool(source.getexif())
+            too_big = max(source.size) > max_side
+
+            if not (has_exif or too_big):
+                return name
+
+            image = ImageOps.exif_transpose(source)
+            image.load()
+
+    image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+
+    options = {}
+    if fmt == "JPEG":
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        options = {"quality": 88, "optimize": True, "progressive": True}
+    elif fmt == "WEBP":
+        options = {"quality": 88}
+
+    out = io.BytesIO()
+    # No exif= argument: metadata is not carried over
+    image.save(out, fmt, **options)
+
+    # `name` is taken, so storage picks a free name next to it (a
+    # storage that overwrites in place returns `name` itself)
+    saved = default_storage.save(name, ContentFile(out.getvalue()))
+    if saved == name:
+        # Derivatives of the old pixels are stale
+        _delete_derivatives(name)
+        return name
+
+    if not _rename_image(name, saved):
+        # Replaced or deleted meanwhile: the new copy is not needed
+        logger.info("Image %s is no longer in use; dropped %s", name, saved)
+        default_storage.delete(saved)
+        return None
+
+    default_storage.delete(name)
+    _delete_derivatives(name)
+    return saved
+
+
+def process_image_upload(name):
+    """
+    Upload pipeline: normalize the original, then build
+    derivatives from the normalized file.
+    """
+    stored = normalize_original(name)
+    if stored is not None:
+        generate_derivatives(stored)
+
+
+def _process_safely(name):
+    try:
+        process_image_upload(name)
+    except Exception:
+        logger.exception("Could not process image %s", name)
+
+
+def schedule_image_processing(name):
+    """
+    Run the upload pipeline off the request path, once the
+    upload transaction has committed.
+    """
+    if not name:
+        return
+    transaction.on_commit(lambda: _executor.submit(_process_safely, name))
+
+
+def image_srcset(field, variants, request=None):
+    """
+    {"original": url, "thumb": url, "medium": url, "webp": url}
+    `variants` is the row's manifest (record_derivatives); variants
+    not recorded for the current file are left out, so clients fall
+    back to the original. Storage is never queried.
+    """
+    if not field or not field.name:
+        return None
+
+    def absolute(url):
+        return request.build_absolute_uri(url) if request else url
+
+    srcset = {"original": absolute(field.url)}
+    if not variants or variants.get("name") != field.name:
+        # Not built yet, or built for an image since replaced
+        return srcset
+
+    for variant in variants.get("variants", ()):
+        if variant in DERIVATIVES:
+            srcset[variant] = absolute(
+                default_storage.url(derivative_name(field.name, variant))
+            )
+    return srcset
@@ -0,0 +1,300 @@
+from django.db import IntegrityError, transaction
+
+from .models import Baptism, Family, Member, Relationship, calculate_age, month_day
+from .profiles import bump_profile_version
+from .statistics import bump_stats_version
+from .serializers import BaptismImportRowSerializer
+
+
+IMPORT_CHUNK_SIZE = 500
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield start, items[start:start + size]
+
+
+def _member_from_baptism(baptism):
+    """
+    Same Member that BaptismAPIView.post creates for a PARISH entry,
+    built in memory for bulk_create (Member.save is not called,
+    so age and the calendar positions are computed here).
+    """
+    return Member(
+        church=baptism.church,
+        family_id=baptism.family_id,
+        name=baptism.name,
+        baptismal_name=baptism.baptismal_name,
+        gender=baptism.gender,
+        dob=baptism.dob,
+        age=calculate_age(baptism.dob),
+        birth_month_day=month_day(baptism.dob),
+        baptism_month_day=month_day(baptism.date_of_baptism),
+        address=baptism.address,
+        relationship_id=baptism.relation_with_main_member_id,
+        father_name=baptism.father_name,
+        mother_name=baptism.mother_name,
+        date_of_baptism=baptism.date_of_baptism,
+        parish_of_baptism=baptism.parish_of_baptism,
+        is_family_head=False,
+        is_active=True,
+    )
+
+
+def _member_key(member):
+    return (
+        member.family_id,
+        member.name,
+        member.dob,
+        member.date_of_baptism,
+    )
+
+
+def _resolve_member_ids(church, members, watermark):
+    """
+    Backends without RETURNING (MySQL) leave pk unset after
+    bulk_create. Read the new ids back in one query, matching on
+    (family, name, dob, date_of_baptism) above the pre-insert
+    max id. Keys are unique within a chunk (see _link_rows).
+
+    Raises IntegrityError if a member cannot be matched, so the
+    chunk rolls back instead of saving PARISH baptisms without one.
+    """
+    pending = {_member_key(m): m for m in members if m.pk is None}
+    if not pending:
+        return
+
+    rows = (
+        Member.objects
+        .filter(
+            church=church,
+            pk__gt=watermark,
+            family_id__in={key[0] for key in pending},
+        )
+        .values_list("pk", "family_id", "name", "dob", "date_of_baptism")
+    )
+
+    for pk, *key in rows:
+        member = pending.get(tuple(key))
+        if member is not None:
+            member.pk = pk
+
+    unresolved = sum(1 for member in pending.values() if member.pk is None)
+    if unresolved:
+        raise IntegrityError(
+            f"Could not read back the ids of {unresolved} imported member(s)."
+        )
+
+
+def _link_rows(church, rows, families, members, relations, errors):
+    """
+    Apply category rules and resolve FK ids against the
+    prefetched lookup maps. Returns unsaved Baptism objects.
+    """
+    baptisms = []
+    member_keys = set()
+
+    for index, data in rows:
+        category = data["baptism_category"]
+        family_id = data.pop("family", None)
+        main_member_id = data.pop("main_member", None)
+        relation_id = data.pop("relation_with_main_member", None)
+
+        if category == "OTHER":
+            if family_id or main_member_id or relation_id:
+                errors[index] = {
+                    "non_field_errors": [
+                        "Family, main member, and relationship must be "
+                        "empty for outsider baptism."
+                    ]
+                }
+                continue
+
+            baptisms.append(Baptism(church=church, **data))
+            continue
+
+        row_errors = {}
+
+        if not family_id:
+            row_errors["family"] = ["Family is required for parish baptism."]
+        elif family_id not in families:
+            row_errors["family"] = ["Invalid family."]
+
+        if not main_member_id:
+            row_errors["main_member"] = [
+                "Main member is required for parish baptism."
+            ]
+        elif main_member_id not in members:
+            row_errors["main_member"] = ["Invalid main member."]
+        elif family_id in families and members[main_member_id] != family_id:
+            row_errors["main_member"] = [
+                "Main member does not belong to this family."
+            ]
+
+        if not relation_id:
+            row_errors["relation_with_main_member"] = [
+                "Relationship is required for parish baptism."
+            ]
+        elif relation_id not in relations:
+            row_errors["relation_with_main_member"] = [
+                "Invalid relationship."
+            ]
+
+        if not data.get("dob"):
+            row_errors["dob"] = [
+                "Date of birth is required for parish baptism."
+            ]
+
+        if not row_errors:
+            key = (family_id, data["name"], data["dob"], data["date_of_baptism"])
+            if key in member_keys:
+                row_errors["non_field_errors"] = [
+                    "Duplicate parish entry in this batch."
+                ]
+            member_keys.add(key)
+
+        if row_errors:
+            errors[index] = row_errors
+            continue
+
+        baptisms.append(
+            Baptism(
+                church=church,
+                family_id=family_id,
+                main_member_id=main_member_id,
+                relation_with_main_member_id=relation_id,
+                **data
+            )
+        )
+
+    return baptisms
+
+
+def _import_chunk(church, rows, errors):
+    families = set(
+        Family.objects
+        .for_church(church)
+        .filter(id__in={r.get("family") for _, r in rows} - {None})
+        .values_list("id", flat=True)
+    )
+    members = dict(
+        Member.objects
+        .for_church(church)
+        .filter(
+            id__in={r.get("main_member") for _, r in rows} - {None}
+        )
+        .values_list("id", "family_id")
+    )
+    relations = set(
+        Relationship.objects
+        .filter(
+            id__in={r.get("relation_with_main_member") for _, r in rows} - {None}
+        )
+        .values_list("id", flat=True)
+    )
+
+    baptisms = _link_rows(church, rows, families, members, relations, errors)
+    if not baptisms:
+        return 0
+
+    with transaction.atomic():
+        new_members = [
+            _member_from_baptism(b)
+            for b in baptisms
+            if b.baptism_category == "PARISH"
+        ]
+
+        if new_members:
+            watermark = (
+                Member.objects.order_by("-pk")
+                .values_list("pk", flat=True)
+                .first()
+            ) or 0
+            Member.objects.bulk_create(new_members)
+            _resolve_member_ids(church, new_members, watermark)
+
+            parish = [b for b in baptisms if b.baptism_category == "PARISH"]
+            for baptism, member in zip(parish, new_members):
+                baptism.member_id = member.pk
+
+            # bulk_create sends no signals; the households and
+            # statistics changed
+            for family_id in {member.family_id for member in new_members}:
+                bump_profile_version("family", family_id)
+            bump_stats_version(church.pk)
+
+        Baptism.objects.bulk_create(baptisms)
+
+    return len(baptisms)
+
+
+def import_baptisms(church, rows, *, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Bulk digitization of a baptism register.
+
+    - rows are validated field-by-field without queries
+    - register_number uniqueness is checked against the batch
+      and the table with one IN query per chunk
+    - family / main member / relationship ids are resolved
+      through per-chunk lookup maps
+    - PARISH rows get their Member via bulk_create
+
+    Valid rows are saved one transaction per chunk; invalid rows
+    are skipped and reported. Returns (created, errors) where
+    errors is a list of {"row": index, "errors": {...}}.
+    """
+    errors = {}
+    valid = []
+    seen_numbers = set()
+
+    for index, row in enumerate(rows):
+        serializer = BaptismImportRowSerializer(data=row)
+        if not serializer.is_valid():
+            errors[index] = serializer.errors
+            continue
+
+        register_number = serializer.validated_data["register_number"]
+        if register_number in seen_numbers:
+            errors[index] = {
+                "register_number": ["Duplicate register number in this batch."]
+            }
+            continue
+
+        seen_numbers.add(register_number)
+        valid.append((index, serializer.validated_data))
+
+    created = 0
+
+    for _, chunk in _chunks(valid, chunk_size):
+        taken = set(
+            Baptism.objects
+            .filter(register_number__in=[r["register_number"] for _, r in chunk])
+            .values_list("register_number", flat=True)
+        )
+
+        rows_to_save = []
+        for index, data in chunk:
+            if data["register_number"] in taken:
+                errors[index] = {
+                    "register_number": [
+                        "Baptism with this register number already exists."
+                    ]
+                }
+            else:
+                rows_to_save.append((index, data))
+
+        try:
+            created += _import_chunk(church, rows_to_save, errors)
+        except IntegrityError:
+            # Lost a race on register_number; report the chunk, keep going
+            for index, _ in rows_to_save:
+                errors.setdefault(index, {
+                    "non_field_errors": [
+                        "Could not save this row; please retry the import."
+                    ]
+                })
+
+    return created, [
+        {"row": index, "errors": errors[index]}
+        for index in sorted(errors)
+    ]
@@ -0,0 +1,278 @@
+"""
+Lightweight DB-backed job queue.
+
+Handlers are plain functions registered with @job("name") in a `tasks`
+module of any installed app. Views call enqueue() inside their own
+transaction, so a job only becomes visible to the worker once the
+request's changes are committed. `manage.py run_jobs` claims due jobs
+with SELECT ... FOR UPDATE SKIP LOCKED, so several workers can share
+the table without an external broker.
+"""
+import contextvars
+import logging
+import os
+import socket
+import time
+import traceback
+from datetime import timedelta
+
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("PENDING", "RUNNING")
+
+# Delay before attempt N+1, indexed by attempts already made
+RETRY_DELAYS = (
+    timedelta(seconds=30),
+    timedelta(minutes=2),
+    timedelta(minutes=10),
+)
+
+# A RUNNING job not finished within this window is assumed to have lost
+# its worker and is handed out again
+LOCK_TIMEOUT = timedelta(minutes=30)
+
+_handlers = {}
+_current_job = contextvars.ContextVar("current_job", default=None)
+
+
+def job(name):
+    """
+    Register a handler: `handler(payload) -> JSON-serializable result`.
+    Handlers may run more than once (retries, lost workers), so they must
+    be safe to repeat.
+    """
+    def register(func):
+        if name in _handlers and _handlers[name] is not func:
+            raise ValueError(f"Job handler {name!r} is already registered.")
+        _handlers[name] = func
+        return func
+
+    return register
+
+
+def load_handlers():
+    autodiscover_modules("tasks")
+    return dict(_handlers)
+
+
+def enqueue(name, payload=None, *, idempotency_key=None, max_attempts=3, delay=None):
+    """
+    Queue a job and return it. With an idempotency_key, an existing job
+    with the same key is returned instead of queueing a second one.
+    """
+    if idempotency_key:
+        existing = BackgroundJob.objects.filter(
+            idempotency_key=idempotency_key
+        ).first()
+        if existing:
+            return existing
+
+    fields = {
+        "name": name,
+        "payload": payload or {},
+        "idempotency_key": idempotency_key or None,
+        "max_attempts": max_attempts,
+        "run_after": timezone.now() + (delay or timedelta()),
+    }
+
+    try:
+        with transaction.atomic():
+            return BackgroundJob.objects.create(**fields)
+    except IntegrityError:
+        if not idempotency_key:
+            raise
+        # Lost a race with a concurrent request using the same key
+        return BackgroundJob.objects.get(idempotency_key=idempotency_key)
+
+
+def has_active_job(idempotency_key):
+    return BackgroundJob.objects.filter(
+        idempotency_key=idempotency_key,
+        status__in=ACTIVE_STATUSES
+    ).exists()
+
+
+def retry_job(job):
+    """
+    Put a FAILED job back on the queue with a fresh attempt budget.
+    """
+    return BackgroundJob.objects.filter(pk=job.pk, status="FAILED").update(
+        status="PENDING",
+        attempts=0,
+        run_after=timezone.now(),
+        locked_by="",
+        locked_at=None,
+        finished_at=None,
+        updated_at=timezone.now(),
+    )
+
+
+def heartbeat():
+    """
+    Called by long handlers between batches to keep their lock fresh,
+    so requeue_stale_jobs() does not hand the job to another worker.
+    """
+    job = _current_job.get()
+    if job is not None:
+        BackgroundJob.objects.filter(pk=job.pk, status="RUNNING").update(
+            locked_at=timezone.now()
+        )
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+# =====================================================
+# WORKER
+# =====================================================
+
+def requeue_stale_jobs():
+    """
+    Release RUNNING jobs whose worker died. Jobs that already used every
+    attempt are marked FAILED instead.
+    """
+    now = timezone.now()
+    stale = BackgroundJob.objects.filter(
+        status="RUNNING",
+        locked_at__lt=now - LOCK_TIMEOUT
+    )
+    error = "Worker stopped responding; job was released."
+
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status="FAILED",
+        last_error=error,
+        finished_at=now,
+        updated_at=now,
+    )
+    requeued = stale.update(
+        status="PENDING",
+        last_error=error,
+        locked_by="",
+        locked_at=None,
+        run_after=now,
+        updated_at=now,
+    )
+    return requeued, failed
+
+
+def claim_job(worker_id):
+    """
+    Lock the next due job for this worker and mark it RUNNING.
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        job = (
+            BackgroundJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(status="PENDING", run_after__lte=now)
+            .order_by("run_after", "id")
+            .first()
+        )
+        if job is None:
+            return None
+
+        job.status = "RUNNING"
+        job.attempts += 1
+        job.locked_by = worker_id
+        job.locked_at = now
+        job.save(update_fields=[
+            "status", "attempts", "locked_by", "locked_at", "updated_at"
+        ])
+
+    return job
+
+
+def run_job(job, handlers=None):
+    """
+    Execute a claimed job and record the outcome. Failures are retried
+    with backoff until max_attempts is reached.
+    """
+    handlers = _handlers if handlers is None else handlers
+    handler = handlers.get(job.name)
+
+    token = _current_job.set(job)
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for job {job.name!r}.")
+        result = handler(job.payload)
+    except Exception:
+        logger.exception("Job %s failed (attempt %s)", job, job.attempts)
+
+        now = timezone.now()
+        job.last_error = traceback.format_exc()
+        job.locked_by = ""
+        job.locked_at = None
+
+        if handler is not None and job.attempts < job.max_attempts:
+            delay = RETRY_DELAYS[min(job.attempts, len(RETRY_DELAYS)) - 1]
+            job.status = "PENDING"
+            job.run_after = now + delay
+        else:
+            job.status = "FAILED"
+            job.finished_at = now
+
+        job.save(update_fields=[
+            "status", "last_error", "locked_by", "locked_at",
+            "run_after", "finished_at", "updated_at"
+        ])
+        return False
+    finally:
+        _current_job.reset(token)
+
+    job.status = "SUCCEEDED"
+    job.result = result
+    job.last_error = ""
+    job.locked_by = ""
+    job.locked_at = None
+    job.finished_at = timezone.now()
+    job.save(update_fields=[
+        "status", "result", "last_error", "locked_by", "locked_at",
+        "finished_at", "updated_at"
+    ])
+    return True
+
+
+def run_worker(*, worker_id=None, poll_interval=2.0, once=False,
+               max_jobs=None, should_stop=lambda: False):
+    """
+    Claim and run jobs until stopped. With once=True, return as soon as
+    no job is due. Returns the number of jobs processed.
+    """
+    worker_id = worker_id or default_worker_id()
+    handlers = load_handlers()
+    processed = 0
+    last_stale_check = None
+
+    while not should_stop():
+        close_old_connections()
+
+        now = time.monotonic()
+        if last_stale_check is None or now - last_stale_check > 60:
+            requeue_stale_jobs()
+            last_stale_check = now
+
+        job = claim_job(worker_id)
+
+        if job is None:
+            if once:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        run_job(job, handlers)
+        processed += 1
+
+        if max_jobs and processed >= max_jobs:
+            break
+
+    close_old_connections()
+    return processed
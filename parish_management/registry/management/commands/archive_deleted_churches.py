@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from registry.models import Church
+from registry.tenants import archive_church, archive_deleted_churches
+
+
+class Command(BaseCommand):
+    help = (
+        "Move families, members and baptisms of churches soft-deleted longer "
+        "than TENANT_ARCHIVE_AFTER_DAYS into compressed archive rows "
+        "(run daily from cron). church_restore brings them back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help=f"Retention in days (default {settings.TENANT_ARCHIVE_AFTER_DAYS}).",
+        )
+        parser.add_argument(
+            "--church",
+            type=int,
+            default=None,
+            help="Archive this soft-deleted church now, ignoring retention.",
+        )
+
+    def handle(self, *args, **options):
+        if options["church"]:
+            try:
+                archives = [archive_church(options["church"])]
+            except (Church.DoesNotExist, ValueError) as exc:
+                raise CommandError(str(exc))
+        else:
+            archives = archive_deleted_churches(older_than_days=options["days"])
+
+        for archive in archives:
+            if archive is None:
+                continue
+            rows = sum(archive.counts.values())
+            self.stdout.write(
+                f"{archive.church.name}: {rows} row(s) archived "
+                f"({len(archive.data)} bytes)"
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {len([a for a in archives if a])} church(es)."
+        ))
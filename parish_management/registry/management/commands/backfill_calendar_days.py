@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from registry.occasions import BACKFILL_BATCH_SIZE, backfill_calendar_days
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the indexed birthday / baptism calendar positions of "
+        "every member in primary key batches. Needed after writes that "
+        "skip Member.save(), e.g. queryset.update() or restored archives."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BACKFILL_BATCH_SIZE,
+            help=f"Rows per UPDATE (default {BACKFILL_BATCH_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        updated = backfill_calendar_days(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} member(s)."))
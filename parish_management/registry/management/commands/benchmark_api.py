@@ -0,0 +1,145 @@
+import io
+import statistics
+import sys
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework_simplejwt.tokens import AccessToken
+
+from parish_management.db.pool import close_pool, pool_stats
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure requests/second of a GET endpoint through the full WSGI "
+        "handler (including the per-request connection open/close), first "
+        "without and then with the DB connection pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/api/registry/wards/")
+        parser.add_argument(
+            "--user",
+            required=True,
+            help="Username to issue the bearer token for.",
+        )
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument(
+            "--mode",
+            choices=("both", "direct", "pool"),
+            default="both",
+            help="Run without the pool, with it, or both (default).",
+        )
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=options["user"]).first()
+        if user is None:
+            raise CommandError(f"User {options['user']!r} does not exist.")
+
+        connection = connections[DEFAULT_DB_ALIAS]
+        if not hasattr(connection, "pool_options"):
+            raise CommandError(
+                "DATABASES['default'] does not use the pooled backend "
+                "(parish_management.db.mysql)."
+            )
+
+        db_options = connection.settings_dict["OPTIONS"]
+        pool_setting = db_options.get("pool") or True
+        modes = {
+            "both": (("direct", None), ("pool", pool_setting)),
+            "direct": (("direct", None),),
+            "pool": (("pool", pool_setting),),
+        }[options["mode"]]
+
+        app = get_wsgi_application()
+        token = str(AccessToken.for_user(user))
+        connection.close()
+
+        try:
+            for label, pool in modes:
+                db_options["pool"] = pool
+                close_pool(connection.pool_key)
+
+                self._request(app, options["path"], token)  # warm up
+                rps, latencies = self._run(
+                    app, options["path"], token,
+                    options["requests"], options["concurrency"]
+                )
+                self.stdout.write(
+                    f"{label:>6}: {rps:8.1f} req/s  "
+                    f"p50 {statistics.median(latencies) * 1000:.1f}ms  "
+                    f"p95 {self._p95(latencies) * 1000:.1f}ms"
+                )
+                for stats in pool_stats():
+                    self.stdout.write(f"        {stats}")
+        finally:
+            db_options["pool"] = pool_setting
+
+    def _run(self, app, path, token, total, concurrency):
+        latencies = []
+        lock = threading.Lock()
+        remaining = [total]
+
+        def worker():
+            while True:
+                with lock:
+                    if not remaining[0]:
+                        return
+                    remaining[0] -= 1
+                started = time.perf_counter()
+                self._request(app, path, token)
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.append(elapsed)
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return total / (time.perf_counter() - started), latencies
+
+    def _request(self, app, path, token):
+        status = []
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": path,
+            "QUERY_STRING": "",
+            "SERVER_NAME": "localhost",
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "REMOTE_ADDR": "127.0.0.1",
+            "HTTP_AUTHORIZATION": f"Bearer {token}",
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+
+        response = app(environ, lambda code, headers, exc_info=None: status.append(code))
+        try:
+            for _ in response:
+                pass
+        finally:
+            # Fires request_finished, which closes (or returns) the DB connection
+            response.close()
+
+        if not status[0].startswith("200"):
+            raise CommandError(f"GET {path} returned {status[0]}.")
+
+    @staticmethod
+    def _p95(latencies):
+        ordered = sorted(latencies)
+        return ordered[int(len(ordered) * 0.95) - 1] if ordered else 0.0
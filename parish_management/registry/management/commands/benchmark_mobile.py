@@ -0,0 +1,210 @@
+import asyncio
+import io
+import sys
+import threading
+import time
+import types
+
+from django.contrib.auth import get_user_model
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.test import override_settings
+from django.urls import path
+from rest_framework_simplejwt.tokens import AccessToken
+
+from registry import async_views, views
+
+User = get_user_model()
+
+MOBILE_ROUTES = (
+    ("api/registry/mobile/wards/", "WardListWithFamilyCountAPIView"),
+    ("api/registry/mobile/<ward_id>/families/", "WardFamiliesMobileAPIView"),
+    ("api/registry/mobile/families/<int:family_id>/", "FamilyDetailMobileAPIView"),
+    ("api/registry/member/profile/", "MemberProfileAPIView"),
+)
+
+
+def _urlconf(name, module, prefix=""):
+    urlconf = types.ModuleType(name)
+    urlconf.urlpatterns = [
+        path(route, getattr(module, prefix + view).as_view())
+        for route, view in MOBILE_ROUTES
+    ]
+    sys.modules[name] = urlconf
+    return name
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the sync mobile views behind a threaded WSGI worker with "
+        "the async views behind a single ASGI event loop, for clients that "
+        "take --client-delay seconds to receive each response."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/api/registry/mobile/wards/")
+        parser.add_argument(
+            "--user",
+            required=True,
+            help="Username to issue the bearer token for.",
+        )
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=8,
+            help="WSGI worker threads (default 8).",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=100,
+            help="Requests in flight on the ASGI worker (default 100).",
+        )
+        parser.add_argument(
+            "--client-delay",
+            type=float,
+            default=0.2,
+            help="Seconds a slow client takes to read a response (default 0.2).",
+        )
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=options["user"]).first()
+        if user is None:
+            raise CommandError(f"User {options['user']!r} does not exist.")
+
+        token = str(AccessToken.for_user(user))
+        total = options["requests"]
+        delay = options["client_delay"]
+
+        with override_settings(ROOT_URLCONF=_urlconf("_bench_sync_urls", views)):
+            elapsed = self._run_wsgi(
+                get_wsgi_application(), options["path"], token,
+                total, options["threads"], delay
+            )
+        self._report(f"WSGI ({options['threads']} threads)", total, elapsed)
+
+        with override_settings(
+            ROOT_URLCONF=_urlconf("_bench_async_urls", async_views, "Async")
+        ):
+            elapsed = asyncio.run(self._run_asgi(
+                get_asgi_application(), options["path"], token,
+                total, options["concurrency"], delay
+            ))
+        self._report(f"ASGI (1 loop, {options['concurrency']} in flight)", total, elapsed)
+
+    def _report(self, label, total, elapsed):
+        self.stdout.write(f"{label:>34}: {total / elapsed:8.1f} req/s  ({elapsed:.2f}s)")
+
+    # -----------------------------
+    # WSGI
+    # -----------------------------
+    def _run_wsgi(self, app, url, token, total, threads, delay):
+        lock = threading.Lock()
+        remaining = [total]
+        errors = []
+
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": url,
+            "QUERY_STRING": "",
+            "SERVER_NAME": "localhost",
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "REMOTE_ADDR": "127.0.0.1",
+            "HTTP_AUTHORIZATION": f"Bearer {token}",
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": "http",
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+
+        def worker():
+            while True:
+                with lock:
+                    if not remaining[0] or errors:
+                        return
+                    remaining[0] -= 1
+
+                status = []
+                response = app(
+                    {**environ, "wsgi.input": io.BytesIO()},
+                    lambda code, headers, exc_info=None: status.append(code)
+                )
+                try:
+                    for _ in response:
+                        # The worker thread is held while the client reads
+                        time.sleep(delay)
+                finally:
+                    response.close()
+
+                if not status[0].startswith("200"):
+                    errors.append(status[0])
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        started = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+        if errors:
+            raise CommandError(f"GET {url} returned {errors[0]} (WSGI).")
+        return time.perf_counter() - started
+
+    # -----------------------------
+    # ASGI
+    # -----------------------------
+    async def _run_asgi(self, app, url, token, total, concurrency, delay):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": url,
+            "raw_path": url.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [
+                (b"host", b"localhost"),
+                (b"authorization", f"Bearer {token}".encode()),
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": ("localhost", 80),
+        }
+        slots = asyncio.Semaphore(concurrency)
+        errors = []
+
+        async def one():
+            requested = []
+            status = []
+
+            async def receive():
+                if not requested:
+                    requested.append(True)
+                    return {"type": "http.request", "body": b"", "more_body": False}
+                # The client never disconnects early
+                await asyncio.Future()
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    status.append(message["status"])
+                elif not message.get("more_body"):
+                    # Only this request waits while the client reads
+                    await asyncio.sleep(delay)
+
+            async with slots:
+                await app(dict(scope), receive, send)
+            if status[0] != 200:
+                errors.append(status[0])
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+
+        if errors:
+            raise CommandError(f"GET {url} returned {errors[0]} (ASGI).")
+        return time.perf_counter() - started
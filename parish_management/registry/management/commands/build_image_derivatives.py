@@ -0,0 +1,80 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+
+from registry.images import generate_derivatives, process_image_upload
+from registry.models import Church, Family
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfill thumbnail / medium / WebP derivatives for family images "
+        "and church logos, and record them on the rows (run once after "
+        "upgrading, so listings show them)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Parallel image workers (default 4)",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Rebuild derivatives that already exist",
+        )
+        parser.add_argument(
+            "--normalize",
+            action="store_true",
+            help="Also strip EXIF and downscale the stored originals",
+        )
+
+    def handle(self, *args, **options):
+        names = set(
+            Family.objects
+            .exclude(family_image="")
+            .exclude(family_image__isnull=True)
+            .values_list("family_image", flat=True)
+        )
+        names.update(
+            Church.all_objects
+            .exclude(logo="")
+            .exclude(logo__isnull=True)
+            .values_list("logo", flat=True)
+        )
+
+        self.stdout.write(f"{len(names)} images to check")
+
+        written = failed = 0
+
+        if options["normalize"]:
+            def job(name):
+                process_image_upload(name)
+                return 0
+        else:
+            def job(name):
+                return generate_derivatives(name, force=options["force"])
+
+        with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+            futures = {
+                pool.submit(job, name): name
+                for name in sorted(names)
+            }
+
+            for future in as_completed(futures):
+                try:
+                    written += future.result()
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f"{futures[future]}: {exc}")
+
+        if options["normalize"]:
+            summary = f"{len(names) - failed} images processed"
+        else:
+            summary = f"{written} derivatives written"
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. {summary}, {failed} images failed."
+        ))
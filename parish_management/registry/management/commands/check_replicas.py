@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from parish_management.db_routing import check_replica, replica_aliases
+
+
+class Command(BaseCommand):
+    help = "Report the lag of each read replica; exits non-zero if one is unhealthy."
+
+    def handle(self, *args, **options):
+        aliases = replica_aliases()
+        if not aliases:
+            self.stdout.write("No replicas configured (DATABASE_REPLICAS).")
+            return
+
+        unhealthy = []
+        for alias in aliases:
+            healthy, lag = check_replica(alias)
+            lag_text = "unknown" if lag is None else f"{lag:.1f}s"
+
+            if healthy:
+                self.stdout.write(self.style.SUCCESS(f"{alias}: ok, lag {lag_text}"))
+            else:
+                unhealthy.append(alias)
+                self.stdout.write(self.style.ERROR(
+                    f"{alias}: unhealthy, lag {lag_text} "
+                    f"(max {settings.REPLICA_MAX_LAG_SECONDS}s)"
+                ))
+
+        if unhealthy:
+            raise CommandError(f"Unhealthy replicas: {', '.join(unhealthy)}")
@@ -0,0 +1,50 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, close_old_connections
+from django.utils import timezone
+
+from registry.models import ReplicaHeartbeat
+
+
+class Command(BaseCommand):
+    help = (
+        "Keep rewriting the replication heartbeat on the primary. Replicas "
+        "whose copy falls behind REPLICA_MAX_LAG_SECONDS stop serving reads. "
+        "Run one instance next to the job worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds between heartbeats (default 1).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Write a single heartbeat and exit.",
+        )
+
+    def handle(self, *args, **options):
+        stopping = []
+
+        def stop(signum, frame):
+            stopping.append(signum)
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        while not stopping:
+            close_old_connections()
+            ReplicaHeartbeat.objects.using(DEFAULT_DB_ALIAS).update_or_create(
+                pk=1,
+                defaults={"beat_at": timezone.now()}
+            )
+            if options["once"]:
+                break
+            time.sleep(options["interval"])
+
+        close_old_connections()
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from registry.analytics import rollup_revenue, run_revenue_rollup
+
+
+class Command(BaseCommand):
+    help = (
+        "Write revenue / MRR rollup rows. Without arguments, continues "
+        "from the last rolled-up day (run daily from cron). "
+        "With --from/--to, rebuilds that date range."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="date_from", help="YYYY-MM-DD")
+        parser.add_argument("--to", dest="date_to", help="YYYY-MM-DD")
+
+    def handle(self, *args, **options):
+        if not options["date_from"] and not options["date_to"]:
+            days = run_revenue_rollup()
+            self.stdout.write(self.style.SUCCESS(f"Rolled up {days} day(s)."))
+            return
+
+        start = parse_date(options["date_from"] or "")
+        end = parse_date(options["date_to"] or "")
+
+        if not start or not end:
+            raise CommandError("Both --from and --to are required as YYYY-MM-DD.")
+        if start > end:
+            raise CommandError("--from must be on or before --to.")
+
+        days = rollup_revenue(start, end)
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {days} day(s) from {start} to {end}."
+        ))
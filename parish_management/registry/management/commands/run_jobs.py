@@ -0,0 +1,56 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from registry.jobs import default_worker_id, run_worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the background job worker. Start one or more of these next to "
+        "the web processes (systemd/supervisor); stops cleanly on SIGTERM."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process due jobs and exit instead of polling.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds to sleep when the queue is empty (default 2).",
+        )
+        parser.add_argument(
+            "--max-jobs",
+            type=int,
+            default=None,
+            help="Exit after this many jobs (lets a supervisor recycle the process).",
+        )
+        parser.add_argument("--worker-id", default=None)
+
+    def handle(self, *args, **options):
+        stopping = []
+
+        def stop(signum, frame):
+            stopping.append(signum)
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        worker_id = options["worker_id"] or default_worker_id()
+        self.stdout.write(f"Job worker {worker_id} started.")
+
+        processed = run_worker(
+            worker_id=worker_id,
+            poll_interval=options["poll_interval"],
+            once=options["once"],
+            max_jobs=options["max_jobs"],
+            should_stop=lambda: bool(stopping),
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Job worker {worker_id} stopped after {processed} job(s)."
+        ))
@@ -0,0 +1,39 @@
+from django.db import models
+
+
+class ChurchQuerySet(models.QuerySet):
+    def live(self):
+        return self.filter(is_deleted=False)
+
+    def deleted(self):
+        return self.filter(is_deleted=True)
+
+
+class LiveChurchManager(models.Manager.from_queryset(ChurchQuerySet)):
+    """
+    `Church.objects`: soft-deleted churches are left out.
+    Served by the (is_deleted, ...) composite indexes on Church.
+    """
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleted=False)
+
+
+class ChurchScopedQuerySet(models.QuerySet):
+    """
+    Default queryset of every model with a `church` FK (tenant data).
+    """
+    def for_church(self, church):
+        return self.filter(church=church)
+
+    def for_user(self, user):
+        """
+        Rows of the user's church; nothing when the user has no church
+        or it has been soft-deleted.
+        """
+        church = getattr(user, "church", None)
+        if church is None or church.is_deleted:
+            return self.none()
+        return self.for_church(church)
+
+
+ChurchScopedManager = models.Manager.from_queryset(ChurchScopedQuerySet)
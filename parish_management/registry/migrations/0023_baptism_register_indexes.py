@@ -0,0 +1,33 @@
+# Generated by Django 6.0.1 on 2026-10-19 15:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0022_alter_family_house_name'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='baptism',
+            index=models.Index(fields=['church', '-created_at', '-id'], name='baptism_church_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='baptism',
+            index=models.Index(fields=['church', 'date_of_baptism'], name='baptism_church_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='baptism',
+            index=models.Index(fields=['church', 'gender', 'date_of_baptism'], name='baptism_church_gender_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='baptism',
+            index=models.Index(fields=['church', 'register_number'], name='baptism_church_regno_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='baptism',
+            index=models.Index(fields=['church', 'name'], name='baptism_church_name_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.0.1 on 2026-10-19 15:16
+
+import registry.uploads
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0023_baptism_register_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='church',
+            name='logo',
+            field=models.ImageField(blank=True, null=True, upload_to='church_logos/', validators=[registry.uploads.validate_image_upload]),
+        ),
+        migrations.AlterField(
+            model_name='family',
+            name='family_image',
+            field=models.ImageField(blank=True, null=True, upload_to='family_images/', validators=[registry.uploads.validate_image_upload]),
+        ),
+    ]
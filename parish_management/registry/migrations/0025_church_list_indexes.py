@@ -0,0 +1,21 @@
+# Generated by Django 6.0.1 on 2026-10-19 15:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0024_image_upload_validators'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='church',
+            index=models.Index(fields=['is_deleted', '-created_at'], name='church_deleted_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='church',
+            index=models.Index(fields=['is_deleted', 'is_active', '-created_at'], name='church_deleted_active_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.1 on 2026-10-19 15:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0025_church_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bill',
+            index=models.Index(fields=['status', 'created_at'], name='bill_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bill',
+            index=models.Index(fields=['church', '-created_at'], name='bill_church_created_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 6.0.1 on 2026-10-19 15:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0026_bill_ledger_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevenueDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('mrr', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('active_subscriptions', models.PositiveIntegerField(default=0)),
+                ('new_subscriptions', models.PositiveIntegerField(default=0)),
+                ('churned_subscriptions', models.PositiveIntegerField(default=0)),
+                ('churned_mrr', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('billed_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('paid_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('new_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('upgrade_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('renewal_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RevenuePackageRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('mrr', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('active_subscriptions', models.PositiveIntegerField(default=0)),
+                ('paid_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('upgrade_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('package', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revenue_rollups', to='registry.package')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('date', 'package'), name='revenue_package_rollup_unique')],
+            },
+        ),
+    ]
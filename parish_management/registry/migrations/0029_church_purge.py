@@ -0,0 +1,28 @@
+# Generated by Django 6.0.1 on 2026-10-19 15:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0028_background_jobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChurchPurge',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('church_id', models.PositiveBigIntegerField(unique=True)),
+                ('church_name', models.CharField(max_length=200)),
+                ('status', models.CharField(choices=[('RUNNING', 'Running'), ('DONE', 'Done')], default='RUNNING', max_length=10)),
+                ('step', models.CharField(blank=True, max_length=50)),
+                ('deleted', models.JSONField(blank=True, default=dict)),
+                ('archive_path', models.CharField(blank=True, max_length=500)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 6.0.1 on 2026-10-19 15:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0029_church_purge'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChurchArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', models.BinaryField()),
+                ('counts', models.JSONField(blank=True, default=dict)),
+                ('user_links', models.JSONField(blank=True, default=dict)),
+                ('is_complete', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('church', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='archive', to='registry.church')),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.1 on 2026-10-19 15:29
+
+import django.db.models.manager
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0030_church_archive'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='church',
+            options={'default_manager_name': 'all_objects'},
+        ),
+        migrations.AlterModelManagers(
+            name='church',
+            managers=[
+                ('all_objects', django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='church',
+            index=models.Index(fields=['is_deleted', 'deleted_at'], name='church_deleted_at_idx'),
+        ),
+    ]
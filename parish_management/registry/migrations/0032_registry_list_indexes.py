@@ -0,0 +1,25 @@
+# Generated by Django 6.0.1 on 2026-10-19 15:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0031_church_managers'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='family',
+            index=models.Index(fields=['church', 'family_name'], name='family_church_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='member',
+            index=models.Index(fields=['church', 'name'], name='member_church_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ward',
+            index=models.Index(fields=['church', 'ward_number'], name='ward_church_number_idx'),
+        ),
+    ]
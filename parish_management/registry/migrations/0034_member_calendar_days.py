@@ -0,0 +1,53 @@
+# Generated by Django 6.0.1 on 2026-10-19 18:40
+
+from django.db import migrations, models
+from django.db.models.functions import ExtractDay, ExtractMonth
+
+BATCH_SIZE = 2000
+
+
+def set_month_days(apps, schema_editor):
+    # Same batched UPDATE as registry.occasions.backfill_calendar_days
+    Member = apps.get_model("registry", "Member")
+    pks = Member.objects.order_by("pk").values_list("pk", flat=True)
+    first_pk, last_pk = pks.first(), pks.last()
+    if first_pk is None:
+        return
+
+    for low in range(first_pk, last_pk + 1, BATCH_SIZE):
+        Member.objects.filter(pk__gte=low, pk__lt=low + BATCH_SIZE).update(
+            birth_month_day=ExtractMonth("dob") * 100 + ExtractDay("dob"),
+            baptism_month_day=(
+                ExtractMonth("date_of_baptism") * 100
+                + ExtractDay("date_of_baptism")
+            ),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0033_replica_heartbeat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='member',
+            name='baptism_month_day',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='member',
+            name='birth_month_day',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(set_month_days, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='member',
+            index=models.Index(fields=['church', 'birth_month_day'], name='member_church_birthday_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='member',
+            index=models.Index(fields=['church', 'baptism_month_day'], name='member_church_baptism_day_idx'),
+        ),
+    ]
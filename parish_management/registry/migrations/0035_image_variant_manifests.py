@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-20 09:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0034_member_calendar_days'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='church',
+            name='logo_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='family',
+            name='family_image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -6,6 +6,25 @@ from dateutil.relativedelta import relativedelta
 from django.utils import timezone
 from django.utils.timezone import now
 from accounts.utils import create_family_head_user
+from registry.uploads import validate_image_upload
+from registry.managers import ChurchQuerySet, ChurchScopedManager, LiveChurchManager
+
+def calculate_age(dob, today=None):
+    today = today or date.today()
+    return today.year - dob.year - (
+        (today.month, today.day) < (dob.month, dob.day)
+    )
+
+
+def month_day(value):
+    """
+    Position in the calendar regardless of year, as MMDD: 1 Mar -> 301.
+    Unlike day-of-year it does not shift after February in leap years.
+    """
+    if value is None:
+        return None
+    return value.month * 100 + value.day
+
 
 class Church(models.Model):
     name = models.CharField(max_length=200)
@@ -22,8 +41,12 @@ class Church(models.Model):
     logo = models.ImageField(
         upload_to="church_logos/",
         null=True,
-        blank=True
+        blank=True,
+        validators=[validate_image_upload]
     )
+    # Derivatives built for `logo` (registry.images), so listings need
+    # no storage lookups
+    logo_variants = models.JSONField(default=dict, blank=True, editable=False)
 
     email = models.EmailField(unique=True)
     phone_number = models.CharField(max_length=15)
@@ -34,6 +57,30 @@ class Church(models.Model):
     is_deleted = models.BooleanField(default=False)  # 🔥 NEW
     deleted_at = models.DateTimeField(null=True, blank=True)
 
+    objects = LiveChurchManager()  # excludes soft-deleted churches
+    all_objects = ChurchQuerySet.as_manager()
+
+    class Meta:
+        # Django internals (unique checks, admin, dumpdata) see every church
+        default_manager_name = "all_objects"
+        indexes = [
+            # Admin church list: live/deleted tabs, newest first
+            models.Index(
+                fields=["is_deleted", "-created_at"],
+                name="church_deleted_created_idx",
+            ),
+            # ... with the active/inactive filter
+            models.Index(
+                fields=["is_deleted", "is_active", "-created_at"],
+                name="church_deleted_active_idx",
+            ),
+            # Archive sweep: deleted longer than the retention period
+            models.Index(
+                fields=["is_deleted", "deleted_at"],
+                name="church_deleted_at_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.name
     
@@ -174,6 +221,17 @@ class Ward(models.Model):
     ward_number = models.PositiveIntegerField()
     place = models.CharField(max_length=150)
 
+    objects = ChurchScopedManager()
+
+    class Meta:
+        indexes = [
+            # Ward list default ordering
+            models.Index(
+                fields=["church", "ward_number"],
+                name="ward_church_number_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.ward_name} ({self.church.name})"
 
@@ -197,8 +255,22 @@ class Family(models.Model):
     family_image = models.ImageField(
         upload_to="family_images/",
         null=True,
-        blank=True
+        blank=True,
+        validators=[validate_image_upload]
     )
+    family_image_variants = models.JSONField(default=dict, blank=True, editable=False)
+
+    objects = ChurchScopedManager()
+
+    class Meta:
+        indexes = [
+            # Family list default ordering / name prefix search
+            models.Index(
+                fields=["church", "family_name"],
+                name="family_church_name_idx",
+            ),
+        ]
+
     def get_active_head(self):
         return self.members.filter(
             is_family_head=True,
@@ -302,13 +374,52 @@ class Member(models.Model):
     is_family_head = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
 
+    # month_day() of dob / date_of_baptism, kept in save() for the
+    # birthday and anniversary calendar (registry.occasions)
+    birth_month_day = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        editable=False
+    )
+    baptism_month_day = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        editable=False
+    )
+
+    objects = ChurchScopedManager()
+
+    class Meta:
+        indexes = [
+            # Member list default ordering / name prefix search
+            models.Index(
+                fields=["church", "name"],
+                name="member_church_name_idx",
+            ),
+            # Calendar windows: one range (two across New Year)
+            models.Index(
+                fields=["church", "birth_month_day"],
+                name="member_church_birthday_idx",
+            ),
+            models.Index(
+                fields=["church", "baptism_month_day"],
+                name="member_church_baptism_day_idx",
+            ),
+        ]
+
     def save(self, *args, **kwargs):
     # Track previous head state (important)
         was_head = None
+        previous_family_id = None
         if self.pk:
-            was_head = Member.objects.filter(
+            previous = Member.objects.filter(
                 pk=self.pk
-            ).values_list("is_family_head", flat=True).first()
+            ).values_list("is_family_head", "family_id").first()
+            if previous:
+                was_head, previous_family_id = previous
+
+    # Read by registry.signals: a move changes the old family's household too
+        self._previous_family_id = previous_family_id
 
     # 🔥 Enforce single family head
         if self.is_family_head:
@@ -319,10 +430,11 @@ class Member(models.Model):
 
     # 🔢 Age calculation
         if self.dob:
-            today = date.today()
-            self.age = today.year - self.dob.year - (
-                (today.month, today.day) < (self.dob.month, self.dob.day)
-            )
+            self.age = calculate_age(self.dob)
+
+    # 📅 Calendar positions
+        self.birth_month_day = month_day(self.dob)
+        self.baptism_month_day = month_day(self.date_of_baptism)
 
         super().save(*args, **kwargs)
 
@@ -407,6 +519,22 @@ class Bill(models.Model):
     paid_at = models.DateTimeField(null=True, blank=True)
     breakdown = models.JSONField(null=True, blank=True)
 
+    objects = ChurchScopedManager()
+
+    class Meta:
+        indexes = [
+            # Admin bill ledger + monthly totals
+            models.Index(
+                fields=["status", "created_at"],
+                name="bill_status_created_idx",
+            ),
+            # Church bill history (church_detail, church API)
+            models.Index(
+                fields=["church", "-created_at"],
+                name="bill_church_created_idx",
+            ),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.bill_number:
             self.bill_number = f"EGLS-BILL-{timezone.now().year}-{self.pk or 'NEW'}"
@@ -470,6 +598,8 @@ class UpgradeRequest(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     reviewed_at = models.DateTimeField(null=True, blank=True)
 
+    objects = ChurchScopedManager()
+
     def __str__(self):
         return f"{self.church.name} → {self.requested_package.name}"
 
@@ -552,5 +682,216 @@ class Baptism(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = ChurchScopedManager()
+
+    class Meta:
+        indexes = [
+            # Register listing (cursor pagination order)
+            models.Index(
+                fields=["church", "-created_at", "-id"],
+                name="baptism_church_created_idx",
+            ),
+            # Date range filter + yearly summary
+            models.Index(
+                fields=["church", "date_of_baptism"],
+                name="baptism_church_date_idx",
+            ),
+            models.Index(
+                fields=["church", "gender", "date_of_baptism"],
+                name="baptism_church_gender_idx",
+            ),
+            # Prefix filters
+            models.Index(
+                fields=["church", "register_number"],
+                name="baptism_church_regno_idx",
+            ),
+            models.Index(
+                fields=["church", "name"],
+                name="baptism_church_name_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.register_number})"
+
+
+
+#revenue analytics rollups
+class RevenueDailyRollup(models.Model):
+    """
+    One row per day, written by registry.analytics.rollup_revenue.
+    The admin analytics page reads only these rows.
+    """
+    date = models.DateField(unique=True)
+
+    mrr = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    active_subscriptions = models.PositiveIntegerField(default=0)
+    new_subscriptions = models.PositiveIntegerField(default=0)
+    churned_subscriptions = models.PositiveIntegerField(default=0)
+    churned_mrr = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    billed_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    paid_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    new_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    upgrade_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    renewal_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Revenue {self.date}"
+
+
+class RevenuePackageRollup(models.Model):
+    date = models.DateField()
+    package = models.ForeignKey(
+        Package,
+        on_delete=models.CASCADE,
+        related_name="revenue_rollups"
+    )
+
+    mrr = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    active_subscriptions = models.PositiveIntegerField(default=0)
+    paid_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    upgrade_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "package"],
+                name="revenue_package_rollup_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Revenue {self.date} - {self.package.name}"
+
+
+#background jobs
+class BackgroundJob(models.Model):
+    """
+    A unit of work for the DB-backed queue in registry.jobs,
+    executed by `manage.py run_jobs`.
+    """
+    STATUS_CHOICES = (
+        ("PENDING", "Pending"),
+        ("RUNNING", "Running"),
+        ("SUCCEEDED", "Succeeded"),
+        ("FAILED", "Failed"),
+    )
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    idempotency_key = models.CharField(
+        max_length=255,
+        unique=True,
+        null=True,
+        blank=True
+    )
+
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default="PENDING"
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+
+    result = models.JSONField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Worker poll: next due PENDING job
+            models.Index(
+                fields=["status", "run_after"],
+                name="job_status_run_after_idx",
+            ),
+            # Admin job list
+            models.Index(
+                fields=["-created_at"],
+                name="job_created_idx",
+            ),
+        ]
+
+    @property
+    def is_finished(self):
+        return self.status in ("SUCCEEDED", "FAILED")
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+
+#tenant archive
+class ChurchArchive(models.Model):
+    """
+    Cold copy of a soft-deleted church's families, members and baptisms
+    (gzipped JSON Lines), written by registry.tenants.archive_church.
+    The hot rows are removed once is_complete is set.
+    """
+    church = models.OneToOneField(
+        Church,
+        on_delete=models.CASCADE,
+        related_name="archive"
+    )
+    data = models.BinaryField()
+    counts = models.JSONField(default=dict, blank=True)  # model label -> rows
+    user_links = models.JSONField(default=dict, blank=True)  # user id -> member id
+    is_complete = models.BooleanField(default=False)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Archive of {self.church.name}"
+
+
+#tenant purge
+class ChurchPurge(models.Model):
+    """
+    Progress of a chunked hard delete (registry.tenants.purge_church).
+    Keyed by the plain church id so it outlives the church row.
+    """
+    STATUS_CHOICES = (
+        ("RUNNING", "Running"),
+        ("DONE", "Done"),
+    )
+
+    church_id = models.PositiveBigIntegerField(unique=True)
+    church_name = models.CharField(max_length=200)
+
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default="RUNNING"
+    )
+    step = models.CharField(max_length=50, blank=True)
+    deleted = models.JSONField(default=dict, blank=True)  # model label -> rows
+    archive_path = models.CharField(max_length=500, blank=True)
+
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Purge {self.church_name} #{self.church_id} ({self.status})"
+
+
+#replication heartbeat
+class ReplicaHeartbeat(models.Model):
+    """
+    Single row rewritten on the primary by `manage.py replica_heartbeat`.
+    Reading it back from a replica gives that replica's lag
+    (see parish_management.db_routing).
+    """
+    beat_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Heartbeat {self.beat_at}"
@@ -0,0 +1,144 @@
+"""
+Birthday and baptism anniversary calendar (MemberCalendarAPIView).
+
+Matching dob by month and day across years cannot use an index, so
+Member keeps birth_month_day / baptism_month_day (MMDD as an integer,
+see models.month_day), set in Member.save() and indexed together with
+church. A date window becomes a range on that index:
+
+* 10 Mar - 16 Mar  ->  month_day BETWEEN 310 AND 316
+* 28 Dec - 3 Jan   ->  month_day >= 1228 OR month_day <= 103
+  (two intervals of the same range scan)
+
+29 Feb birthdays fall on 28 Feb in common years. Rows written without
+save() (queryset.update(), raw SQL) are brought up to date with
+`manage.py backfill_calendar_days`; the baptism importer and
+restore_church set both columns themselves.
+"""
+import calendar
+from datetime import date, timedelta
+
+from django.db.models import F, Q
+from django.db.models.functions import ExtractDay, ExtractMonth
+
+from .models import Member, month_day
+
+BACKFILL_BATCH_SIZE = 2000
+MAX_WINDOW_DAYS = 366
+
+# kind -> (indexed field, date field)
+OCCASIONS = {
+    "birthday": ("birth_month_day", "dob"),
+    "baptism": ("baptism_month_day", "date_of_baptism"),
+}
+
+
+# =====================================================
+# WINDOWS
+# =====================================================
+
+def default_window(today):
+    # "This week": today and the next six days
+    return today, today + timedelta(days=6)
+
+
+def month_day_filter(field, start, end):
+    """
+    Q matching month_day values that fall on any day from start to end.
+    """
+    if (end - start).days >= 365:
+        return Q(**{f"{field}__isnull": False})
+
+    low, high = month_day(start), month_day(end)
+
+    # 29 Feb is celebrated on 28 Feb when the year has none
+    if high == 228 and not calendar.isleap(end.year):
+        high = 229
+
+    if low <= high:
+        return Q(**{f"{field}__range": (low, high)})
+    return Q(**{f"{field}__gte": low}) | Q(**{f"{field}__lte": high})
+
+
+def next_occurrence(value, start):
+    """
+    First anniversary of `value` on or after `start`.
+    """
+    for year in (start.year, start.year + 1):
+        day = value.day
+        if value.month == 2 and day == 29 and not calendar.isleap(year):
+            day = 28
+        occurrence = date(year, value.month, day)
+        if occurrence >= start:
+            return occurrence
+    return None
+
+
+def upcoming_occasions(members, kind, start, end):
+    """
+    Living members whose birthday (or baptism anniversary) falls in
+    [start, end], ordered by date. One range scan on the church index.
+    """
+    field, date_field = OCCASIONS[kind]
+
+    rows = (
+        members
+        .filter(month_day_filter(field, start, end))
+        .filter(is_active=True, expired=False)
+        .values(
+            "id",
+            "name",
+            "mobile_no",
+            "family_id",
+            "is_family_head",
+            date_field,
+            family_name=F("family__family_name"),
+        )
+    )
+
+    occasions = []
+    for row in rows:
+        occurrence = next_occurrence(row[date_field], start)
+        if occurrence is None or occurrence > end:
+            continue
+        row["date"] = occurrence
+        # Age turned (birthday) or years since baptism. Not
+        # calculate_age(): 29 Feb falls on 28 Feb in common years,
+        # a day before it counts the year as complete
+        row["years"] = occurrence.year - row[date_field].year
+        occasions.append(row)
+
+    occasions.sort(key=lambda row: (row["date"], row["name"]))
+    return occasions
+
+
+# =====================================================
+# BACKFILL
+# =====================================================
+
+def _month_day_expression(field):
+    # NULL dates stay NULL
+    return ExtractMonth(field) * 100 + ExtractDay(field)
+
+
+def backfill_calendar_days(*, batch_size=BACKFILL_BATCH_SIZE):
+    """
+    Recompute birth_month_day / baptism_month_day with one UPDATE per
+    primary key range, so no statement locks the whole table. Returns
+    rows updated.
+    """
+    rows = Member._base_manager.order_by("pk").values_list("pk", flat=True)
+    first_pk, last_pk = rows.first(), rows.last()
+    if first_pk is None:
+        return 0
+
+    updated = 0
+    for low in range(first_pk, last_pk + 1, batch_size):
+        updated += Member._base_manager.filter(
+            pk__gte=low,
+            pk__lt=low + batch_size,
+        ).update(
+            birth_month_day=_month_day_expression("dob"),
+            baptism_month_day=_month_day_expression("date_of_baptism"),
+        )
+    return updated
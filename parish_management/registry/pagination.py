@@ -0,0 +1,33 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class BaptismCursorPagination(CursorPagination):
+    """
+    Keyset pagination over the baptism register.
+    Ordering matches baptism_church_created_idx so each page
+    is a single index range scan, no OFFSET.
+    """
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = ("-created_at", "-id")
+
+
+class OptionalPageNumberPagination(PageNumberPagination):
+    """
+    Page-number pagination for the registry CRUD lists, applied only
+    when the client sends ?page= or ?page_size=. Without them the
+    response stays the plain list existing clients expect.
+    """
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if (
+            self.page_query_param not in params
+            and self.page_size_query_param not in params
+        ):
+            return None
+        return super().paginate_queryset(queryset, request, view)
@@ -0,0 +1,125 @@
+"""
+Cached member profile projection (MemberProfileAPIView).
+
+The profile is the serialized member with its family, ward and church,
+plus, in household mode, the family's active members. It is cached per
+member and mode in MEMBER_PROFILE_CACHE as plain data, together with
+the versions of the member, family, ward and church it was built from:
+
+* a hit costs two cache reads (the entry, then its versions) and no
+  query;
+* a miss, or an entry whose versions moved on, is rebuilt with one
+  query (household mode joins the family's members in the same query).
+
+The versions are read after that query, since it is what finds the
+family, ward and church. They are timestamps of the commits, so one
+newer than the start of the rebuild is a change the query may have
+missed: the profile is then returned but not cached.
+
+Signals (registry.signals) bump a version once a change to a Member,
+Family, Ward or Church commits, which orphans every entry built from
+it (registry.versions); nothing is deleted key by key. A member change
+bumps its family too, since the family's household profiles list it.
+Versions live in the same cache, so a bump reaches only the workers
+sharing it. Entries also expire after MEMBER_PROFILE_CACHE_TIMEOUT,
+which bounds staleness from writes that skip signals (queryset.update(),
+bulk_create) and, with a per-process cache, from other workers' writes.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .models import Member
+from .serializers import MemberProfileSerializer, MobileFamilyMemberSerializer
+from .versions import bump_version, current_versions, version_key
+
+PROFILE_KEY = "registry:member_profile:{mode}:{member_id}"
+
+BASIC = "basic"
+HOUSEHOLD = "household"
+
+
+def _cache():
+    return caches[settings.MEMBER_PROFILE_CACHE]
+
+
+def bump_profile_version(scope, pk):
+    """
+    Orphan the cached profiles built from this member/family/ward/church.
+    """
+    if pk is not None:
+        bump_version(_cache(), version_key(scope, pk))
+
+
+# =====================================================
+# PROJECTION
+# =====================================================
+
+def _build(member_id, mode):
+    queryset = Member.objects.select_related("family__ward", "church")
+
+    if mode == HOUSEHOLD:
+        # The member and everyone in its family, in one query
+        rows = list(
+            queryset
+            .select_related("relationship")
+            .filter(family__members=member_id)
+            .order_by("-is_family_head", "name")
+        )
+        member = next((row for row in rows if row.pk == member_id), None)
+        if member is None:
+            raise Member.DoesNotExist
+    else:
+        member = queryset.get(pk=member_id)
+
+    data = dict(MemberProfileSerializer(member).data)
+
+    if mode == HOUSEHOLD:
+        data["household"] = MobileFamilyMemberSerializer(
+            [row for row in rows if row.is_active and not row.expired],
+            many=True
+        ).data
+
+    return member, data
+
+
+def _scope_keys(member):
+    return [
+        version_key("member", member.pk),
+        version_key("family", member.family_id),
+        version_key("ward", member.family.ward_id),
+        version_key("church", member.church_id),
+    ]
+
+
+def get_member_profile(member_id, *, household=False):
+    """
+    Profile payload for MemberProfileAPIView. Raises Member.DoesNotExist.
+    """
+    mode = HOUSEHOLD if household else BASIC
+    key = PROFILE_KEY.format(mode=mode, member_id=member_id)
+    cache = _cache()
+
+    entry = cache.get(key)
+    if entry is not None:
+        versions = current_versions(cache, entry["keys"])
+        if versions == entry["versions"]:
+            return entry["data"]
+
+    started = time.time_ns()
+    member, data = _build(member_id, mode)
+
+    # Versions never set count as unchanged since the build started
+    keys = _scope_keys(member)
+    versions = current_versions(cache, keys, stamp=started)
+    if any(version is None or version > started for version in versions):
+        # Bumped by a commit the query may not have seen
+        return data
+
+    cache.set(
+        key,
+        {"keys": keys, "versions": versions, "data": data},
+        settings.MEMBER_PROFILE_CACHE_TIMEOUT
+    )
+    return data
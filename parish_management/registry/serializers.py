@@ -1,12 +1,15 @@
 from rest_framework import serializers
 from .models import Baptism, Bill, Church, Grade, Relationship, UpgradeRequest, Ward, Family, Member
 from .services import can_add_member
+from .images import image_srcset
 from rest_framework import serializers
 from .models import Package
 from .models import ChurchSubscription, Package
 
 
 class ChurchListSerializer(serializers.ModelSerializer):
+    logo_srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = Church
         fields = [
@@ -18,8 +21,12 @@ class ChurchListSerializer(serializers.ModelSerializer):
             "phone_number",
             "is_active",
             "created_at",
+            "logo_srcset",
         ]
 
+    def get_logo_srcset(self, obj):
+        return image_srcset(obj.logo, obj.logo_variants, self.context.get("request"))
+
 class PackageSerializer(serializers.ModelSerializer):
     class Meta:
         model = Package
@@ -70,6 +77,8 @@ class WardSerializer(serializers.ModelSerializer):
 
 
 class FamilySerializer(serializers.ModelSerializer):
+    family_image_srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = Family
         fields =  [
@@ -80,9 +89,17 @@ class FamilySerializer(serializers.ModelSerializer):
             "history",
             "origin",
             "family_image",
+            "family_image_srcset",
         ]
         read_only_fields = ("church",)
 
+    def get_family_image_srcset(self, obj):
+        return image_srcset(
+            obj.family_image,
+            obj.family_image_variants,
+            self.context.get("request")
+        )
+
     def create(self, validated_data):
         validated_data["church"] = self.context["church"]
         return super().create(validated_data)
@@ -91,7 +108,8 @@ class FamilySerializer(serializers.ModelSerializer):
 class MemberSerializer(serializers.ModelSerializer):
     class Meta:
         model = Member
-        fields = "__all__"
+        # Calendar index columns, derived from dob / date_of_baptism
+        exclude = ("birth_month_day", "baptism_month_day")
         read_only_fields = ("church", "age")
 
     def validate(self, data):
@@ -419,17 +437,23 @@ class MobileFamilyListSerializer(serializers.ModelSerializer):
     member_count = serializers.IntegerField(read_only=True)
     head_name = serializers.SerializerMethodField()
     family_image = serializers.SerializerMethodField()
+    family_image_srcset = serializers.SerializerMethodField()
     class Meta:
         model = Family
         fields = [
             "id",
             "family_name",
             "family_image",
+            "family_image_srcset",
             "head_name",
             "member_count",
         ]
 
     def get_head_name(self, obj):
+        # Annotated by the mobile family list views
+        if hasattr(obj, "head_name"):
+            return obj.head_name
+
         head = obj.members.filter(
             is_family_head=True,
             is_active=True,
@@ -441,6 +465,13 @@ class MobileFamilyListSerializer(serializers.ModelSerializer):
         if obj.family_image and request:
             return request.build_absolute_uri(obj.family_image.url)
         return None
+
+    def get_family_image_srcset(self, obj):
+        return image_srcset(
+            obj.family_image,
+            obj.family_image_variants,
+            self.context.get("request")
+        )
     
 class MobileFamilyMemberSerializer(serializers.ModelSerializer):
     relationship_name = serializers.SerializerMethodField()
@@ -477,12 +508,73 @@ class MobileFamilyDetailSerializer(serializers.ModelSerializer):
         ]
 
     def get_members(self, obj):
-        members = obj.members.filter(
-            is_active=True,
-            expired=False
-        ).order_by("-is_family_head", "name")
+        # Prefetched by the mobile family detail views
+        members = getattr(obj, "active_members", None)
+        if members is None:
+            members = obj.members.filter(
+                is_active=True,
+                expired=False
+            ).select_related("relationship").order_by("-is_family_head", "name")
 
         return MobileFamilyMemberSerializer(
             members,
             many=True
         ).data
+
+
+#baptism register import
+class BaptismImportRowSerializer(serializers.ModelSerializer):
+    """
+    Field-level validation for one imported register entry.
+    FK links are plain ids here; they are resolved in bulk by
+    registry.imports so a row costs no queries to validate.
+    """
+    family = serializers.IntegerField(required=False, allow_null=True)
+    main_member = serializers.IntegerField(required=False, allow_null=True)
+    relation_with_main_member = serializers.IntegerField(
+        required=False,
+        allow_null=True
+    )
+
+    class Meta:
+        model = Baptism
+        fields = [
+            "baptism_category",
+            "date_of_baptism",
+            "register_number",
+            "place_of_birth",
+            "name",
+            "baptismal_name",
+            "gender",
+            "dob",
+            "address",
+            "parish_of_baptism",
+            "god_father",
+            "god_mother",
+            "father_name",
+            "mother_name",
+            "remarks",
+            "family",
+            "main_member",
+            "relation_with_main_member",
+        ]
+        extra_kwargs = {
+            # uniqueness is checked set-based for the whole batch
+            "register_number": {"validators": []},
+        }
+
+
+class BaptismImportSerializer(serializers.Serializer):
+    rows = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=5000
+    )
+
+
+class BaptismCertificateBatchSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=500
+    )
@@ -63,6 +63,32 @@ def get_capacity(subscription_or_package, custom_capacity=None) -> Decimal:
     return Decimal(subscription_or_package.package.member_limit)
 
 
+def get_subscription_mrr(subscription) -> Decimal:
+    """
+    Monthly recurring value of a subscription at its current terms.
+    Rates are per member per month for both cycles, so MRR is
+    rate × capacity; the rate follows pricing_origin like
+    calculate_prorated_upgrade_amount does.
+    """
+    package = subscription.package
+
+    if package.is_trial or subscription.billing_cycle not in (MONTHLY, YEARLY):
+        return Decimal("0.00")
+
+    if package.is_custom and not subscription.custom_capacity:
+        return Decimal("0.00")
+
+    rate = get_rate(
+        package,
+        subscription.billing_cycle,
+        upgrade=subscription.pricing_origin == "UPGRADE",
+    )
+    if rate is None:
+        return Decimal("0.00")
+
+    return (rate * get_capacity(subscription)).quantize(Decimal("0.01"))
+
+
 # =====================================================
 # NEW / RENEW BILL
 # =====================================================
@@ -0,0 +1,72 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .certificates import invalidate_certificate_cache
+from .images import schedule_image_processing
+from .models import Baptism, Church, Family, Grade, Member, Ward
+from .profiles import bump_profile_version
+from .statistics import bump_grade_version, bump_stats_version
+
+
+@receiver(post_save, sender=Baptism)
+@receiver(post_delete, sender=Baptism)
+def drop_baptism_certificate(sender, instance, **kwargs):
+    invalidate_certificate_cache(instance.pk)
+
+
+def _image_saved(field, update_fields):
+    if not field:
+        return False
+    return update_fields is None or field.field.name in update_fields
+
+
+@receiver(post_save, sender=Family)
+def process_family_image(sender, instance, update_fields=None, **kwargs):
+    if _image_saved(instance.family_image, update_fields):
+        schedule_image_processing(instance.family_image.name)
+
+
+@receiver(post_save, sender=Church)
+def process_church_logo(sender, instance, update_fields=None, **kwargs):
+    if _image_saved(instance.logo, update_fields):
+        schedule_image_processing(instance.logo.name)
+
+
+@receiver(post_save, sender=Member)
+@receiver(post_delete, sender=Member)
+def drop_member_profile(sender, instance, **kwargs):
+    bump_profile_version("member", instance.pk)
+    bump_profile_version("family", instance.family_id)
+
+    # Moved to another family (set in Member.save)
+    previous_family_id = getattr(instance, "_previous_family_id", None)
+    if previous_family_id != instance.family_id:
+        bump_profile_version("family", previous_family_id)
+
+    bump_stats_version(instance.church_id)
+
+
+@receiver(post_save, sender=Family)
+@receiver(post_delete, sender=Family)
+def drop_family_profiles(sender, instance, **kwargs):
+    bump_profile_version("family", instance.pk)
+    bump_stats_version(instance.church_id)
+
+
+@receiver(post_save, sender=Ward)
+@receiver(post_delete, sender=Ward)
+def drop_ward_profiles(sender, instance, **kwargs):
+    bump_profile_version("ward", instance.pk)
+    bump_stats_version(instance.church_id)
+
+
+@receiver(post_save, sender=Church)
+@receiver(post_delete, sender=Church)
+def drop_church_profiles(sender, instance, **kwargs):
+    bump_profile_version("church", instance.pk)
+
+
+@receiver(post_save, sender=Grade)
+@receiver(post_delete, sender=Grade)
+def drop_grade_statistics(sender, **kwargs):
+    bump_grade_version()
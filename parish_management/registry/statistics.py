@@ -0,0 +1,201 @@
+"""
+Parish statistics for church reports (ChurchStatisticsAPIView).
+
+Counts of a church's living, active members by gender, age band,
+marital status, blood group, grade and ward, in two queries:
+
+1. one aggregate with conditional counts (COUNT ... FILTER / CASE) for
+   the dimensions with fixed values: gender, marital status and age
+   bands. Bands compare dob with today's cut-off dates, so they do not
+   depend on the stored age (only refreshed when a member is saved);
+2. one GROUP BY over (blood group, grade, ward); the per-dimension
+   totals are summed from its rows in Python.
+
+The result is cached in PARISH_STATS_CACHE per church and day, and
+reused while the church's registry version (bumped by signals on any
+Member, Family or Ward change of the church) and the grade version are
+unchanged; see registry.versions. Versions only reach the workers that
+share the cache, so PARISH_STATS_CACHE_TIMEOUT bounds how long another
+worker's change can go unseen with a per-process cache.
+"""
+from collections import Counter
+
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Member
+from .versions import bump_version, current_versions, version_key
+
+STATS_KEY = "registry:parish_stats:{church_id}:{day}"
+
+# (label, minimum age, maximum age); None = open ended
+AGE_BANDS = (
+    ("0-12", 0, 12),
+    ("13-17", 13, 17),
+    ("18-25", 18, 25),
+    ("26-40", 26, 40),
+    ("41-60", 41, 60),
+    ("61-75", 61, 75),
+    ("76+", 76, None),
+)
+
+
+def _cache():
+    return caches[settings.PARISH_STATS_CACHE]
+
+
+def bump_stats_version(church_id):
+    """
+    Orphan the cached statistics of this church.
+    """
+    if church_id is not None:
+        bump_version(_cache(), version_key("registry", church_id))
+
+
+def bump_grade_version():
+    # Grade names are shared by every church
+    bump_version(_cache(), version_key("grades", "all"))
+
+
+def _choices(field_name):
+    return [value for value, _ in Member._meta.get_field(field_name).choices]
+
+
+def _age_band_filter(today, minimum, maximum):
+    # age >= minimum  <=>  born on or before today - minimum years
+    condition = Q(dob__lte=today - relativedelta(years=minimum))
+    if maximum is not None:
+        condition &= Q(dob__gt=today - relativedelta(years=maximum + 1))
+    return condition
+
+
+# =====================================================
+# QUERIES
+# =====================================================
+
+def _fixed_counts(members, living, today):
+    # Aliases are prefixed, so none can clash with a field name
+    aggregates = {
+        "status:total": Count("pk", filter=living),
+        "status:expired": Count("pk", filter=Q(expired=True)),
+        "status:inactive": Count("pk", filter=Q(is_active=False, expired=False)),
+    }
+    for value in _choices("gender"):
+        aggregates[f"gender:{value}"] = Count(
+            "pk", filter=living & Q(gender=value)
+        )
+    for value in _choices("marital_status"):
+        aggregates[f"marital_status:{value}"] = Count(
+            "pk", filter=living & Q(marital_status=value)
+        )
+    for label, minimum, maximum in AGE_BANDS:
+        aggregates[f"age:{label}"] = Count(
+            "pk", filter=living & _age_band_filter(today, minimum, maximum)
+        )
+
+    return members.aggregate(**aggregates)
+
+
+def _grouped_counts(members, living):
+    rows = (
+        members
+        .filter(living)
+        .values(
+            "blood_group",
+            "grade_id",
+            "grade__name",
+            "family__ward_id",
+            "family__ward__ward_name",
+            "family__ward__ward_number",
+        )
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+
+    blood_groups = Counter()
+    grades = Counter()
+    wards = Counter()
+    for row in rows:
+        blood_groups[row["blood_group"] or None] += row["count"]
+        grades[(row["grade_id"], row["grade__name"])] += row["count"]
+        wards[(
+            row["family__ward_id"],
+            row["family__ward__ward_name"],
+            row["family__ward__ward_number"],
+        )] += row["count"]
+
+    return {
+        "blood_group": [
+            {"blood_group": value, "count": count}
+            for value, count in sorted(
+                blood_groups.items(), key=lambda item: (item[0] is None, item[0] or "")
+            )
+        ],
+        "grade": [
+            {"id": pk, "name": name, "count": count}
+            for (pk, name), count in sorted(
+                grades.items(), key=lambda item: (item[0][0] is None, item[0][1] or "")
+            )
+        ],
+        "ward": [
+            {"id": pk, "ward_name": name, "ward_number": number, "count": count}
+            for (pk, name, number), count in sorted(
+                wards.items(), key=lambda item: (item[0][2], item[0][1])
+            )
+        ],
+    }
+
+
+def compute_parish_statistics(church):
+    today = timezone.localdate()
+    members = Member.objects.for_church(church)
+    living = Q(is_active=True, expired=False)
+
+    fixed = _fixed_counts(members, living, today)
+
+    def pick(prefix):
+        return {
+            key.split(":", 1)[1]: value
+            for key, value in fixed.items()
+            if key.startswith(prefix + ":")
+        }
+
+    return {
+        "as_of": today.isoformat(),
+        **pick("status"),
+        "gender": pick("gender"),
+        "marital_status": pick("marital_status"),
+        "age_bands": [
+            {"band": label, "count": count}
+            for label, count in pick("age").items()
+        ],
+        **_grouped_counts(members, living),
+    }
+
+
+def get_parish_statistics(church):
+    """
+    Cached compute_parish_statistics(): a hit costs two cache reads.
+    """
+    cache = _cache()
+    key = STATS_KEY.format(church_id=church.pk, day=timezone.localdate())
+    keys = [version_key("registry", church.pk), version_key("grades", "all")]
+
+    # Read before computing, so a change committed meanwhile is not
+    # stamped onto the old counts
+    versions = current_versions(cache, keys)
+
+    entry = cache.get(key)
+    if entry is not None and entry["versions"] == versions:
+        return entry["data"]
+
+    data = compute_parish_statistics(church)
+    cache.set(
+        key,
+        {"versions": versions, "data": data},
+        settings.PARISH_STATS_CACHE_TIMEOUT
+    )
+    return data
@@ -0,0 +1,386 @@
+import gzip
+import io
+import os
+from datetime import timedelta
+from itertools import groupby
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import serializers
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .jobs import heartbeat
+from .models import (
+    Baptism,
+    Bill,
+    Church,
+    ChurchArchive,
+    ChurchPurge,
+    ChurchSubscription,
+    Family,
+    Member,
+    UpgradeRequest,
+    Ward,
+    month_day,
+)
+
+User = get_user_model()
+
+PURGE_BATCH_SIZE = 500
+EXPORT_CHUNK_SIZE = 2000
+RESTORE_BATCH_SIZE = 1000
+
+# Moved to ChurchArchive, parents first
+ARCHIVED_MODELS = (Family, Member, Baptism)
+
+
+def _church_user_fields():
+    # Never copy password hashes into an archive
+    return [
+        f.name for f in User._meta.concrete_fields
+        if f.name not in ("id", "password")
+    ]
+
+
+def snapshot_querysets(church_id):
+    """
+    Every row that belongs to a church, parents before children,
+    as (queryset, fields) pairs. fields=None means all fields.
+    """
+    return (
+        (Church.all_objects.filter(pk=church_id), None),
+        (ChurchSubscription.objects.filter(church_id=church_id), None),
+        (Bill.objects.filter(church_id=church_id), None),
+        (UpgradeRequest.objects.filter(church_id=church_id), None),
+        (Ward.objects.filter(church_id=church_id), None),
+        (Family.objects.filter(church_id=church_id), None),
+        (Member.objects.filter(church_id=church_id), None),
+        (Baptism.objects.filter(church_id=church_id), None),
+        (User.objects.filter(church_id=church_id), _church_user_fields()),
+    )
+
+
+# Children before parents, so no batch trips over a PROTECT FK
+# (Baptism -> Family/Member) or fans out into SET_NULL updates
+# (User.member -> Member).
+PURGE_STEPS = (
+    ("baptisms", Baptism),
+    ("users", User),
+    ("members", Member),
+    ("families", Family),
+    ("wards", Ward),
+    ("bills", Bill),
+    ("upgrade_requests", UpgradeRequest),
+    ("subscription", ChurchSubscription),
+)
+
+
+# =====================================================
+# SNAPSHOT
+# =====================================================
+
+def export_church_snapshot(church, directory=None):
+    """
+    Write every row of a church as gzipped JSON Lines (Django's "jsonl"
+    serializer, loadable with `manage.py loaddata`) and return the path.
+    Written to a temp name first, so a partial file is never recorded.
+    """
+    directory = Path(directory or settings.TENANT_ARCHIVE_ROOT)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    stamp = timezone.now().strftime("%Y%m%d%H%M%S")
+    path = directory / f"church-{church.pk}-{stamp}.jsonl.gz"
+    partial = path.with_name(path.name + ".part")
+
+    serializer = serializers.get_serializer("jsonl")()
+
+    with gzip.open(partial, "wt", encoding="utf-8") as stream:
+        for queryset, fields in snapshot_querysets(church.pk):
+            serializer.serialize(
+                queryset.order_by("pk").iterator(chunk_size=EXPORT_CHUNK_SIZE),
+                stream=stream,
+                fields=fields,
+            )
+
+        # Rows already moved out of the hot tables
+        archive = ChurchArchive.objects.filter(church_id=church.pk).first()
+        if archive is not None:
+            stream.write(gzip.decompress(archive.data).decode("utf-8"))
+
+    os.replace(partial, path)
+    return str(path)
+
+
+# =====================================================
+# PURGE
+# =====================================================
+
+def _delete_in_batches(purge, step, model, church_id, batch_size):
+    queryset = model.objects.filter(church_id=church_id).order_by("pk")
+
+    while True:
+        with transaction.atomic():
+            pks = list(queryset.values_list("pk", flat=True)[:batch_size])
+            if not pks:
+                return
+            _, counts = model.objects.filter(pk__in=pks).delete()
+
+        for label, count in counts.items():
+            purge.deleted[label] = purge.deleted.get(label, 0) + count
+        purge.step = step
+        purge.save(update_fields=["deleted", "step", "updated_at"])
+        heartbeat()
+
+
+def purge_church(church_id, *, batch_size=PURGE_BATCH_SIZE):
+    """
+    Hard delete a soft-deleted church without one giant cascade.
+
+    A snapshot is exported first. Dependents are then deleted in FK
+    order, batch_size rows per transaction, and a ChurchPurge row records
+    progress. Every step just deletes whatever is left for the church, so
+    running it again after an interruption resumes where it stopped
+    (the snapshot is not re-exported).
+    """
+    church = Church.all_objects.filter(pk=church_id).first()
+    purge = ChurchPurge.objects.filter(church_id=church_id).first()
+
+    if purge is None:
+        if church is None:
+            raise Church.DoesNotExist(f"Church {church_id} does not exist.")
+        if not church.is_deleted:
+            raise ValueError("Only soft-deleted churches can be purged.")
+        purge = ChurchPurge.objects.create(
+            church_id=church_id,
+            church_name=church.name
+        )
+
+    if purge.status == "DONE":
+        return purge
+
+    if not purge.archive_path and church is not None:
+        purge.step = "archive"
+        purge.archive_path = export_church_snapshot(church)
+        purge.save(update_fields=["step", "archive_path", "updated_at"])
+
+    for step, model in PURGE_STEPS:
+        _delete_in_batches(purge, step, model, church_id, batch_size)
+
+    with transaction.atomic():
+        _, counts = Church.all_objects.filter(pk=church_id).delete()
+
+    for label, count in counts.items():
+        purge.deleted[label] = purge.deleted.get(label, 0) + count
+    purge.step = ""
+    purge.status = "DONE"
+    purge.finished_at = timezone.now()
+    purge.save(update_fields=[
+        "deleted", "step", "status", "finished_at", "updated_at"
+    ])
+    return purge
+
+
+# =====================================================
+# ARCHIVE / RESTORE
+# =====================================================
+
+def _dump_archived_rows(church_id):
+    serializer = serializers.get_serializer("jsonl")()
+    counts = {}
+    buffer = io.BytesIO()
+
+    with gzip.GzipFile(fileobj=buffer, mode="wb") as raw:
+        stream = io.TextIOWrapper(raw, encoding="utf-8")
+        for model in ARCHIVED_MODELS:
+            queryset = model.objects.filter(church_id=church_id).order_by("pk")
+            counts[model._meta.label] = queryset.count()
+            serializer.serialize(
+                queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE),
+                stream=stream,
+            )
+        stream.flush()
+        stream.detach()
+
+    return buffer.getvalue(), counts
+
+
+def _load_archived_rows(archive):
+    """
+    DeserializedObjects from an archive, in dump order.
+    """
+    stream = io.TextIOWrapper(
+        gzip.GzipFile(fileobj=io.BytesIO(bytes(archive.data))),
+        encoding="utf-8"
+    )
+    return serializers.deserialize("jsonl", stream)
+
+
+def archive_church(church_id, *, batch_size=PURGE_BATCH_SIZE):
+    """
+    Move a soft-deleted church's families, members and baptisms into a
+    compressed ChurchArchive row, then delete the hot rows in batches.
+    Re-running an interrupted archive only finishes the deletes. A
+    concurrent restore wins: deletes stop once the archive row is gone.
+    """
+    with transaction.atomic():
+        church = Church.all_objects.select_for_update().get(pk=church_id)
+        archive = ChurchArchive.objects.filter(church=church).first()
+
+        if archive is None:
+            if not church.is_deleted:
+                raise ValueError("Only soft-deleted churches can be archived.")
+
+            data, counts = _dump_archived_rows(church_id)
+            archive = ChurchArchive.objects.create(
+                church=church,
+                data=data,
+                counts=counts,
+                user_links={
+                    str(user_id): member_id
+                    for user_id, member_id in User.objects.filter(
+                        church_id=church_id,
+                        member__isnull=False
+                    ).values_list("pk", "member_id")
+                },
+            )
+
+    if archive.is_complete:
+        return archive
+
+    archived_pks = {
+        model: [obj.object.pk for obj in objects]
+        for model, objects in groupby(
+            _load_archived_rows(archive),
+            key=lambda obj: type(obj.object)
+        )
+    }
+
+    # Family-head logins stay; their member link comes back on restore
+    User.objects.filter(pk__in=archive.user_links).update(member=None)
+
+    for model in reversed(ARCHIVED_MODELS):
+        pks = archived_pks.get(model, [])
+
+        for start in range(0, len(pks), batch_size):
+            with transaction.atomic():
+                if not ChurchArchive.objects.select_for_update().filter(
+                    pk=archive.pk
+                ).exists():
+                    return None
+                model.objects.filter(
+                    church_id=church_id,
+                    pk__in=pks[start:start + batch_size]
+                ).delete()
+            heartbeat()
+
+    archive.is_complete = True
+    archive.save(update_fields=["is_complete"])
+    return archive
+
+
+def archive_deleted_churches(*, older_than_days=None, batch_size=PURGE_BATCH_SIZE):
+    """
+    Archive every church soft-deleted longer than the retention period,
+    plus any archive left unfinished. Returns the archives processed.
+    """
+    if older_than_days is None:
+        older_than_days = settings.TENANT_ARCHIVE_AFTER_DAYS
+
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+
+    church_ids = (
+        Church.all_objects
+        .filter(is_deleted=True, deleted_at__lt=cutoff)
+        .exclude(archive__is_complete=True)
+        .exclude(Exists(ChurchPurge.objects.filter(church_id=OuterRef("pk"))))
+        .order_by("deleted_at")
+        .values_list("pk", flat=True)
+    )
+
+    archives = []
+    for church_id in list(church_ids):
+        archive = archive_church(church_id, batch_size=batch_size)
+        if archive is not None:
+            archives.append(archive)
+    return archives
+
+
+def _insert_missing(model, objects):
+    existing = set(
+        model.objects
+        .filter(pk__in=[obj.pk for obj in objects])
+        .values_list("pk", flat=True)
+    )
+    missing = [obj for obj in objects if obj.pk not in existing]
+
+    if model is Member:
+        # bulk_create skips save(); archives written before the calendar
+        # columns existed carry no value for them
+        for member in missing:
+            member.birth_month_day = month_day(member.dob)
+            member.baptism_month_day = month_day(member.date_of_baptism)
+
+    model.objects.bulk_create(missing)
+    return len(missing)
+
+
+def restore_church(church_id, *, batch_size=RESTORE_BATCH_SIZE):
+    """
+    Undo a soft delete. If the church was archived, its families, members
+    and baptisms are bulk-inserted back with their original ids (rows
+    still present from an unfinished archive are skipped) and
+    family-head logins are re-linked, all in one transaction.
+    Returns rows restored per model label.
+    """
+    restored = {}
+
+    with transaction.atomic():
+        church = Church.all_objects.select_for_update().get(pk=church_id)
+        archive = (
+            ChurchArchive.objects
+            .select_for_update()
+            .filter(church=church)
+            .first()
+        )
+
+        if archive is not None:
+            batch = []
+            for obj in _load_archived_rows(archive):
+                if batch and (
+                    len(batch) >= batch_size
+                    or type(obj.object) is not type(batch[0])
+                ):
+                    model = type(batch[0])
+                    restored[model._meta.label] = (
+                        restored.get(model._meta.label, 0)
+                        + _insert_missing(model, batch)
+                    )
+                    batch = []
+                batch.append(obj.object)
+
+            if batch:
+                model = type(batch[0])
+                restored[model._meta.label] = (
+                    restored.get(model._meta.label, 0)
+                    + _insert_missing(model, batch)
+                )
+
+            users = list(User.objects.filter(
+                pk__in=archive.user_links,
+                member__isnull=True
+            ))
+            for user in users:
+                user.member_id = archive.user_links[str(user.pk)]
+            User.objects.bulk_update(users, ["member"], batch_size=batch_size)
+
+            archive.delete()
+
+        church.is_deleted = False
+        church.deleted_at = None
+        church.is_active = False  # stays inactive until admin decides
+        church.save(update_fields=["is_deleted", "deleted_at", "is_active"])
+
+    return restored
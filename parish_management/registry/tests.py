@@ -1,3 +1,87 @@
+from datetime import date
+
 from django.test import TestCase
 
-# Create your tests here.
+from .models import Church, Family, Member, Ward
+from .occasions import month_day_filter, next_occurrence, upcoming_occasions
+
+
+class CalendarWindowTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.church = Church.objects.create(
+            name="St Mary's",
+            email="stmarys@example.com",
+            address="Main Road",
+            city="Kottayam",
+            vicar="Fr. Thomas",
+            diocese_name="Kottayam",
+            phone_number="9000000000",
+        )
+        ward = Ward.objects.create(
+            church=cls.church, ward_name="North", ward_number=1, place="North"
+        )
+        cls.family = Family.objects.create(
+            church=cls.church, ward=ward, family_name="Kurian"
+        )
+
+    def add_member(self, name, dob):
+        return Member.objects.create(
+            church=self.church,
+            family=self.family,
+            name=name,
+            gender="MALE",
+            dob=dob,
+            mobile_no="9000000001",
+        )
+
+    def birthdays(self, start, end):
+        members = Member.objects.filter(church=self.church)
+        return [
+            (row["name"], row["date"], row["years"])
+            for row in upcoming_occasions(members, "birthday", start, end)
+        ]
+
+    def test_leap_day_birthday_in_common_year(self):
+        self.add_member("Leap", date(2000, 2, 29))
+
+        self.assertEqual(
+            self.birthdays(date(2027, 2, 25), date(2027, 3, 2)),
+            [("Leap", date(2027, 2, 28), 27)],
+        )
+
+    def test_leap_day_birthday_in_leap_year(self):
+        self.add_member("Leap", date(2000, 2, 29))
+
+        self.assertEqual(
+            self.birthdays(date(2028, 2, 25), date(2028, 3, 2)),
+            [("Leap", date(2028, 2, 29), 28)],
+        )
+        # Not on the 28th when the year has a 29th
+        self.assertEqual(self.birthdays(date(2028, 2, 27), date(2028, 2, 28)), [])
+
+    def test_window_across_new_year(self):
+        self.add_member("December", date(1990, 12, 30))
+        self.add_member("January", date(1995, 1, 2))
+        self.add_member("Outside", date(1990, 1, 10))
+
+        self.assertEqual(
+            self.birthdays(date(2026, 12, 28), date(2027, 1, 3)),
+            [
+                ("December", date(2026, 12, 30), 36),
+                ("January", date(2027, 1, 2), 32),
+            ],
+        )
+
+    def test_month_day_filter_wraps(self):
+        self.assertEqual(
+            str(month_day_filter("birth_month_day", date(2026, 12, 28), date(2027, 1, 3))),
+            "(OR: ('birth_month_day__gte', 1228), ('birth_month_day__lte', 103))",
+        )
+
+    def test_next_occurrence_rolls_into_next_year(self):
+        self.assertEqual(
+            next_occurrence(date(1990, 1, 2), date(2026, 12, 28)),
+            date(2027, 1, 2),
+        )
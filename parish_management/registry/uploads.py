@@ -0,0 +1,82 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadhandler import FileUploadHandler
+from django.http.multipartparser import MultiPartParserError
+from django.template.defaultfilters import filesizeformat
+from PIL import Image
+
+
+class UploadTooLarge(MultiPartParserError):
+    """
+    Raised while the body is still streaming in.
+    Django and DRF both answer MultiPartParserError with a 400.
+    """
+
+
+class MaxSizeUploadHandler(FileUploadHandler):
+    """
+    First handler in FILE_UPLOAD_HANDLERS. Counts the bytes of each
+    uploaded file and aborts the request as soon as one passes
+    IMAGE_UPLOAD_MAX_SIZE, before the rest is read. Chunks are passed
+    on untouched to the memory / temp-file handlers.
+    """
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        # Whole body already over the limit: refuse before reading it.
+        # Allow some room for the other form fields.
+        if content_length and content_length > settings.IMAGE_UPLOAD_MAX_SIZE + 64 * 1024:
+            raise UploadTooLarge(self._message())
+        return None
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > settings.IMAGE_UPLOAD_MAX_SIZE:
+            raise UploadTooLarge(self._message())
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
+
+    def _message(self):
+        return (
+            f"Uploaded file is too large. "
+            f"Maximum size is {filesizeformat(settings.IMAGE_UPLOAD_MAX_SIZE)}."
+        )
+
+
+def validate_image_upload(file):
+    """
+    Size and pixel-count limits for ImageField uploads.
+    Reads only the image header, never the pixel data.
+    """
+    if getattr(file, "_committed", False):
+        # A stored FieldFile (a form re-validating an unchanged
+        # image): checked when it was uploaded, and storage is not
+        # touched. New uploads (UploadedFile, or a FieldFile wrapping
+        # one) are not committed yet.
+        return
+
+    if file.size > settings.IMAGE_UPLOAD_MAX_SIZE:
+        raise ValidationError(
+            f"Image is too large. "
+            f"Maximum size is {filesizeformat(settings.IMAGE_UPLOAD_MAX_SIZE)}."
+        )
+
+    try:
+        file.seek(0)
+        with Image.open(file) as image:
+            width, height = image.size
+    except OSError:
+        # Not an image: ImageField reports that itself
+        return
+    finally:
+        file.seek(0)
+
+    if width * height > settings.IMAGE_UPLOAD_MAX_PIXELS:
+        raise ValidationError(
+            f"Image resolution {width}×{height} is too large."
+        )
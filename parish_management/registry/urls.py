@@ -1,13 +1,21 @@
+from django.conf import settings
 from django.urls import path
+from . import async_views
 from .views import (
     BaptismAPIView,
     BaptismCertificateAPIView,
+    BaptismCertificateBatchAPIView,
+    BaptismCertificatePDFAPIView,
     BaptismDetailAPIView,
+    BaptismImportAPIView,
+    BaptismYearlySummaryAPIView,
     ChurchBillDetailAPIView,
     ChurchBillListAPIView,
     ChurchDashboardAPIView,
+    ChurchStatisticsAPIView,
     FamilyDetailMobileAPIView,
     FamilyMembersAPIView,
+    MemberCalendarAPIView,
     MemberProfileAPIView,
     PackageListAPIView,
     RelationshipListCreateAPIView,
@@ -26,13 +34,20 @@ from .views import (
     RelationshipdetailView,GradeListCreateview,GradeDetailview,WardListWithFamilyCountAPIView,WardFamiliesMobileAPIView
 )
 
+
+def _mobile(sync_view, async_view):
+    # Mobile read endpoints: event-loop variants for ASGI deployments
+    view = async_view if settings.ASYNC_MOBILE_VIEWS else sync_view
+    return view.as_view()
+
+
 urlpatterns = [
     # Wards
     path("wards/", WardListCreateAPIView.as_view()),
     path("wards/<int:pk>/", WardDetailAPIView.as_view()),
-    path("mobile/wards/", WardListWithFamilyCountAPIView.as_view()),
-    path("mobile/<ward_id>/families/", WardFamiliesMobileAPIView.as_view()),
-    path("mobile/families/<int:family_id>/",FamilyDetailMobileAPIView.as_view(),name="mobile-family-detail"),
+    path("mobile/wards/", _mobile(WardListWithFamilyCountAPIView, async_views.AsyncWardListWithFamilyCountAPIView)),
+    path("mobile/<ward_id>/families/", _mobile(WardFamiliesMobileAPIView, async_views.AsyncWardFamiliesMobileAPIView)),
+    path("mobile/families/<int:family_id>/",_mobile(FamilyDetailMobileAPIView, async_views.AsyncFamilyDetailMobileAPIView),name="mobile-family-detail"),
 
     #Grade
     path("grade/",GradeListCreateview.as_view(),name='grade_create'),
@@ -48,7 +63,8 @@ urlpatterns = [
     # Members
     path("members/", MemberListCreateAPIView.as_view()),
     path("members/<int:pk>/", MemberDetailAPIView.as_view()),
-    path("member/profile/", MemberProfileAPIView.as_view()),
+    path("member/profile/", _mobile(MemberProfileAPIView, async_views.AsyncMemberProfileAPIView)),
+    path("members/calendar/", MemberCalendarAPIView.as_view(), name="member-calendar"),
     #member list by families
     path("families/<int:family_id>/members/",FamilyMembersAPIView.as_view(),name="family-members"),
 
@@ -57,6 +73,7 @@ urlpatterns = [
     path("church/subscribe/", SubscribeAPIView.as_view()),
     path("church/upgrade/", UpgradeAPIView.as_view()),
     path("church/dashboard/", ChurchDashboardAPIView.as_view()),
+    path("church/statistics/", ChurchStatisticsAPIView.as_view(), name="church-statistics"),
 
     path('churches/',ChurchList.as_view()),
     path("bills/",ChurchBillListAPIView.as_view(),name="church-bill-list"),
@@ -68,6 +85,10 @@ urlpatterns = [
 
     #baptism
     path("baptisms/",BaptismAPIView.as_view(),name="baptism-list-create"),
+    path("baptisms/import/",BaptismImportAPIView.as_view(),name="baptism-import"),
+    path("baptisms/summary/",BaptismYearlySummaryAPIView.as_view(),name="baptism-yearly-summary"),
     path("baptisms/<int:pk>/",BaptismDetailAPIView.as_view(),name="baptism-detail"),
     path("baptisms/<int:pk>/certificate/",BaptismCertificateAPIView.as_view(),name="baptism-certificate"),
+    path("baptisms/<int:pk>/certificate/pdf/",BaptismCertificatePDFAPIView.as_view(),name="baptism-certificate-pdf"),
+    path("baptisms/certificates/batch/",BaptismCertificateBatchAPIView.as_view(),name="baptism-certificate-batch"),
 ]
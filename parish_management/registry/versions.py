@@ -0,0 +1,45 @@
+"""
+Cache versions for derived registry data (member profiles, parish
+statistics).
+
+A cached entry records the versions of the rows it was built from and
+is reused only while they are unchanged; a write bumps a version and
+every dependent entry is orphaned at once. Versions are timestamps
+rather than counters, so a version evicted from the cache never comes
+back with an old value.
+"""
+import time
+
+from django.db import transaction
+
+VERSION_KEY = "registry:version:{scope}:{pk}"
+
+
+def version_key(scope, pk):
+    return VERSION_KEY.format(scope=scope, pk=pk)
+
+
+def current_versions(cache, keys, *, stamp=None):
+    """
+    Versions for `keys`, in order; missing ones are started at `stamp`
+    (default now).
+    """
+    versions = cache.get_many(keys)
+
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        stamp = stamp or time.time_ns()
+        for key in missing:
+            # add(): a concurrent reader may have just set one
+            cache.add(key, stamp, None)
+        versions.update(cache.get_many(missing))
+
+    return [versions.get(key) for key in keys]
+
+
+def bump_version(cache, key):
+    """
+    Orphan the entries built from `key` once the current transaction
+    commits (at once outside one).
+    """
+    transaction.on_commit(lambda: cache.set(key, time.time_ns(), None))
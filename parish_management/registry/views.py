@@ -8,18 +8,72 @@ from rest_framework.permissions import IsAuthenticated
 from accounts.permissions import IsChurchAuthenticated,IsChurchUser, IsMemberUser
 from registry.services import calculate_new_bill_amount, calculate_prorated_upgrade_amount, get_next_subscription_action
 from .models import Baptism, Bill, Church, Grade, Relationship, UpgradeRequest, Ward, Family, Member,Package
-from .serializers import BaptismSerializer, BillDetailSerializer, BillListSerializer, ChurchListSerializer, FamilyMemberSerializer, GradeSerializer, MemberProfileSerializer, MobileFamilyDetailSerializer, MobileFamilyListSerializer, RelationshipSerializer, SubscriptionExpirySerializer, UpgradeSerializer, WardSerializer, FamilySerializer, MemberSerializer,PackageSerializer, WardWithFamilyCountSerializer
+from .serializers import BaptismSerializer, BillDetailSerializer, BillListSerializer, ChurchListSerializer, FamilyMemberSerializer, GradeSerializer, MobileFamilyDetailSerializer, MobileFamilyListSerializer, RelationshipSerializer, SubscriptionExpirySerializer, UpgradeSerializer, WardSerializer, FamilySerializer, MemberSerializer,PackageSerializer, WardWithFamilyCountSerializer
 from rest_framework.generics import ListAPIView
 from .models import ChurchSubscription
 from .serializers import SubscribeSerializer,UpgradeRequestSerializer
+from .serializers import BaptismCertificateBatchSerializer, BaptismImportSerializer
 from rest_framework.views import APIView
 from django.db import transaction
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
-from django.db.models import Count,Sum
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import ExtractYear
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from .filters import ExactFieldFilterBackend, filter_baptisms
+from rest_framework.filters import OrderingFilter, SearchFilter
+from .imports import import_baptisms
+from .profiles import get_member_profile
+from .statistics import get_parish_statistics
+from .occasions import MAX_WINDOW_DAYS, OCCASIONS, default_window, upcoming_occasions
+from .certificates import (
+    build_baptism_certificate_data,
+    build_certificate_zip,
+    certificate_queryset,
+    get_certificate_pdf,
+)
+from django.http import FileResponse
+import tempfile
+from .pagination import BaptismCursorPagination, OptionalPageNumberPagination
+from .managers import ChurchScopedQuerySet
 
 class ChurchContextMixin:
+    """
+    Base for the church-scoped registry CRUD views.
+
+    Views declare `model` and, as needed, `select_related`,
+    `prefetch_related`, `ordering`, `filter_fields`, `search_fields`
+    and `ordering_fields`. Whether the model is tenant data and which
+    model fields back `filter_fields` are resolved once, when the view
+    class is defined, not per request.
+    """
+    model = None
+    select_related = ()
+    prefetch_related = ()
+    ordering = ("id",)
+    filter_fields = ()
+
+    filter_backends = [ExactFieldFilterBackend, SearchFilter, OrderingFilter]
+    pagination_class = OptionalPageNumberPagination
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.model is None:
+            return
+
+        # Tenant models carry ChurchScopedQuerySet;
+        # global models (Grade/Relationship) are not scoped
+        cls.church_scoped = issubclass(
+            cls.model._default_manager._queryset_class,
+            ChurchScopedQuerySet
+        )
+        cls.filter_field_map = {
+            name: cls.model._meta.get_field(name)
+            for name in cls.filter_fields
+        }
+
     def get_serializer_context(self):
         context = super().get_serializer_context()
         # Only add church to context if the user has one
@@ -28,23 +82,21 @@ class ChurchContextMixin:
         return context
 
     def get_queryset(self):
-        # 1. Start with all objects
-        queryset = self.model.objects.all()
-        
-        # 2. Check if the model has a field named 'church'
-        has_church_field = any(f.name == 'church' for f in self.model._meta.get_fields())
-        
-        # 3. Only filter if the field exists
-        if has_church_field:
-            return queryset.filter(church=self.request.user.church)
-        
-        # 4. Otherwise, return all (for global models like Grade/Relationship)
-        return queryset
+        queryset = self.model._default_manager.all()
+
+        if self.church_scoped:
+            queryset = queryset.for_user(self.request.user)
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+
+        return queryset.order_by(*self.ordering)
 
 class ChurchList(ListAPIView):
     permission_classes=[IsAuthenticated]
     serializer_class = ChurchListSerializer
-    queryset = Church.objects.all().order_by("-created_at")
+    queryset = Church.objects.order_by("-created_at")  # live churches only
 
 
 
@@ -52,6 +104,9 @@ class WardListCreateAPIView(ChurchContextMixin,ListCreateAPIView):
     model = Ward
     serializer_class = WardSerializer
     permission_classes = [IsAuthenticated, IsChurchUser]
+    ordering = ("ward_number", "id")
+    ordering_fields = ("ward_number", "ward_name")
+    search_fields = ("^ward_name", "^place")
 
 
 class WardDetailAPIView(ChurchContextMixin,RetrieveUpdateDestroyAPIView):
@@ -63,11 +118,17 @@ class FamilyListCreateAPIView(ChurchContextMixin,ListCreateAPIView):
     model = Family
     serializer_class = FamilySerializer
     permission_classes = [IsAuthenticated, IsChurchUser]
+    ordering = ("family_name", "id")
+    ordering_fields = ("family_name", "id")
+    filter_fields = ("ward",)
+    search_fields = ("^family_name", "^house_name")
     
 class RelationshipListCreateAPIView(ChurchContextMixin,ListCreateAPIView):
     model = Relationship
     serializer_class = RelationshipSerializer
     permission_classes = [IsAuthenticated, IsChurchUser]
+    ordering = ("name",)
+    search_fields = ("^name",)
 
 class RelationshipdetailView(ChurchContextMixin,RetrieveUpdateDestroyAPIView):
     permission_classes=[IsAuthenticated,IsChurchUser]
@@ -78,6 +139,8 @@ class GradeListCreateview(ChurchContextMixin,ListCreateAPIView):
     model=Grade
     serializer_class=GradeSerializer
     permission_classes=[IsAuthenticated,IsChurchUser]
+    ordering = ("name",)
+    search_fields = ("^name",)
 
 class GradeDetailview(ChurchContextMixin,RetrieveUpdateDestroyAPIView):
     model=Grade
@@ -133,6 +196,18 @@ class MemberListCreateAPIView(ChurchContextMixin,ListCreateAPIView):
     model = Member
     serializer_class = MemberSerializer
     permission_classes = [IsAuthenticated, IsChurchUser]
+    ordering = ("name", "id")
+    ordering_fields = ("name", "dob", "age", "id")
+    filter_fields = (
+        "family",
+        "gender",
+        "marital_status",
+        "grade",
+        "is_family_head",
+        "is_active",
+        "expired",
+    )
+    search_fields = ("^name", "^baptismal_name", "^mobile_no")
 
 
 class MemberDetailAPIView(
@@ -466,13 +541,21 @@ class ChurchDashboardAPIView(APIView):
     
 
 #member
+def wants_household(request):
+    return request.query_params.get("include") == "household"
+
+
 class MemberProfileAPIView(APIView):
+    """
+    ?include=household adds the family's active members.
+    """
     permission_classes = [IsAuthenticated, IsMemberUser]
 
     def get(self, request):
-        member = request.user.member
-        serializer = MemberProfileSerializer(member)
-        return Response(serializer.data)
+        return Response(get_member_profile(
+            request.user.member_id,
+            household=wants_household(request)
+        ))
     
 #Bill
 class ChurchBillListAPIView(APIView):
@@ -483,7 +566,7 @@ class ChurchBillListAPIView(APIView):
 
         bills = (
             Bill.objects
-            .filter(church=church)
+            .for_church(church)
             .select_related("subscription", "subscription__package")
             .order_by("-created_at")
         )
@@ -510,13 +593,12 @@ class ChurchBillDetailAPIView(APIView):
         church = request.user.church
 
         bill = get_object_or_404(
-            Bill.objects.select_related(
+            Bill.objects.for_church(church).select_related(  # 🔒 critical security check
                 "church",
                 "subscription",
                 "subscription__package",
             ),
             pk=pk,
-            church=church,  # 🔒 critical security check
         )
 
         serializer = BillDetailSerializer(bill)
@@ -612,16 +694,14 @@ class ChangeFamilyHeadAPIView(APIView):
         church = request.user.church
 
         family = get_object_or_404(
-            Family,
-            id=family_id,
-            church=church
+            Family.objects.for_church(church),
+            id=family_id
         )
 
         new_head = get_object_or_404(
-            Member,
+            Member.objects.for_church(church),
             id=new_head_id,
             family=family,
-            church=church,
             expired=False,
             is_active=True
         )
@@ -645,38 +725,26 @@ class BaptismAPIView(APIView):
 
     def get(self, request):
         """
-        List baptisms with optional category filter
-        ?category=PARISH | OTHER
+        Cursor-paginated baptism register.
+        Filters: see registry.filters.filter_baptisms
         """
-        category = request.query_params.get("category")
-
-        baptisms = Baptism.objects.filter(
-            church=request.user.church
+        baptisms = filter_baptisms(
+            Baptism.objects.for_user(request.user),
+            request.query_params
         )
 
-        if category:
-            category = category.upper()
-            if category not in ["PARISH", "OTHER"]:
-                return Response(
-                    {"detail": "Invalid category. Use PARISH or OTHER."},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            baptisms = baptisms.filter(baptism_category=category)
-
         baptisms = baptisms.select_related(
             "family",
             "main_member",
             "relation_with_main_member",
             "member"
-        ).order_by("-created_at")
-
-        serializer = BaptismSerializer(baptisms, many=True)
-        return Response(
-            serializer.data,
-            status=status.HTTP_200_OK
         )
 
+        paginator = BaptismCursorPagination()
+        page = paginator.paginate_queryset(baptisms, request, view=self)
 
+        serializer = BaptismSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         data = request.data.copy()
@@ -719,6 +787,130 @@ class BaptismAPIView(APIView):
 
 
 
+class BaptismImportAPIView(APIView):
+    permission_classes = [IsChurchUser]
+
+    def post(self, request):
+        """
+        Bulk register digitization.
+        Body: {"rows": [<baptism fields>, ...]}
+        Valid rows are saved, invalid rows are reported by index.
+        """
+        serializer = BaptismImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        created, errors = import_baptisms(
+            request.user.church,
+            serializer.validated_data["rows"]
+        )
+
+        return Response(
+            {
+                "created": created,
+                "failed": len(errors),
+                "errors": errors,
+            },
+            status=(
+                status.HTTP_201_CREATED
+                if created
+                else status.HTTP_400_BAD_REQUEST
+            )
+        )
+
+
+class BaptismYearlySummaryAPIView(APIView):
+    permission_classes = [IsChurchUser]
+
+    def get(self, request):
+        """
+        Baptism count per year of date_of_baptism.
+        Accepts the same filters as the register listing.
+        Single GROUP BY over baptism_church_date_idx.
+        """
+        baptisms = filter_baptisms(
+            Baptism.objects.for_user(request.user),
+            request.query_params
+        )
+
+        years = (
+            baptisms
+            .annotate(year=ExtractYear("date_of_baptism"))
+            .values("year")
+            .annotate(count=Count("id"))
+            .order_by("year")
+        )
+
+        years = list(years)
+        return Response(
+            {
+                "total": sum(row["count"] for row in years),
+                "years": years,
+            },
+            status=status.HTTP_200_OK
+        )
+
+
+class ChurchStatisticsAPIView(APIView):
+    permission_classes = [IsChurchUser]
+
+    def get(self, request):
+        """
+        Member counts by gender, age band, marital status, blood group,
+        grade and ward. Two queries, cached per church version.
+        """
+        return Response(
+            get_parish_statistics(request.user.church),
+            status=status.HTTP_200_OK
+        )
+
+
+class MemberCalendarAPIView(APIView):
+    permission_classes = [IsChurchUser]
+
+    def get(self, request):
+        """
+        Birthdays and baptism anniversaries from ?from= to ?to=
+        (YYYY-MM-DD, default: the coming week; may cross New Year).
+        ?kind=birthday|baptism limits to one list.
+        """
+        default_start, default_end = default_window(timezone.localdate())
+        start = self._date_param(request, "from", default_start)
+        end = self._date_param(request, "to", default_end)
+
+        if end < start:
+            raise ValidationError({"to": "Must be on or after from."})
+        if (end - start).days >= MAX_WINDOW_DAYS:
+            raise ValidationError({"to": f"Window is limited to {MAX_WINDOW_DAYS} days."})
+
+        kind = request.query_params.get("kind")
+        if kind and kind not in OCCASIONS:
+            raise ValidationError({"kind": f"One of: {', '.join(OCCASIONS)}."})
+
+        members = Member.objects.for_user(request.user)
+        response = {"from": start, "to": end}
+        if kind in (None, "birthday"):
+            response["birthdays"] = upcoming_occasions(members, "birthday", start, end)
+        if kind in (None, "baptism"):
+            response["baptism_anniversaries"] = upcoming_occasions(
+                members, "baptism", start, end
+            )
+
+        return Response(response, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def _date_param(request, name, default):
+        value = request.query_params.get(name)
+        if not value:
+            return default
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ValidationError({name: "Use YYYY-MM-DD."})
+        return parsed
+
+
 class BaptismDetailAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -727,9 +919,8 @@ class BaptismDetailAPIView(APIView):
         Ensure baptism belongs to the logged-in user's church
         """
         return get_object_or_404(
-            Baptism,
-            pk=pk,
-            church=request.user.church
+            Baptism.objects.for_user(request.user),
+            pk=pk
         )
 
     # -------------------------
@@ -822,75 +1013,68 @@ class BaptismCertificateAPIView(APIView):
 
     def get(self, request, pk):
         baptism = get_object_or_404(
-            Baptism,
-            pk=pk,
-            church=request.user.church
+            certificate_queryset(Baptism.objects.for_user(request.user)),
+            pk=pk
         )
 
-        data = {
-            "certificate_type": (
-                "PARISH" if baptism.baptism_category == "PARISH" else "OTHER"
-            ),
+        data = build_baptism_certificate_data(baptism)
+        return Response(data, status=status.HTTP_200_OK)
 
-            # -------------------------
-            # CHURCH INFO
-            # -------------------------
-            "church": {
-                "name": baptism.church.name,
-                "address": baptism.church.address,
-            },
 
-            # -------------------------
-            # BAPTISM DETAILS
-            # -------------------------
-            "register_number": baptism.register_number,
-            "date_of_baptism": baptism.date_of_baptism,
-            "parish_of_baptism": baptism.parish_of_baptism,
-
-            # -------------------------
-            # PERSON DETAILS
-            # -------------------------
-            "name": baptism.name,
-            "baptismal_name": baptism.baptismal_name,
-            "gender": baptism.gender,
-            "date_of_birth": baptism.dob,
-            "place_of_birth": baptism.place_of_birth,
-            "address": baptism.address,
-
-            # -------------------------
-            # PARENTS
-            # -------------------------
-            "father_name": baptism.father_name,
-            "mother_name": baptism.mother_name,
-
-            # -------------------------
-            # GODPARENTS
-            # -------------------------
-            "god_father": baptism.god_father,
-            "god_mother": baptism.god_mother,
-
-            # -------------------------
-            # PARISH MEMBER DETAILS
-            # -------------------------
-            "parish_member_details": None,
-        }
+class BaptismCertificatePDFAPIView(APIView):
+    permission_classes = [IsAuthenticated]
 
-        if baptism.baptism_category == "PARISH":
-            data["parish_member_details"] = {
-                "family_name": baptism.family.family_name,
-                "house_name": baptism.family.house_name,
-                "main_member_name": (
-                    baptism.main_member.name if baptism.main_member else None
-                ),
-                "relationship": (
-                    baptism.relation_with_main_member.name
-                    if baptism.relation_with_main_member
-                    else None
-                ),
-                "member_id": baptism.member.id if baptism.member else None,
-            }
+    def get(self, request, pk):
+        baptism = get_object_or_404(
+            certificate_queryset(Baptism.objects.for_user(request.user)),
+            pk=pk
+        )
 
-        return Response(data, status=status.HTTP_200_OK)
+        path = get_certificate_pdf(baptism)
+        return FileResponse(
+            open(path, "rb"),
+            as_attachment=True,
+            filename=f"baptism-{baptism.register_number}.pdf",
+            content_type="application/pdf"
+        )
+
+
+class BaptismCertificateBatchAPIView(APIView):
+    permission_classes = [IsChurchUser]
+
+    def post(self, request):
+        """
+        Body: {"ids": [1, 2, ...]} (at most 500)
+        Returns one zip with a PDF certificate per baptism.
+        """
+        serializer = BaptismCertificateBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["ids"]
+
+        baptisms = list(
+            certificate_queryset(Baptism.objects.for_user(request.user))
+            .filter(pk__in=ids)
+            .order_by("register_number")
+        )
+
+        if not baptisms:
+            return Response(
+                {"detail": "No baptisms found."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        archive = build_certificate_zip(
+            baptisms,
+            tempfile.SpooledTemporaryFile(max_size=10 * 1024 * 1024)
+        )
+        archive.seek(0)
+
+        return FileResponse(
+            archive,
+            as_attachment=True,
+            filename="baptism-certificates.zip",
+            content_type="application/zip"
+        )
 
 
 
@@ -899,9 +1083,8 @@ class FamilyMembersAPIView(APIView):
 
     def get(self, request, family_id):
         family = get_object_or_404(
-            Family,
-            id=family_id,
-            church=request.user.church
+            Family.objects.for_user(request.user),
+            id=family_id
         )
 
         members = Member.objects.filter(
@@ -913,16 +1096,69 @@ class FamilyMembersAPIView(APIView):
 
 
 #mobile directory apis
+# Shared with registry.async_views, so both variants return the same data
+# and everything the serializers read is loaded up front.
+def mobile_ward_queryset(user):
+    return (
+        Ward.objects
+        .for_user(user)
+        .annotate(family_count=Count("families"))
+        .order_by("ward_name")
+    )
+
+
+def mobile_family_list_queryset(user, ward_id):
+    heads = Member.objects.filter(
+        family=OuterRef("pk"),
+        is_family_head=True,
+        is_active=True,
+        expired=False
+    ).order_by("pk")
+
+    return (
+        Family.objects
+        .for_user(user)
+        .filter(ward_id=ward_id)
+        .annotate(
+            member_count=Count("members"),
+            head_name=Subquery(heads.values("name")[:1]),
+        )
+        .order_by("family_name")
+    )
+
+
+def mobile_family_detail_queryset(user):
+    return Family.objects.for_user(user).prefetch_related(
+        Prefetch(
+            "members",
+            queryset=(
+                Member.objects
+                .filter(is_active=True, expired=False)
+                .select_related("relationship")
+                .order_by("-is_family_head", "name")
+            ),
+            to_attr="active_members",
+        )
+    )
+
+
+def mobile_families_payload(families, request):
+    return {
+        "total_families": len(families),
+        "total_members": sum(family.member_count for family in families),
+        "families": MobileFamilyListSerializer(
+            families,
+            many=True,
+            context={"request": request}
+        ).data,
+    }
+
+
 class WardListWithFamilyCountAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        wards = (
-            Ward.objects
-            .filter(church=request.user.church)
-            .annotate(family_count=Count("families"))
-            .order_by("ward_name")
-        )
+        wards = mobile_ward_queryset(request.user)
 
         serializer = WardWithFamilyCountSerializer(wards, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -933,48 +1169,21 @@ class WardFamiliesMobileAPIView(APIView):
     def get(self, request, ward_id):
         # Ensure ward belongs to church
         get_object_or_404(
-            Ward,
-            id=ward_id,
-            church=request.user.church
+            Ward.objects.for_user(request.user),
+            id=ward_id
         )
 
-        families_qs = (
-            Family.objects
-            .filter(
-                ward_id=ward_id,
-                church=request.user.church
-            )
-            .annotate(member_count=Count("members"))
-            .order_by("family_name")
-        )
+        families = list(mobile_family_list_queryset(request.user, ward_id))
 
-        total_families = families_qs.count()
-        total_members = families_qs.aggregate(
-            total=Sum("member_count")
-        )["total"] or 0
-
-        serializer = MobileFamilyListSerializer(
-            families_qs,
-            many=True,
-            context={"request": request}
-        )
-
-        return Response(
-            {
-                "total_families": total_families,
-                "total_members": total_members,
-                "families": serializer.data,
-            }
-        )
+        return Response(mobile_families_payload(families, request))
     
 class FamilyDetailMobileAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, family_id):
         family = get_object_or_404(
-            Family,
-            id=family_id,
-            church=request.user.church
+            mobile_family_detail_queryset(request.user),
+            id=family_id
         )
 
         serializer = MobileFamilyDetailSerializer(family)